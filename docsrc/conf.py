@@ -38,7 +38,6 @@ extensions = [
 ]
 
 autodoc_mock_imports = [
-    'retrying',
     'enum'
 ]
 
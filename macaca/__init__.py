@@ -22,10 +22,40 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 
-from .webdriver import WebDriver
-from .webelement import WebElement
-from .keys import Keys
-from .webdriverexception import WebDriverException
+import sys
+from importlib import import_module
 
 
 __all__ = ['WebDriver', 'WebElement', 'Keys', 'WebDriverException', 'asserters']
+
+# Public names and the submodule defining them, imported on first access.
+_LAZY_ATTRIBUTES = {
+    'WebDriver': 'webdriver',
+    'WebElement': 'webelement',
+    'Keys': 'keys',
+    'WebDriverException': 'webdriverexception',
+    'asserters': None
+}
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        """Import public names lazily (PEP 562)."""
+        if name not in _LAZY_ATTRIBUTES:
+            raise AttributeError(
+                'module {0!r} has no attribute {1!r}'.format(__name__, name))
+        module_name = _LAZY_ATTRIBUTES[name] or name
+        module = import_module('.' + module_name, __name__)
+        value = module if _LAZY_ATTRIBUTES[name] is None \
+            else getattr(module, name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__))
+else:
+    from .webdriver import WebDriver
+    from .webelement import WebElement
+    from .keys import Keys
+    from .webdriverexception import WebDriverException
+    from . import asserters
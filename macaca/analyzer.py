@@ -0,0 +1,209 @@
+#
+# Round trip analyzer detecting wasteful command patterns
+#
+# Usage:
+#     analyzer = RoundTripAnalyzer()
+#     driver.listeners.append(analyzer)    # or listener.add_listener(...)
+#     ...
+#     print(analyzer.report())
+#
+
+from collections import defaultdict
+
+from .command import FIND_COMMANDS, Command, command_name, is_mutating
+from .listener import CommandListener
+from .util import caller_location
+
+N_PLUS_ONE = 'n+1'
+DUPLICATE_FIND = 'duplicate-find'
+REDUNDANT_SWITCH = 'redundant-switch'
+FIRST_POLL_WAIT = 'first-poll-wait'
+
+_MESSAGES = {
+    N_PLUS_ONE: '{0} fetched once per element of an elements() result, '
+                'fetch them in one execute_script instead',
+    DUPLICATE_FIND: '{0} repeated with no mutating command in between, '
+                    'reuse the element',
+    REDUNDANT_SWITCH: '{0} switches to the context, window or frame '
+                      'already in use',
+    FIRST_POLL_WAIT: '{0} was satisfied on its first poll, '
+                     'a plain find would do',
+}
+
+_LIST_COMMANDS = frozenset([
+    Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENTS])
+_NAVIGATION_COMMANDS = frozenset([
+    Command.GET, Command.GO_BACK, Command.GO_FORWARD, Command.REFRESH])
+
+
+class Finding(object):
+    """A wasteful pattern found at a source location.
+
+    Attributes:
+        kind(str): N_PLUS_ONE, DUPLICATE_FIND, REDUNDANT_SWITCH or
+            FIRST_POLL_WAIT.
+        location(str): The "file:line" issuing the commands.
+        command(str): The command name or the wait description.
+        count(int): How many times the pattern occurred.
+        saved(int): Estimated round trips that could be saved.
+    """
+
+    __slots__ = ('kind', 'location', 'command', 'count', 'saved')
+
+    def __init__(self, kind, location, command, count, saved):
+        self.kind = kind
+        self.location = location
+        self.command = command
+        self.count = count
+        self.saved = saved
+
+    @property
+    def message(self):
+        """A human readable description of the finding."""
+        return _MESSAGES[self.kind].format(self.command)
+
+    def __repr__(self):
+        return '<Finding {0} {1} {2} x{3}>'.format(
+            self.kind, self.location, self.command, self.count)
+
+
+class _DriverState(object):
+
+    def __init__(self):
+        self.finds = set()
+        self.list_ids = set()
+        self.context = None
+        self.window = None
+        self.top_frame = False
+        self.waits = []
+        self.locations = []
+
+
+class RoundTripAnalyzer(CommandListener):
+    """Watch the command stream and report avoidable round trips.
+
+    Detects property fetches done once per element of an elements()
+    result (N+1), finds repeated without a mutating command in between,
+    switches to the context, frame or window already in use and waits
+    whose first poll already succeeded.
+
+    Attributes:
+        commands(int): Number of commands observed.
+    """
+
+    def __init__(self):
+        self.commands = 0
+        self._states = {}
+        self._fanout = defaultdict(int)
+        self._patterns = defaultdict(lambda: [0, 0])
+
+    def _state(self, driver):
+        state = self._states.get(id(driver))
+        if state is None:
+            state = self._states[id(driver)] = _DriverState()
+        return state
+
+    def _add(self, kind, location, command, saved=1):
+        pattern = self._patterns[(kind, location, command)]
+        pattern[0] += 1
+        pattern[1] += saved
+
+    def before_execute(self, driver, command, data):
+        self._state(driver).locations.append(caller_location())
+
+    def after_execute(self, driver, command, data, result, error, elapsed):
+        state = self._state(driver)
+        location = state.locations.pop() if state.locations else '<unknown>'
+        self.commands += 1
+        if error is not None:
+            return
+
+        name = command_name(command)
+        element_id = data.get('element_id')
+        if command in FIND_COMMANDS:
+            key = (command, element_id, data.get('using'), data.get('value'))
+            if key in state.finds and not state.waits:
+                self._add(DUPLICATE_FIND, location, name)
+            state.finds.add(key)
+            if command in _LIST_COMMANDS and result:
+                ids = getattr(result, 'ids', None)
+                if ids is None:
+                    ids = (getattr(el, 'element_id', None) for el in result)
+                state.list_ids.update(ids)
+        elif command.method == 'GET' and element_id in state.list_ids:
+            self._fanout[(location, name)] += 1
+
+        if is_mutating(command):
+            state.finds.clear()
+        self._track_switch(state, command, name, data, location)
+
+    def _track_switch(self, state, command, name, data, location):
+        if command == Command.SWITCH_TO_CONTEXT:
+            if state.context is not None and state.context == data.get('name'):
+                self._add(REDUNDANT_SWITCH, location, name)
+            state.context = data.get('name')
+        elif command == Command.SWITCH_TO_WINDOW:
+            # from inside a frame, it returns to the top-level document
+            if state.window is not None and state.top_frame and \
+                    state.window == data.get('name'):
+                self._add(REDUNDANT_SWITCH, location, name)
+            state.window = data.get('name')
+            state.top_frame = True
+        elif command == Command.SWITCH_TO_FRAME:
+            if data.get('id') is None:
+                if state.top_frame:
+                    self._add(REDUNDANT_SWITCH, location, name)
+                state.top_frame = True
+            else:
+                state.top_frame = False
+        elif command == Command.SWITCH_TO_PARENT_FRAME:
+            state.top_frame = False
+        elif command in _NAVIGATION_COMMANDS:
+            state.top_frame = True
+
+    def before_wait(self, driver, wait):
+        self._state(driver).waits.append((self.commands, caller_location()))
+
+    def after_wait(self, driver, wait, result, error, elapsed):
+        state = self._state(driver)
+        if not state.waits:
+            return
+        start, location = state.waits.pop()
+        if error is None and wait.polls == 1 and wait.using is not None:
+            # A plain find costs one round trip, the rest was the asserter.
+            saved = max(self.commands - start - 1, 0)
+            self._add(FIRST_POLL_WAIT, location, repr(wait), saved)
+
+    @property
+    def findings(self):
+        """Return the findings sorted by round trips saved, then count."""
+        findings = [
+            Finding(kind, location, command, count, saved)
+            for (kind, location, command), (count, saved)
+            in self._patterns.items()]
+        findings.extend(
+            Finding(N_PLUS_ONE, location, command, count, count - 1)
+            for (location, command), count in self._fanout.items()
+            if count > 1)
+        findings.sort(key=lambda f: (-f.saved, -f.count, f.location))
+        return findings
+
+    def reset(self):
+        """Forget every observed command and finding."""
+        self.__init__()
+
+    def report(self):
+        """Format the findings, one per line.
+
+        Returns:
+            A multi-line string.
+        """
+        findings = self.findings
+        saved = sum(finding.saved for finding in findings)
+        lines = ['{0} commands observed, about {1} round trips could be '
+                 'saved'.format(self.commands, saved)]
+        for finding in findings:
+            lines.append('  {0}: [{1}] {2} (x{3}, ~{4} round trips)'.format(
+                finding.location, finding.kind, finding.message,
+                finding.count, finding.saved))
+        return '\n'.join(lines)
@@ -426,3 +426,92 @@ class Command(object):
         'POST',
         '/session/{session_id}/actions'
     )
+
+
+_COMMAND_NAMES = dict(
+    (endpoint, name) for name, endpoint in vars(Command).items()
+    if isinstance(endpoint, Endpoint))
+
+
+def command_name(command):
+    """Return the name of a defined command, e.g. 'FIND_ELEMENT'.
+
+    Args:
+        command(Command): The defined command.
+
+    Returns:
+        The attribute name in Command, or "METHOD uri" for unknown endpoints.
+    """
+    name = _COMMAND_NAMES.get(command)
+    if name is None:
+        name = '{0} {1}'.format(command[0], command[1])
+    return name
+
+
+# Commands only locating elements, although most are sent with POST.
+FIND_COMMANDS = frozenset([
+    Command.FIND_ELEMENT, Command.FIND_ELEMENTS,
+    Command.FIND_CHILD_ELEMENT, Command.FIND_CHILD_ELEMENTS,
+    Command.GET_ACTIVE_ELEMENT])
+
+# Commands reading the state of the application or of the session without
+# changing it. Every other defined command is mutating, GET_LOG included as
+# reading a log consumes its buffer on the server.
+READ_ONLY_COMMANDS = FIND_COMMANDS | frozenset([
+    Command.STATUS,
+    Command.GET_ALL_SESSIONS,
+    Command.GET_CURRENT_WINDOW_HANDLE,
+    Command.GET_WINDOW_HANDLES,
+    Command.GET_CURRENT_URL,
+    Command.GET_TITLE,
+    Command.GET_PAGE_SOURCE,
+    Command.SCREENSHOT,
+    Command.ELEMENT_SCREENSHOT,
+    Command.GET_ELEMENT_TEXT,
+    Command.GET_ELEMENT_VALUE,
+    Command.GET_ELEMENT_TAG_NAME,
+    Command.IS_ELEMENT_SELECTED,
+    Command.IS_ELEMENT_ENABLED,
+    Command.IS_ELEMENT_DISPLAYED,
+    Command.GET_ELEMENT_SIZE,
+    Command.GET_ELEMENT_RECT,
+    Command.GET_ELEMENT_PROPERTY,
+    Command.GET_ELEMENT_ATTRIBUTE,
+    Command.ELEMENT_EQUALS,
+    Command.GET_ALL_COOKIES,
+    Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY,
+    Command.GET_ALERT_TEXT,
+    Command.GET_WINDOW_SIZE,
+    Command.W3C_GET_WINDOW_SIZE,
+    Command.GET_WINDOW_POSITION,
+    Command.GET_SCREEN_ORIENTATION,
+    Command.GET_APP_CACHE,
+    Command.GET_APP_CACHE_STATUS,
+    Command.GET_NETWORK_CONNECTION,
+    Command.GET_LOCAL_STORAGE_ITEM,
+    Command.GET_LOCAL_STORAGE_KEYS,
+    Command.GET_LOCAL_STORAGE_SIZE,
+    Command.GET_SESSION_STORAGE_ITEM,
+    Command.GET_SESSION_STORAGE_KEYS,
+    Command.GET_SESSION_STORAGE_SIZE,
+    Command.GET_AVAILABLE_LOG_TYPES,
+    Command.CURRENT_CONTEXT_HANDLE,
+    Command.CONTEXT_HANDLES])
+
+MUTATING_COMMANDS = frozenset(_COMMAND_NAMES) - READ_ONLY_COMMANDS
+
+
+def is_mutating(command):
+    """Whether a command may change the state of the application or of the
+    session, so that anything read before it may be outdated.
+
+    Args:
+        command(Command): The defined command.
+
+    Returns:
+        False for READ_ONLY_COMMANDS, True for other defined commands.
+        Endpoints not defined in Command are mutating unless sent with GET.
+    """
+    if command in READ_ONLY_COMMANDS:
+        return False
+    return command in MUTATING_COMMANDS or command.method != 'GET'
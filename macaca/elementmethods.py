@@ -0,0 +1,314 @@
+#
+# Element finder aliases for every Locator strategy
+#
+# Generated ahead of time from macaca.locator.Locator so that importing
+# the package does not build closures or call setattr for every locator.
+# Keep in sync with Locator; tests/macaca/test_elementmethods.py checks it.
+#
+
+
+class ElementMethodsMixin(object):
+    """Provide element_by/elements_by aliases and their extension methods
+    (if_exists/or_none/wait_for) for every Locator."""
+
+    __slots__ = ()
+
+    def element_by_id(self, value):
+        """Set parameter 'using' to 'id'.
+        See more in 'element' method."""
+        return self.element('id', value)
+
+    def element_by_id_if_exists(self, value):
+        """Set parameter 'using' to 'id'.
+        See more in 'element_if_exists' method."""
+        return self.element_if_exists('id', value)
+
+    def element_by_id_or_none(self, value):
+        """Set parameter 'using' to 'id'.
+        See more in 'element_or_none' method."""
+        return self.element_or_none('id', value)
+
+    def wait_for_element_by_id(self, *args, **kwargs):
+        """Set parameter 'using' to 'id'.
+        See more in 'wait_for_element' method."""
+        return self.wait_for_element('id', *args, **kwargs)
+
+    def elements_by_id(self, value, lazy=False):
+        """Set parameter 'using' to 'id'.
+        See more in 'elements' method."""
+        return self.elements('id', value, lazy)
+
+    def wait_for_elements_by_id(self, *args, **kwargs):
+        """Set parameter 'using' to 'id'.
+        See more in 'wait_for_elements' method."""
+        return self.wait_for_elements('id', *args, **kwargs)
+
+    def element_by_xpath(self, value):
+        """Set parameter 'using' to 'xpath'.
+        See more in 'element' method."""
+        return self.element('xpath', value)
+
+    def element_by_xpath_if_exists(self, value):
+        """Set parameter 'using' to 'xpath'.
+        See more in 'element_if_exists' method."""
+        return self.element_if_exists('xpath', value)
+
+    def element_by_xpath_or_none(self, value):
+        """Set parameter 'using' to 'xpath'.
+        See more in 'element_or_none' method."""
+        return self.element_or_none('xpath', value)
+
+    def wait_for_element_by_xpath(self, *args, **kwargs):
+        """Set parameter 'using' to 'xpath'.
+        See more in 'wait_for_element' method."""
+        return self.wait_for_element('xpath', *args, **kwargs)
+
+    def elements_by_xpath(self, value, lazy=False):
+        """Set parameter 'using' to 'xpath'.
+        See more in 'elements' method."""
+        return self.elements('xpath', value, lazy)
+
+    def wait_for_elements_by_xpath(self, *args, **kwargs):
+        """Set parameter 'using' to 'xpath'.
+        See more in 'wait_for_elements' method."""
+        return self.wait_for_elements('xpath', *args, **kwargs)
+
+    def element_by_link_text(self, value):
+        """Set parameter 'using' to 'link text'.
+        See more in 'element' method."""
+        return self.element('link text', value)
+
+    def element_by_link_text_if_exists(self, value):
+        """Set parameter 'using' to 'link text'.
+        See more in 'element_if_exists' method."""
+        return self.element_if_exists('link text', value)
+
+    def element_by_link_text_or_none(self, value):
+        """Set parameter 'using' to 'link text'.
+        See more in 'element_or_none' method."""
+        return self.element_or_none('link text', value)
+
+    def wait_for_element_by_link_text(self, *args, **kwargs):
+        """Set parameter 'using' to 'link text'.
+        See more in 'wait_for_element' method."""
+        return self.wait_for_element('link text', *args, **kwargs)
+
+    def elements_by_link_text(self, value, lazy=False):
+        """Set parameter 'using' to 'link text'.
+        See more in 'elements' method."""
+        return self.elements('link text', value, lazy)
+
+    def wait_for_elements_by_link_text(self, *args, **kwargs):
+        """Set parameter 'using' to 'link text'.
+        See more in 'wait_for_elements' method."""
+        return self.wait_for_elements('link text', *args, **kwargs)
+
+    def element_by_partial_link_text(self, value):
+        """Set parameter 'using' to 'partial link text'.
+        See more in 'element' method."""
+        return self.element('partial link text', value)
+
+    def element_by_partial_link_text_if_exists(self, value):
+        """Set parameter 'using' to 'partial link text'.
+        See more in 'element_if_exists' method."""
+        return self.element_if_exists('partial link text', value)
+
+    def element_by_partial_link_text_or_none(self, value):
+        """Set parameter 'using' to 'partial link text'.
+        See more in 'element_or_none' method."""
+        return self.element_or_none('partial link text', value)
+
+    def wait_for_element_by_partial_link_text(self, *args, **kwargs):
+        """Set parameter 'using' to 'partial link text'.
+        See more in 'wait_for_element' method."""
+        return self.wait_for_element('partial link text', *args, **kwargs)
+
+    def elements_by_partial_link_text(self, value, lazy=False):
+        """Set parameter 'using' to 'partial link text'.
+        See more in 'elements' method."""
+        return self.elements('partial link text', value, lazy)
+
+    def wait_for_elements_by_partial_link_text(self, *args, **kwargs):
+        """Set parameter 'using' to 'partial link text'.
+        See more in 'wait_for_elements' method."""
+        return self.wait_for_elements('partial link text', *args, **kwargs)
+
+    def element_by_name(self, value):
+        """Set parameter 'using' to 'name'.
+        See more in 'element' method."""
+        return self.element('name', value)
+
+    def element_by_name_if_exists(self, value):
+        """Set parameter 'using' to 'name'.
+        See more in 'element_if_exists' method."""
+        return self.element_if_exists('name', value)
+
+    def element_by_name_or_none(self, value):
+        """Set parameter 'using' to 'name'.
+        See more in 'element_or_none' method."""
+        return self.element_or_none('name', value)
+
+    def wait_for_element_by_name(self, *args, **kwargs):
+        """Set parameter 'using' to 'name'.
+        See more in 'wait_for_element' method."""
+        return self.wait_for_element('name', *args, **kwargs)
+
+    def elements_by_name(self, value, lazy=False):
+        """Set parameter 'using' to 'name'.
+        See more in 'elements' method."""
+        return self.elements('name', value, lazy)
+
+    def wait_for_elements_by_name(self, *args, **kwargs):
+        """Set parameter 'using' to 'name'.
+        See more in 'wait_for_elements' method."""
+        return self.wait_for_elements('name', *args, **kwargs)
+
+    def element_by_tag_name(self, value):
+        """Set parameter 'using' to 'tag name'.
+        See more in 'element' method."""
+        return self.element('tag name', value)
+
+    def element_by_tag_name_if_exists(self, value):
+        """Set parameter 'using' to 'tag name'.
+        See more in 'element_if_exists' method."""
+        return self.element_if_exists('tag name', value)
+
+    def element_by_tag_name_or_none(self, value):
+        """Set parameter 'using' to 'tag name'.
+        See more in 'element_or_none' method."""
+        return self.element_or_none('tag name', value)
+
+    def wait_for_element_by_tag_name(self, *args, **kwargs):
+        """Set parameter 'using' to 'tag name'.
+        See more in 'wait_for_element' method."""
+        return self.wait_for_element('tag name', *args, **kwargs)
+
+    def elements_by_tag_name(self, value, lazy=False):
+        """Set parameter 'using' to 'tag name'.
+        See more in 'elements' method."""
+        return self.elements('tag name', value, lazy)
+
+    def wait_for_elements_by_tag_name(self, *args, **kwargs):
+        """Set parameter 'using' to 'tag name'.
+        See more in 'wait_for_elements' method."""
+        return self.wait_for_elements('tag name', *args, **kwargs)
+
+    def element_by_class_name(self, value):
+        """Set parameter 'using' to 'class name'.
+        See more in 'element' method."""
+        return self.element('class name', value)
+
+    def element_by_class_name_if_exists(self, value):
+        """Set parameter 'using' to 'class name'.
+        See more in 'element_if_exists' method."""
+        return self.element_if_exists('class name', value)
+
+    def element_by_class_name_or_none(self, value):
+        """Set parameter 'using' to 'class name'.
+        See more in 'element_or_none' method."""
+        return self.element_or_none('class name', value)
+
+    def wait_for_element_by_class_name(self, *args, **kwargs):
+        """Set parameter 'using' to 'class name'.
+        See more in 'wait_for_element' method."""
+        return self.wait_for_element('class name', *args, **kwargs)
+
+    def elements_by_class_name(self, value, lazy=False):
+        """Set parameter 'using' to 'class name'.
+        See more in 'elements' method."""
+        return self.elements('class name', value, lazy)
+
+    def wait_for_elements_by_class_name(self, *args, **kwargs):
+        """Set parameter 'using' to 'class name'.
+        See more in 'wait_for_elements' method."""
+        return self.wait_for_elements('class name', *args, **kwargs)
+
+    def element_by_css_selector(self, value):
+        """Set parameter 'using' to 'css selector'.
+        See more in 'element' method."""
+        return self.element('css selector', value)
+
+    def element_by_css_selector_if_exists(self, value):
+        """Set parameter 'using' to 'css selector'.
+        See more in 'element_if_exists' method."""
+        return self.element_if_exists('css selector', value)
+
+    def element_by_css_selector_or_none(self, value):
+        """Set parameter 'using' to 'css selector'.
+        See more in 'element_or_none' method."""
+        return self.element_or_none('css selector', value)
+
+    def wait_for_element_by_css_selector(self, *args, **kwargs):
+        """Set parameter 'using' to 'css selector'.
+        See more in 'wait_for_element' method."""
+        return self.wait_for_element('css selector', *args, **kwargs)
+
+    def elements_by_css_selector(self, value, lazy=False):
+        """Set parameter 'using' to 'css selector'.
+        See more in 'elements' method."""
+        return self.elements('css selector', value, lazy)
+
+    def wait_for_elements_by_css_selector(self, *args, **kwargs):
+        """Set parameter 'using' to 'css selector'.
+        See more in 'wait_for_elements' method."""
+        return self.wait_for_elements('css selector', *args, **kwargs)
+
+    def element_by_contains_text(self, value):
+        """Set parameter 'using' to 'text contains'.
+        See more in 'element' method."""
+        return self.element('text contains', value)
+
+    def element_by_contains_text_if_exists(self, value):
+        """Set parameter 'using' to 'text contains'.
+        See more in 'element_if_exists' method."""
+        return self.element_if_exists('text contains', value)
+
+    def element_by_contains_text_or_none(self, value):
+        """Set parameter 'using' to 'text contains'.
+        See more in 'element_or_none' method."""
+        return self.element_or_none('text contains', value)
+
+    def wait_for_element_by_contains_text(self, *args, **kwargs):
+        """Set parameter 'using' to 'text contains'.
+        See more in 'wait_for_element' method."""
+        return self.wait_for_element('text contains', *args, **kwargs)
+
+    def elements_by_contains_text(self, value, lazy=False):
+        """Set parameter 'using' to 'text contains'.
+        See more in 'elements' method."""
+        return self.elements('text contains', value, lazy)
+
+    def wait_for_elements_by_contains_text(self, *args, **kwargs):
+        """Set parameter 'using' to 'text contains'.
+        See more in 'wait_for_elements' method."""
+        return self.wait_for_elements('text contains', *args, **kwargs)
+
+    def element_by_contains_desc(self, value):
+        """Set parameter 'using' to 'desc contains'.
+        See more in 'element' method."""
+        return self.element('desc contains', value)
+
+    def element_by_contains_desc_if_exists(self, value):
+        """Set parameter 'using' to 'desc contains'.
+        See more in 'element_if_exists' method."""
+        return self.element_if_exists('desc contains', value)
+
+    def element_by_contains_desc_or_none(self, value):
+        """Set parameter 'using' to 'desc contains'.
+        See more in 'element_or_none' method."""
+        return self.element_or_none('desc contains', value)
+
+    def wait_for_element_by_contains_desc(self, *args, **kwargs):
+        """Set parameter 'using' to 'desc contains'.
+        See more in 'wait_for_element' method."""
+        return self.wait_for_element('desc contains', *args, **kwargs)
+
+    def elements_by_contains_desc(self, value, lazy=False):
+        """Set parameter 'using' to 'desc contains'.
+        See more in 'elements' method."""
+        return self.elements('desc contains', value, lazy)
+
+    def wait_for_elements_by_contains_desc(self, *args, **kwargs):
+        """Set parameter 'using' to 'desc contains'.
+        See more in 'wait_for_elements' method."""
+        return self.wait_for_elements('desc contains', *args, **kwargs)
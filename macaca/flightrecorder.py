@@ -0,0 +1,186 @@
+#
+# Always-on ring buffer of the last commands executed by a driver
+#
+
+import time
+import weakref
+
+from .command import command_name
+from .webelement import WebElement
+
+# Every live recorder, so that test runners can dump them on failure.
+_RECORDERS = weakref.WeakSet()
+
+
+def _cut(value, limit):
+    """Return value with long strings cut to limit, lists to 8 items and
+    WebElement replaced by their ids. Containers are only copied when
+    something in them changes."""
+    if isinstance(value, WebElement):
+        return value.element_id
+    if isinstance(value, str):
+        if len(value) > limit:
+            return '{0}...<{1} chars>'.format(value[:limit], len(value))
+        return value
+    if isinstance(value, dict):
+        changed = None
+        for k, v in value.items():
+            item = _cut(v, limit)
+            if item is not v:
+                if changed is None:
+                    changed = dict(value)
+                changed[k] = item
+        return value if changed is None else changed
+    if isinstance(value, (list, tuple)):
+        items = [_cut(v, limit) for v in value[:8]]
+        if len(value) > 8:
+            items.append('...<{0} items>'.format(len(value)))
+        elif all(a is b for a, b in zip(items, value)):
+            return value
+        return items
+    return value
+
+
+def _snapshot(data, limit):
+    """Shallow copy of the command data with its values cut, see _cut."""
+    if not isinstance(data, dict):
+        return _cut(data, limit)
+    return dict((k, _cut(v, limit)) for k, v in data.items())
+
+
+class FlightRecord(object):
+    """One slot of the ring buffer, reused in place.
+
+    Attributes:
+        timestamp(float): Wall clock time the command finished.
+        command(Command): The defined command.
+        duration(float): Wall time spent in seconds.
+        data(dict): Snapshot of the uri variable and body, truncated.
+        status(str): 'ok', the WebDriverError name or the exception name.
+    """
+
+    __slots__ = ('timestamp', 'command', 'duration', 'data', 'status')
+
+    def __init__(self):
+        self.timestamp = None
+        self.command = None
+        self.duration = None
+        self.data = None
+        self.status = None
+
+    def to_dict(self):
+        """Return the record as a plain dict."""
+        return {
+            'timestamp': self.timestamp,
+            'command': command_name(self.command),
+            'duration': self.duration,
+            'data': self.data,
+            'status': self.status
+        }
+
+    def __str__(self):
+        return '{0}.{1:03d} {2:<28}{3:>9.1f}ms  {4:<20}{5}'.format(
+            time.strftime('%H:%M:%S', time.localtime(self.timestamp)),
+            int(self.timestamp * 1000) % 1000, command_name(self.command),
+            self.duration * 1000, self.status, self.data)
+
+
+class FlightRecorder(object):
+    """Bounded, preallocated ring buffer of the last commands.
+
+    Every WebDriver owns one (driver.flight_recorder), set it to None to
+    disable recording. Recording reuses a preallocated slot and takes a
+    shallow snapshot of the command data: strings longer than max_length
+    and lists longer than 8 items are cut and elements are kept as their
+    ids, so the buffer stays bounded and does not keep elements alive.
+    Short values are shared rather than copied.
+
+    Attributes:
+        size(int): Number of commands kept.
+        max_length(int): Strings longer than this are truncated.
+        count(int): Number of commands recorded since creation.
+    """
+
+    def __init__(self, size=64, max_length=200):
+        if size < 1:
+            raise ValueError('size must be positive')
+        self.size = size
+        self.max_length = max_length
+        self.count = 0
+        self._slots = [FlightRecord() for _ in range(size)]
+        _RECORDERS.add(self)
+
+    def record(self, command, data, duration, error=None):
+        """Record a finished command in the next slot.
+
+        Args:
+            command(Command): The defined command.
+            data(dict): The uri variable and body.
+            duration(float): Wall time spent in seconds.
+            error(Exception): The exception raised, None on success.
+        """
+        slot = self._slots[self.count % self.size]
+        self.count += 1
+        slot.timestamp = time.time()
+        slot.command = command
+        slot.duration = duration
+        slot.data = _snapshot(data, self.max_length)
+        if error is None:
+            slot.status = 'ok'
+        else:
+            status = getattr(error, 'error', None)
+            slot.status = getattr(status, 'name', None) or \
+                str(status or type(error).__name__)
+
+    def records(self, since=None):
+        """Return the recorded commands, oldest first.
+
+        Args:
+            since(float): Only return records finished at or after this
+                wall clock time.
+
+        Returns:
+            A list of FlightRecord.
+        """
+        if self.count <= self.size:
+            slots = self._slots[:self.count]
+        else:
+            index = self.count % self.size
+            slots = self._slots[index:] + self._slots[:index]
+        if since is not None:
+            slots = [slot for slot in slots if slot.timestamp >= since]
+        return slots
+
+    def dump(self, since=None):
+        """Format the recorded commands, oldest first, one per line.
+
+        Args:
+            since(float): Only dump records finished at or after this
+                wall clock time.
+
+        Returns:
+            A multi-line string.
+        """
+        records = self.records(since)
+        lines = ['last {0} of {1} commands:'.format(len(records), self.count)]
+        lines.extend('  ' + str(record) for record in records)
+        return '\n'.join(lines)
+
+    def clear(self):
+        """Forget the recorded commands."""
+        self.count = 0
+        for slot in self._slots:
+            slot.data = None
+
+
+def active_recorders(since):
+    """Return the live recorders that recorded a command since a time.
+
+    Args:
+        since(float): Wall clock time.
+
+    Returns:
+        A list of FlightRecorder.
+    """
+    return [recorder for recorder in list(_RECORDERS)
+            if recorder.records(since)]
@@ -0,0 +1,177 @@
+#
+# Persistent per-run latency history in SQLite
+#
+# Usage:
+#     store = HistoryStore('wd-history.sqlite')
+#     store.record_metrics(METRICS, capabilities=caps, build='1.2.0')
+#     for regression in store.find_regressions():
+#         print(regression)
+#
+
+import json
+import sqlite3
+import time
+import uuid
+from collections import defaultdict, namedtuple
+
+from .metrics import METRICS, histogram_quantile
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS command_latency (
+    run_id TEXT NOT NULL,
+    created REAL NOT NULL,
+    hub TEXT NOT NULL,
+    capabilities TEXT NOT NULL,
+    build TEXT,
+    command TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    error_counts TEXT NOT NULL,
+    latency_sum REAL NOT NULL,
+    p50 REAL,
+    p95 REAL,
+    buckets TEXT NOT NULL,
+    request_bytes INTEGER NOT NULL,
+    response_bytes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS command_latency_key
+    ON command_latency (hub, capabilities, command, created);
+'''
+
+Regression = namedtuple('Regression', [
+    'hub', 'capabilities', 'command', 'baseline_p95', 'recent_p95', 'ratio'])
+
+
+def _merge_buckets(rows):
+    counts = defaultdict(int)
+    order = []
+    for buckets in rows:
+        for bound, count in buckets:
+            if bound not in counts:
+                order.append(bound)
+            counts[bound] += count
+    order.sort(key=lambda bound: float('inf') if bound == '+Inf'
+               else float(bound))
+    return [(bound, counts[bound]) for bound in order]
+
+
+class HistoryStore(object):
+    """Append aggregated metrics of each run into a SQLite database.
+
+    Rows are keyed by hub, capabilities (canonical JSON) and build, one
+    row per command and run.
+
+    Attributes:
+        path(str): The database file, ':memory:' for a transient store.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def record_metrics(self, metrics=METRICS, capabilities=None, build=None,
+                       run_id=None, reset=False):
+        """Append the current metrics as one run.
+
+        Args:
+            metrics(Metrics): The registry to export.
+            capabilities(dict): The capabilities the run used.
+            build(str): The app or hub build under test.
+            run_id(str): Identifier of the run, generated if omitted.
+            reset(bool): Reset the registry after reading it.
+
+        Returns:
+            The run id.
+        """
+        run_id = run_id or uuid.uuid4().hex
+        created = time.time()
+        capabilities = json.dumps(capabilities or {}, sort_keys=True)
+        rows = []
+        for hub, commands in metrics.snapshot(reset=reset).items():
+            for command, stats in commands.items():
+                buckets = stats['latency_buckets']
+                rows.append((
+                    run_id, created, hub, capabilities, build, command,
+                    stats['count'], sum(stats['errors'].values()),
+                    json.dumps(stats['errors'], sort_keys=True),
+                    stats['latency_sum'],
+                    histogram_quantile(buckets, 0.5),
+                    histogram_quantile(buckets, 0.95),
+                    json.dumps(buckets),
+                    stats['request_bytes'], stats['response_bytes']))
+        with self._conn:
+            self._conn.executemany(
+                'INSERT INTO command_latency VALUES '
+                '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        return run_id
+
+    def runs(self, command=None, hub=None):
+        """Return the recorded rows as dicts, newest first.
+
+        Args:
+            command(str): Only return this command.
+            hub(str): Only return this hub.
+        """
+        query = 'SELECT * FROM command_latency'
+        clauses, params = [], []
+        for column, value in (('command', command), ('hub', hub)):
+            if value is not None:
+                clauses.append('{0} = ?'.format(column))
+                params.append(value)
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+        query += ' ORDER BY created DESC, rowid DESC'
+        cursor = self._conn.execute(query, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def find_regressions(self, recent_runs=1, baseline_runs=20,
+                         threshold=1.2, min_count=10, hub=None):
+        """Flag commands whose p95 grew against a baseline window.
+
+        For every hub, capabilities and command, the latest recent_runs
+        runs are compared with the baseline_runs runs before them. The
+        p95 of each window is estimated from the merged histograms.
+
+        Args:
+            recent_runs(int): Number of latest runs forming the window.
+            baseline_runs(int): Number of earlier runs forming the baseline.
+            threshold(float): Flag when recent p95 > baseline p95 * threshold.
+            min_count(int): Ignore windows with fewer calls.
+            hub(str): Only check this hub.
+
+        Returns:
+            A list of Regression, worst ratio first.
+        """
+        groups = defaultdict(list)
+        for row in self.runs(hub=hub):
+            groups[(row['hub'], row['capabilities'], row['command'])].append(
+                row)
+
+        regressions = []
+        for (hub_url, capabilities, command), rows in groups.items():
+            recent = rows[:recent_runs]
+            baseline = rows[recent_runs:recent_runs + baseline_runs]
+            if not baseline:
+                continue
+            windows = []
+            for window in (baseline, recent):
+                if sum(row['count'] for row in window) < min_count:
+                    break
+                windows.append(histogram_quantile(_merge_buckets(
+                    json.loads(row['buckets']) for row in window), 0.95))
+            if len(windows) != 2 or not windows[0]:
+                continue
+            baseline_p95, recent_p95 = windows
+            ratio = recent_p95 / baseline_p95
+            if ratio > threshold:
+                regressions.append(Regression(
+                    hub_url, json.loads(capabilities), command,
+                    baseline_p95, recent_p95, ratio))
+        regressions.sort(key=lambda regression: -regression.ratio)
+        return regressions
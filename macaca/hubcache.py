@@ -0,0 +1,160 @@
+#
+# Shared cache of the sessionless STATUS and GET_ALL_SESSIONS endpoints
+#
+
+import threading
+from copy import copy
+
+from .command import Command, command_name
+from .util import monotonic
+from .webdriverresult import WebDriverResult
+
+# Endpoints answered by the hub regardless of any session.
+SESSIONLESS_COMMANDS = frozenset([Command.STATUS, Command.GET_ALL_SESSIONS])
+
+
+class _Entry(object):
+    """Last known response of one endpoint of one hub."""
+
+    __slots__ = ('value', 'error', 'fetched', 'read', 'lock')
+
+    def __init__(self):
+        self.value = None
+        self.error = None
+        self.fetched = None
+        self.read = None
+        self.lock = threading.Lock()
+
+
+class HubCache(object):
+    """Shared cache of STATUS and GET_ALL_SESSIONS responses per hub, see
+    WebDriver.use_hub_cache.
+
+    The first read of an endpoint is sent synchronously. Later reads return
+    the last known value at once, while a single daemon thread per hub
+    refreshes every endpoint read within idle_timeout seconds once per
+    ttl, through its own invoker (see RemoteInvoker.detached) so that it
+    neither races with nor inherits the headers and profiler of the
+    drivers. Without background refresh, values older than ttl are fetched
+    again synchronously, by one caller at a time.
+
+    Attributes:
+        ttl(float): Seconds after which a value is refreshed.
+        refresh(bool): Refresh values in a background thread.
+        idle_timeout(float): The refresher of a hub stops when none of its
+            values were read for that long.
+        refreshes(int): Responses fetched, synchronously or not.
+    """
+
+    def __init__(self, ttl=1.0, refresh=True, idle_timeout=60.0):
+        self.ttl = ttl
+        self.refresh = refresh
+        self.idle_timeout = idle_timeout
+        self.refreshes = 0
+        self._entries = {}
+        self._refreshers = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def get(self, invoker, command):
+        """Return the last known value of a sessionless endpoint.
+
+        Args:
+            invoker(RemoteInvoker): The invoker of the hub.
+            command(Command): STATUS or GET_ALL_SESSIONS.
+
+        Returns:
+            The unwrapped value field in the json response.
+
+        Raises:
+            WebDriverException: No value could be fetched yet.
+            ValueError: The command is not sessionless.
+        """
+        if command not in SESSIONLESS_COMMANDS:
+            raise ValueError('{0} is not sessionless'.format(
+                command_name(command)))
+        key = (invoker.hub, command)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+        entry.read = monotonic()
+        if entry.fetched is None or (
+                not self.refresh and entry.read - entry.fetched >= self.ttl):
+            with entry.lock:
+                # another caller may have fetched it while we waited
+                if entry.fetched is None or (
+                        not self.refresh and
+                        monotonic() - entry.fetched >= self.ttl):
+                    self._fetch(invoker, command, entry)
+        if entry.fetched is None:
+            # nothing was ever fetched, the next read tries again
+            raise entry.error
+        if self.refresh:
+            self._ensure_refresher(invoker)
+        value = entry.value
+        return copy(value) if isinstance(value, (list, dict)) else value
+
+    def invalidate(self):
+        """Forget every value, the next reads are sent synchronously."""
+        with self._lock:
+            self._entries = {}
+
+    def stop(self):
+        """Stop the background refreshers."""
+        self._stop.set()
+        with self._lock:
+            refreshers = list(self._refreshers.values())
+            self._refreshers = {}
+        for thread in refreshers:
+            thread.join()
+        self._stop = threading.Event()
+
+    def _fetch(self, invoker, command, entry):
+        try:
+            ret = WebDriverResult.from_object(invoker.execute(command, {}))
+            ret.raise_for_status()
+        except Exception as err:
+            entry.error = err
+            if entry.fetched is None:
+                self.refreshes += 1
+                return
+        else:
+            entry.value = ret.value
+            entry.error = None
+        entry.fetched = monotonic()
+        self.refreshes += 1
+
+    def _ensure_refresher(self, invoker):
+        hub = invoker.hub
+        with self._lock:
+            if hub in self._refreshers:
+                return
+            thread = threading.Thread(
+                target=self._refresh_loop,
+                args=(invoker.detached(), self._stop),
+                name='macaca-hub-cache')
+            thread.daemon = True
+            self._refreshers[hub] = thread
+        thread.start()
+
+    def _refresh_loop(self, invoker, stop):
+        hub = invoker.hub
+        while not stop.wait(self.ttl):
+            now = monotonic()
+            with self._lock:
+                entries = [
+                    (key[1], entry) for key, entry in self._entries.items()
+                    if key[0] == hub and entry.read is not None and
+                    now - entry.read < self.idle_timeout]
+                if not entries:
+                    if self._refreshers.get(hub) is \
+                            threading.current_thread():
+                        del self._refreshers[hub]
+                    return
+            for command, entry in entries:
+                with entry.lock:
+                    self._fetch(invoker, command, entry)
+
+
+HUB_CACHE = HubCache()
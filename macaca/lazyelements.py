@@ -0,0 +1,104 @@
+#
+# Lazy, sliceable sequence of elements backed by the raw id list
+#
+
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
+from .webelement import ELEMENT_KEY, W3C_ELEMENT_KEY
+
+
+def element_ids(value):
+    """Extract the element ids of a raw find elements response value.
+
+    Args:
+        value(list): The value field in the json response.
+
+    Returns:
+        A list of element ids.
+    """
+    ids = []
+    for item in value or ():
+        if ELEMENT_KEY in item:
+            ids.append(str(item[ELEMENT_KEY]))
+        else:
+            ids.append(str(item[W3C_ELEMENT_KEY]))
+    return ids
+
+
+class LazyElements(Sequence):
+    """Read-only sequence of WebElement created on access.
+
+    Only the element ids are held; len, slicing and iterating over ids
+    never create WebElement objects. Indexing and iterating create them
+    on each access, unless the driver identity map is enabled.
+
+    Attributes:
+        ids(list): The element ids, in document order.
+    """
+
+    __slots__ = ('_driver', 'ids', '_locator')
+
+    def __init__(self, driver, ids):
+        """Initialize the LazyElements
+
+        Args:
+            driver(WebDriver): The WebDriver Object.
+            ids(list): The element ids returned by remote servers.
+        """
+        self._driver = driver
+        self.ids = ids
+        # (parent, using, value, indexes in the find result), see
+        # remember_locator
+        self._locator = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            els = LazyElements(self._driver, self.ids[index])
+            if self._locator is not None:
+                parent, using, value, indexes = self._locator
+                els._locator = (parent, using, value, indexes[index])
+            return els
+        return self._make_element(index)
+
+    def __iter__(self):
+        if self._locator is not None:
+            for index in range(len(self.ids)):
+                yield self._make_element(index)
+            return
+        make_element = self._driver._make_element
+        for element_id in self.ids:
+            yield make_element(element_id)
+
+    def _make_element(self, index):
+        el = self._driver._make_element(self.ids[index])
+        if self._locator is not None:
+            parent, using, value, indexes = self._locator
+            el._locator = (parent, using, value, indexes[index])
+        return el
+
+    def __contains__(self, el):
+        return getattr(el, 'element_id', None) in self.ids
+
+    def __eq__(self, other):
+        if isinstance(other, LazyElements):
+            return self.ids == other.ids
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '<{0.__name__} (session="{1}", count={2})>'.format(
+            type(self), self._driver.session_id, len(self.ids))
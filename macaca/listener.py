@@ -0,0 +1,108 @@
+#
+# Listeners observing the commands executed by WebDriver
+#
+
+
+_GLOBAL_LISTENERS = []
+
+
+class CommandListener(object):
+    """Base class for objects observing WebDriver commands.
+
+    Listeners are registered per driver (``driver.listeners``) or for
+    every driver in the process (``add_listener``). Subclasses override
+    the hooks they need, the defaults do nothing.
+    """
+
+    def before_execute(self, driver, command, data):
+        """Called before a command is sent.
+
+        Args:
+            driver(WebDriver): The driver executing the command.
+            command(Command): The defined command.
+            data(dict): The uri variable and body.
+        """
+
+    def after_execute(self, driver, command, data, result, error, elapsed):
+        """Called after a command returned or failed.
+
+        Args:
+            driver(WebDriver): The driver executing the command.
+            command(Command): The defined command.
+            data(dict): The uri variable and body.
+            result: The value returned by WebDriver._execute, None on error.
+            error(Exception): The exception raised, None on success.
+            elapsed(float): Wall time spent in seconds.
+        """
+
+    def before_wait(self, driver, wait):
+        """Called before the first poll of a wait_for* method.
+
+        Args:
+            driver(WebDriver): The driver executing the wait.
+            wait(Wait): The wait description.
+        """
+
+    def after_wait_poll(self, driver, wait, elapsed, error):
+        """Called after each poll of a wait_for* method.
+
+        Args:
+            driver(WebDriver): The driver executing the wait.
+            wait(Wait): The wait description.
+            elapsed(float): Wall time spent in the poll in seconds.
+            error(Exception): The failure of the poll, None on success.
+        """
+
+    def after_wait_sleep(self, driver, wait, elapsed):
+        """Called after sleeping between two polls of a wait.
+
+        Args:
+            driver(WebDriver): The driver executing the wait.
+            wait(Wait): The wait description.
+            elapsed(float): Wall time spent sleeping in seconds.
+        """
+
+    def after_wait(self, driver, wait, result, error, elapsed):
+        """Called after a wait_for* method returned or failed.
+
+        Args:
+            driver(WebDriver): The driver executing the wait.
+            wait(Wait): The wait description.
+            result: The value returned by the wait, None on error.
+            error(Exception): The exception raised, None on success.
+            elapsed(float): Wall time spent in seconds.
+        """
+
+
+def add_listener(listener):
+    """Register a listener observing every WebDriver in the process.
+
+    Args:
+        listener(CommandListener): The listener to add.
+    """
+    if listener not in _GLOBAL_LISTENERS:
+        _GLOBAL_LISTENERS.append(listener)
+
+
+def remove_listener(listener):
+    """Unregister a listener added by add_listener, ignore unknown ones.
+
+    Args:
+        listener(CommandListener): The listener to remove.
+    """
+    if listener in _GLOBAL_LISTENERS:
+        _GLOBAL_LISTENERS.remove(listener)
+
+
+def get_listeners(driver):
+    """Return the listeners observing the given driver.
+
+    Args:
+        driver(WebDriver): The driver executing commands.
+
+    Returns:
+        A list of listeners, empty when nobody is listening.
+    """
+    if not _GLOBAL_LISTENERS:
+        return driver.listeners
+    return _GLOBAL_LISTENERS + driver.listeners
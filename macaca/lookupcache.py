@@ -0,0 +1,86 @@
+#
+# LRU cache of element lookups, invalidated by mutating commands
+#
+
+from collections import OrderedDict
+
+
+class LookupCache(object):
+    """Remember the element found by (context, using, value) until the next
+    mutating command, see WebDriver.use_lookup_cache.
+
+    Context is None for finds in the current WebDriver context and the
+    parent element id for finds in an element.
+
+    Attributes:
+        size(int): Maximum number of lookups kept, least recently used
+            ones are evicted first.
+        hits(int): Lookups served from the cache.
+        misses(int): Lookups sent to the server.
+        invalidations(int): Times a mutating command cleared the cache.
+    """
+
+    def __init__(self, size=128):
+        """Initialize the LookupCache
+
+        Args:
+            size(int): Maximum number of lookups kept.
+        """
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached element of a lookup, or None.
+
+        Args:
+            key(tuple): (context, using, value).
+
+        Returns:
+            WebElement Object or None.
+        """
+        entries = self._entries
+        element = entries.pop(key, None)
+        if element is None:
+            self.misses += 1
+            return None
+        entries[key] = element
+        self.hits += 1
+        return element
+
+    def put(self, key, element):
+        """Cache the element found by a lookup.
+
+        Args:
+            key(tuple): (context, using, value).
+            element(WebElement): The element found.
+        """
+        entries = self._entries
+        entries.pop(key, None)
+        entries[key] = element
+        while len(entries) > self.size:
+            entries.popitem(last=False)
+
+    def invalidate(self):
+        """Forget every lookup."""
+        if self._entries:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        """Return the counters as a dict.
+
+        Returns:
+            A dict with hits, misses, invalidations and size.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'size': len(self._entries)
+        }
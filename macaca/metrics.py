@@ -0,0 +1,227 @@
+#
+# Per-command latency histograms, error and byte counters
+#
+
+import threading
+from bisect import bisect_left
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class CommandStats(object):
+    """Counters of one command against one hub."""
+
+    __slots__ = ('count', 'latency_sum', 'buckets', 'errors',
+                 'request_bytes', 'response_bytes')
+
+    def __init__(self, bucket_count):
+        self.count = 0
+        self.latency_sum = 0.0
+        # One slot per bucket plus the +Inf overflow, not cumulative.
+        self.buckets = [0] * (bucket_count + 1)
+        self.errors = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+class Metrics(object):
+    """Registry of command metrics keyed by hub and command name.
+
+    Recording takes a lock, a dict lookup and a bisect. Every
+    RemoteInvoker records into the module level METRICS by default,
+    assign `remote_invoker.metrics = None` to disable recording.
+
+    Attributes:
+        buckets(tuple): Upper bounds of the latency histogram in seconds.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _get(self, hub, command):
+        key = (hub, command)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = CommandStats(len(self.buckets))
+        return stats
+
+    def record(self, hub, command, elapsed, request_bytes=0,
+               response_bytes=0):
+        """Record a completed request.
+
+        Args:
+            hub(str): The remote server url.
+            command(str): The command name, e.g. 'FIND_ELEMENT'.
+            elapsed(float): Latency in seconds.
+            request_bytes(int): Size of the request body.
+            response_bytes(int): Size of the response body.
+        """
+        index = bisect_left(self.buckets, elapsed)
+        with self._lock:
+            stats = self._get(hub, command)
+            stats.count += 1
+            stats.latency_sum += elapsed
+            stats.buckets[index] += 1
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+
+    def record_error(self, hub, command, error):
+        """Record a failed command.
+
+        Args:
+            hub(str): The remote server url.
+            command(str): The command name, e.g. 'FIND_ELEMENT'.
+            error(str): The WebDriverError name or the transport
+                exception class name.
+        """
+        with self._lock:
+            errors = self._get(hub, command).errors
+            errors[error] = errors.get(error, 0) + 1
+
+    def reset(self):
+        """Drop every recorded value."""
+        with self._lock:
+            self._stats = {}
+
+    def snapshot(self, reset=False):
+        """Return the recorded values as plain dicts.
+
+        Args:
+            reset(bool): Atomically drop the values after reading them.
+
+        Returns:
+            {hub: {command: {'count', 'errors', 'latency_sum',
+            'latency_buckets', 'request_bytes', 'response_bytes'}}},
+            latency_buckets maps upper bounds ('+Inf' last) to
+            cumulative counts.
+        """
+        with self._lock:
+            stats = self._stats
+            if reset:
+                self._stats = {}
+            else:
+                stats = dict(stats)
+            items = [(key, value.count, value.latency_sum,
+                      list(value.buckets), dict(value.errors),
+                      value.request_bytes, value.response_bytes)
+                     for key, value in stats.items()]
+
+        bounds = [repr(bound) for bound in self.buckets] + ['+Inf']
+        result = {}
+        for ((hub, command), count, latency_sum, buckets, errors,
+             request_bytes, response_bytes) in items:
+            cumulative = []
+            total = 0
+            for bucket in buckets:
+                total += bucket
+                cumulative.append(total)
+            result.setdefault(hub, {})[command] = {
+                'count': count,
+                'errors': errors,
+                'latency_sum': latency_sum,
+                'latency_buckets': list(zip(bounds, cumulative)),
+                'request_bytes': request_bytes,
+                'response_bytes': response_bytes
+            }
+        return result
+
+    def to_prometheus(self, prefix='macaca'):
+        """Export the recorded values in Prometheus text format.
+
+        Args:
+            prefix(str): Prefix of the metric names.
+
+        Returns:
+            A string in the Prometheus exposition format 0.0.4.
+        """
+        snapshot = self.snapshot()
+        rows = sorted(
+            (hub, command, stats) for hub, commands in snapshot.items()
+            for command, stats in commands.items())
+
+        duration = '{0}_command_duration_seconds'.format(prefix)
+        errors = '{0}_command_errors_total'.format(prefix)
+        request_bytes = '{0}_command_request_bytes_total'.format(prefix)
+        response_bytes = '{0}_command_response_bytes_total'.format(prefix)
+
+        lines = [
+            '# HELP {0} WebDriver command latency.'.format(duration),
+            '# TYPE {0} histogram'.format(duration)]
+        for hub, command, stats in rows:
+            labels = _labels(hub=hub, command=command)
+            for bound, count in stats['latency_buckets']:
+                lines.append('{0}_bucket{{{1},le="{2}"}} {3}'.format(
+                    duration, labels, bound, count))
+            lines.append('{0}_sum{{{1}}} {2!r}'.format(
+                duration, labels, stats['latency_sum']))
+            lines.append('{0}_count{{{1}}} {2}'.format(
+                duration, labels, stats['count']))
+
+        lines.extend([
+            '# HELP {0} WebDriver command errors.'.format(errors),
+            '# TYPE {0} counter'.format(errors)])
+        for hub, command, stats in rows:
+            for error, count in sorted(stats['errors'].items()):
+                lines.append('{0}{{{1}}} {2}'.format(
+                    errors, _labels(hub=hub, command=command, error=error),
+                    count))
+
+        for name, key, text in (
+                (request_bytes, 'request_bytes', 'request'),
+                (response_bytes, 'response_bytes', 'response')):
+            lines.extend([
+                '# HELP {0} WebDriver {1} body bytes.'.format(name, text),
+                '# TYPE {0} counter'.format(name)])
+            for hub, command, stats in rows:
+                lines.append('{0}{{{1}}} {2}'.format(
+                    name, _labels(hub=hub, command=command), stats[key]))
+        return '\n'.join(lines) + '\n'
+
+
+def histogram_quantile(buckets, quantile):
+    """Estimate a quantile from cumulative histogram buckets.
+
+    Interpolates linearly inside the bucket holding the rank, like
+    Prometheus' histogram_quantile.
+
+    Args:
+        buckets(list): (upper bound, cumulative count) pairs as returned
+            in Metrics.snapshot, the last bound being '+Inf'.
+        quantile(float): The quantile in the range [0, 1].
+
+    Returns:
+        The estimated latency in seconds, None without observation.
+    """
+    if not buckets or not buckets[-1][1]:
+        return None
+    rank = quantile * buckets[-1][1]
+    lower_bound = 0.0
+    lower_count = 0
+    for bound, count in buckets:
+        if count >= rank and count > lower_count:
+            if bound == '+Inf':
+                return lower_bound
+            upper_bound = float(bound)
+            return lower_bound + (upper_bound - lower_bound) * (
+                (rank - lower_count) / float(count - lower_count))
+        if bound != '+Inf':
+            lower_bound = float(bound)
+        lower_count = count
+    return lower_bound
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace(
+        '"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ','.join('{0}="{1}"'.format(key, _escape(labels[key]))
+                    for key in sorted(labels))
+
+
+METRICS = Metrics()
@@ -0,0 +1,106 @@
+#
+# Pinned scripts: install a script once per page, call it through a stub
+#
+
+import hashlib
+
+# Page global holding the installed scripts by handle.
+_REGISTRY = 'window.__macacaPinned'
+
+# Returned by a stub when the page does not have the script (navigation).
+MISSING = 'macaca:unpinned'
+
+_INSTALL = (
+    'var pinned = {registry} || ({registry} = {{}});\n'
+    'pinned["{handle}"] = function () {{\n'
+    '{script}\n'
+    '}};\n'
+    'return pinned["{handle}"].apply(this, arguments);')
+
+_STUB = (
+    'var f = {registry} && {registry}["{handle}"];\n'
+    'return f ? f.apply(this, arguments) : "{missing}";')
+
+
+class PinnedScript(object):
+    """A script body installed once per page and then called by handle,
+    see WebDriver.execute_pinned_script.
+
+    Attributes:
+        script(str): The JavaScript function body, as for execute_script.
+        handle(str): Identifier of the script in the page.
+        install(str): Script defining the function and calling it.
+        stub(str): Script calling the installed function, answering
+            MISSING when the page does not have it (after a navigation).
+    """
+
+    __slots__ = ('script', 'handle', 'install', 'stub')
+
+    def __init__(self, script):
+        """Initialize the PinnedScript
+
+        Args:
+            script(str): The JavaScript function body.
+        """
+        self.script = script
+        self.handle = hashlib.sha1(script.encode('utf-8')).hexdigest()[:16]
+        self.install = _INSTALL.format(
+            registry=_REGISTRY, handle=self.handle, script=script)
+        self.stub = _STUB.format(
+            registry=_REGISTRY, handle=self.handle, missing=MISSING)
+
+    def __repr__(self):
+        return '<{0.__name__} (handle="{1}", {2} chars)>'.format(
+            type(self), self.handle, len(self.script))
+
+
+class ScriptPinner(object):
+    """Per-driver state of the pinned scripts.
+
+    Attributes:
+        installed(set): Handles believed to be installed in the page.
+        calls(int): Pinned script calls.
+        installs(int): Times a script body was sent.
+        bytes_saved(int): Script characters not sent thanks to the stubs.
+    """
+
+    def __init__(self):
+        self.installed = set()
+        self.calls = 0
+        self.installs = 0
+        self.bytes_saved = 0
+
+    def execute(self, execute, pinned, args):
+        """Run a pinned script, sending its body only when the page lacks it.
+
+        Args:
+            execute(callable): Send (script, args), e.g. execute_script.
+            pinned(PinnedScript): The script to run.
+            args(list): Arguments for the script.
+
+        Returns:
+            The return value of the script.
+        """
+        self.calls += 1
+        if pinned.handle in self.installed:
+            value = execute(pinned.stub, args)
+            if value != MISSING:
+                self.bytes_saved += len(pinned.install) - len(pinned.stub)
+                return value
+            self.installed.discard(pinned.handle)
+        value = execute(pinned.install, args)
+        self.installs += 1
+        self.installed.add(pinned.handle)
+        return value
+
+    def report(self):
+        """Return the counters as a dict.
+
+        Returns:
+            A dict with calls, installs and bytes_saved.
+        """
+        return {
+            'calls': self.calls,
+            'installs': self.installs,
+            'bytes_saved': self.bytes_saved
+        }
@@ -0,0 +1,195 @@
+#
+# Hub latency probe
+#
+# Usage:
+#     macaca-probe http://127.0.0.1:3456/wd/hub -n 50 -c 4 \
+#         --caps '{"platformName": "Android", "app": "..."}'
+#
+# STATUS is answered by the hub alone and measures transport overhead;
+# the mini-session (find, text, screenshot) goes down to the device.
+#
+
+from __future__ import print_function
+
+import argparse
+import json
+import sys
+import threading
+from collections import defaultdict
+
+from .command import Command, command_name
+from .listener import CommandListener
+from .util import monotonic, percentile
+from .webdriver import WebDriver
+
+PERCENTILES = (50, 90, 99)
+
+
+class LatencyCollector(CommandListener):
+    """Collect per-command latencies from several drivers and threads.
+
+    Attributes:
+        latencies(dict): Command name to a list of seconds.
+        errors(dict): Command name to the number of failed calls.
+    """
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def after_execute(self, driver, command, data, result, error, elapsed):
+        self.record(command_name(command), elapsed, error)
+
+    def record(self, name, elapsed, error=None):
+        """Record one call.
+
+        Args:
+            name(str): The command name.
+            elapsed(float): Seconds the call took.
+            error(Exception): The failure, None on success.
+        """
+        with self._lock:
+            self.latencies[name].append(elapsed)
+            if error is not None:
+                self.errors[name] += 1
+
+    @property
+    def total(self):
+        """Number of commands recorded."""
+        return sum(len(values) for values in self.latencies.values())
+
+    def report(self, wall_time, workers):
+        """Format latency percentiles per command and the throughput.
+
+        Args:
+            wall_time(float): Duration of the probe in seconds.
+            workers(int): Number of concurrent workers.
+
+        Returns:
+            A multi-line string, latencies in milliseconds.
+        """
+        header = '{0:<28}{1:>7}{2:>7}'.format('command', 'count', 'errors')
+        for percent in PERCENTILES:
+            header += '{0:>10}'.format('p{0}'.format(percent))
+        header += '{0:>10}'.format('max')
+        lines = [header]
+        for name in sorted(self.latencies):
+            values = self.latencies[name]
+            line = '{0:<28}{1:>7}{2:>7}'.format(
+                name, len(values), self.errors.get(name, 0))
+            for percent in PERCENTILES + (100,):
+                line += '{0:>10.1f}'.format(
+                    percentile(values, percent) * 1000)
+            lines.append(line)
+        throughput = self.total / wall_time if wall_time > 0 else 0.0
+        lines.append('')
+        lines.append(
+            '{0} requests in {1:.2f}s with {2} workers: '
+            '{3:.1f} req/s'.format(self.total, wall_time, workers, throughput))
+        return '\n'.join(lines)
+
+
+def _probe_worker(args, collector):
+    status_driver = WebDriver({}, args.url)
+    status_driver.listeners.append(collector)
+    driver = None
+    if args.caps is not None:
+        driver = WebDriver(args.caps, args.url)
+        # timed here rather than by the listener, so that failures to
+        # reach the hub are counted and reported as well
+        start = monotonic()
+        try:
+            driver.init()
+        except Exception as err:
+            collector.record(
+                command_name(Command.NEW_SESSION), monotonic() - start, err)
+            print('NEW_SESSION failed: {0}'.format(err), file=sys.stderr)
+            driver = None
+        else:
+            collector.record(
+                command_name(Command.NEW_SESSION), monotonic() - start)
+            driver.listeners.append(collector)
+
+    for _ in range(args.iterations):
+        try:
+            status_driver._execute(Command.STATUS)
+        except Exception:
+            pass
+        if driver is None:
+            continue
+        try:
+            el = driver.element(args.using, args.value)
+            el.text
+            driver.take_screenshot()
+        except Exception:
+            pass
+
+    if driver is not None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+def parse_args(argv=None):
+    """Parse command line arguments of the probe."""
+    parser = argparse.ArgumentParser(
+        prog='macaca-probe',
+        description='Measure WebDriver hub latency per command.')
+    parser.add_argument(
+        'url', nargs='?', default='http://127.0.0.1:3456/wd/hub',
+        help='Remote hub url (default: %(default)s).')
+    parser.add_argument(
+        '-n', '--iterations', type=int, default=10,
+        help='Iterations per worker (default: %(default)s).')
+    parser.add_argument(
+        '-c', '--concurrency', type=int, default=1,
+        help='Number of concurrent workers (default: %(default)s).')
+    parser.add_argument(
+        '--caps', type=json.loads, default=None,
+        help='Desired capabilities as JSON; enables the mini-session '
+             '(find, text, screenshot). Without it only STATUS is probed.')
+    parser.add_argument(
+        '--using', default='xpath',
+        help='Locator strategy of the probed element (default: %(default)s).')
+    parser.add_argument(
+        '--value', default='//*',
+        help='Locator value of the probed element (default: %(default)s).')
+    args = parser.parse_args(argv)
+    if args.iterations < 1 or args.concurrency < 1:
+        parser.error('iterations and concurrency must be positive')
+    return args
+
+
+def main(argv=None):
+    """Entry point of the macaca-probe console script.
+
+    Returns:
+        Exit code, 1 if every STATUS request or every session creation
+        failed.
+    """
+    args = parse_args(argv)
+    collector = LatencyCollector()
+    workers = [
+        threading.Thread(target=_probe_worker, args=(args, collector))
+        for _ in range(args.concurrency)
+    ]
+    start = monotonic()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    wall_time = monotonic() - start
+
+    print(collector.report(wall_time, args.concurrency))
+    for command in (Command.STATUS, Command.NEW_SESSION):
+        name = command_name(command)
+        calls = len(collector.latencies.get(name, ()))
+        if calls and collector.errors.get(name, 0) == calls:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
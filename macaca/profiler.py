@@ -0,0 +1,75 @@
+#
+# Per-stage timing of WebDriver commands
+#
+
+from collections import OrderedDict
+
+# Stages in the order a command goes through them.
+STAGES = ('prepare', 'serialize', 'network', 'deserialize', 'wrap')
+
+
+class StageProfiler(object):
+    """Accumulate the time spent in each stage of each command.
+
+    Attributes:
+        stats(OrderedDict): Command name to a dict of stage to seconds,
+            in the order the commands were first seen.
+        counts(dict): Command name to the number of requests sent.
+    """
+
+    def __init__(self):
+        self.stats = OrderedDict()
+        self.counts = {}
+
+    def add(self, command, stage, seconds):
+        """Add time spent by a command in a stage.
+
+        Args:
+            command(str): The command name, e.g. 'FIND_ELEMENT'.
+            stage(str): One of STAGES.
+            seconds(float): Time spent.
+        """
+        stages = self.stats.get(command)
+        if stages is None:
+            stages = self.stats[command] = dict.fromkeys(STAGES, 0.0)
+            self.counts[command] = 0
+        stages[stage] += seconds
+        if stage == 'network':
+            self.counts[command] += 1
+
+    def totals(self):
+        """Return a dict of stage to seconds summed over every command."""
+        totals = dict.fromkeys(STAGES, 0.0)
+        for stages in self.stats.values():
+            for stage, seconds in stages.items():
+                totals[stage] += seconds
+        return totals
+
+    def summary(self):
+        """Format the per-stage time of each command, in milliseconds.
+
+        Returns:
+            A multi-line string with one row per command and a total row
+            giving each stage's share of the whole.
+        """
+        header = '{0:<28}{1:>7}'.format('command', 'count')
+        for stage in STAGES:
+            header += '{0:>13}'.format(stage)
+        lines = [header]
+        rows = list(self.stats.items()) + [('total', self.totals())]
+        for name, stages in rows:
+            count = sum(self.counts.values()) if name == 'total' \
+                else self.counts[name]
+            line = '{0:<28}{1:>7}'.format(name, count)
+            for stage in STAGES:
+                line += '{0:>13.3f}'.format(stages[stage] * 1000)
+            lines.append(line)
+
+        totals = self.totals()
+        overall = sum(totals.values())
+        if overall > 0:
+            line = '{0:<35}'.format('share')
+            for stage in STAGES:
+                line += '{0:>12.1f}%'.format(totals[stage] / overall * 100)
+            lines.append(line)
+        return '\n'.join(lines)
@@ -0,0 +1,192 @@
+#
+# Pytest plugin asserting WebDriver round trip budgets per test
+#
+# Loaded when the package is installed (entry point pytest11), or
+# explicitly with `pytest -p macaca.pytest_plugin`. It stays idle unless a
+# test carries the wd_budget marker, or recording is turned on with
+# --wd-record, --wd-round-trips or the wd_record ini option.
+#
+#     @pytest.mark.wd_budget(round_trips=40, seconds=30)
+#     def test_login(driver):
+#         ...
+#
+# With recording on, failing tests also get the flight recorder dump of
+# every driver used.
+#
+
+import time
+from collections import defaultdict
+
+import pytest
+
+from .command import command_name
+from .flightrecorder import active_recorders
+from .listener import CommandListener, add_listener, remove_listener
+from .util import caller_location
+
+_REPORT_KEY = '_wd_round_trips'
+
+
+class RoundTripRecorder(CommandListener):
+    """Count WebDriver round trips and the time spent in them.
+
+    Attributes:
+        round_trips(int): Number of commands executed.
+        seconds(float): Wall time spent executing commands.
+        by_command(dict): Command name to [count, seconds].
+        by_location(dict): Caller "file:line" to [count, seconds].
+    """
+
+    def __init__(self):
+        self.round_trips = 0
+        self.seconds = 0.0
+        self.by_command = defaultdict(lambda: [0, 0.0])
+        self.by_location = defaultdict(lambda: [0, 0.0])
+        self._locations = []
+
+    def before_execute(self, driver, command, data):
+        self._locations.append(caller_location())
+
+    def after_execute(self, driver, command, data, result, error, elapsed):
+        location = self._locations.pop() if self._locations else '<unknown>'
+        self.round_trips += 1
+        self.seconds += elapsed
+        for stat in (self.by_command[command_name(command)],
+                     self.by_location[location]):
+            stat[0] += 1
+            stat[1] += elapsed
+
+    def report(self, limit=10):
+        """Format where the round trips went.
+
+        Args:
+            limit(int): Maximum rows printed per table.
+
+        Returns:
+            A multi-line string.
+        """
+        lines = ['{0} round trips, {1:.3f}s'.format(
+            self.round_trips, self.seconds)]
+        for title, stats in (('by command', self.by_command),
+                             ('by location', self.by_location)):
+            if not stats:
+                continue
+            lines.append('  {0}:'.format(title))
+            rows = sorted(
+                stats.items(), key=lambda item: (-item[1][0], item[0]))
+            for key, (count, seconds) in rows[:limit]:
+                lines.append('    {0:>5} {1:>9.3f}s  {2}'.format(
+                    count, seconds, key))
+        return '\n'.join(lines)
+
+
+def _budget_violations(recorder, marker):
+    violations = []
+    round_trips = marker.kwargs.get('round_trips')
+    seconds = marker.kwargs.get('seconds')
+    if round_trips is not None and recorder.round_trips > round_trips:
+        violations.append('{0} round trips exceed budget of {1}'.format(
+            recorder.round_trips, round_trips))
+    if seconds is not None and recorder.seconds > seconds:
+        violations.append('{0:.3f}s in round trips exceed budget of '
+                          '{1}s'.format(recorder.seconds, seconds))
+    return violations
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('macaca')
+    group.addoption(
+        '--wd-record', action='store_true', default=False,
+        help='Record WebDriver round trips and flight recorder dumps of '
+             'every test.')
+    group.addoption(
+        '--wd-round-trips', action='store_true', default=False,
+        help='Print WebDriver round trips per test in the summary, '
+             'implies --wd-record.')
+    parser.addini(
+        'wd_record', type='bool', default=False,
+        help='Record WebDriver round trips of every test, see --wd-record.')
+
+
+def _budget_marker(item):
+    # get_closest_marker is pytest >= 3.6, get_marker was removed in 4.1
+    get_marker = getattr(item, 'get_closest_marker', None) or \
+        item.get_marker
+    return get_marker('wd_budget')
+
+
+def _recording(config):
+    return config.getoption('wd_record') or \
+        config.getoption('wd_round_trips') or config.getini('wd_record')
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'wd_budget(round_trips=None, seconds=None): fail the test when it '
+        'executes more WebDriver commands or spends more time in them.')
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    if not _recording(item.config) and \
+            _budget_marker(item) is None:
+        yield
+        return
+    recorder = RoundTripRecorder()
+    setattr(item, _REPORT_KEY, recorder)
+    add_listener(recorder)
+    started = time.time()
+    try:
+        outcome = yield
+    finally:
+        remove_listener(recorder)
+    if recorder.round_trips:
+        item.add_report_section(
+            'call', 'wd round trips', recorder.report())
+    excinfo = outcome.excinfo
+    if excinfo is not None and _recording(item.config) and \
+            not issubclass(excinfo[0], pytest.skip.Exception):
+        for flight_recorder in active_recorders(started):
+            item.add_report_section(
+                'call', 'wd flight recorder',
+                flight_recorder.dump(since=started))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    recorder = getattr(item, _REPORT_KEY, None)
+    marker = _budget_marker(item)
+    if call.when != 'call' or recorder is None or marker is None:
+        return
+    report = outcome.get_result()
+    violations = _budget_violations(recorder, marker)
+    if violations and report.passed:
+        report.outcome = 'failed'
+        report.longrepr = 'WebDriver budget exceeded: {0}\n{1}'.format(
+            '; '.join(violations), recorder.report())
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not terminalreporter.config.getoption('wd_round_trips'):
+        return
+    items = getattr(terminalreporter.config, '_wd_items', None) or []
+    if not items:
+        return
+    terminalreporter.write_sep('=', 'WebDriver round trips')
+    for nodeid, recorder in items:
+        terminalreporter.write_line(nodeid)
+        terminalreporter.write_line(recorder.report())
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_runtest_teardown(item):
+    recorder = getattr(item, _REPORT_KEY, None)
+    config = item.config
+    if recorder is None or not recorder.round_trips or \
+            not config.getoption('wd_round_trips'):
+        return
+    if not hasattr(config, '_wd_items'):
+        config._wd_items = []
+    config._wd_items.append((item.nodeid, recorder))
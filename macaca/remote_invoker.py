@@ -8,15 +8,51 @@ try:
 except ImportError:
     from urlparse import urlparse, urlunparse
 
-from requests import Request, Session
-
-from .util import MemorizeFormatter
+from .command import command_name
+from .metrics import METRICS
+from .util import MemorizeFormatter, monotonic
+from .wirelog import LazySummary
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _error_body(res):
+    """Return the decoded body of an HTTP error response when it carries a
+    WebDriver error, either {'status': 7, ...} or W3C {'value': {'error':
+    'no such element', ...}}, None otherwise."""
+    try:
+        body = res.json()
+    except ValueError:
+        return None
+    if not isinstance(body, dict):
+        return None
+    if body.get('status'):
+        return body
+    value = body.get('value')
+    if isinstance(value, dict) and 'error' in value:
+        return body
+    return None
+
+
 class RemoteInvoker(object):
-    """Remote Invoker to execute WebDriver command."""
+    """Remote Invoker to execute WebDriver command.
+
+    Attributes:
+        metrics(Metrics): Registry recording latency and payload sizes of
+            every request, None to disable. Defaults to metrics.METRICS.
+        headers(dict): Extra HTTP headers sent with every request.
+        profiler(StageProfiler): Receives per-stage timings of each
+            request when set, see WebDriver.profile.
+        log_max_length(int): Strings and lists in wire logs are cut to
+            this size.
+        log_redact_base64(bool): Replace base64 payloads in wire logs
+            by their size.
+
+    Wire logs are emitted at DEBUG level, and only formatted when it is
+    enabled. Records carry the structured fields wd_method, wd_url,
+    wd_command, wd_body on requests and wd_status, wd_elapsed, wd_bytes,
+    wd_value on responses.
+    """
 
     def __init__(self, url='http://127.0.0.1:3456/wd/hub'):
         """Init the RemoteInvoker by remote url
@@ -83,7 +119,34 @@ class RemoteInvoker(object):
             raise TypeError(
                 'URL \'{0}\' should be a string or a dict.'.format(url))
 
-        self._formatter = MemorizeFormatter()
+        parsed_url = urlparse(self._url)
+        netloc = parsed_url.hostname or ''
+        if parsed_url.port:
+            netloc = '{0}:{1}'.format(netloc, parsed_url.port)
+        self._hub = urlunparse(
+            (parsed_url.scheme, netloc, parsed_url.path, '', '', ''))
+        self.metrics = METRICS
+        self.headers = {}
+        self.profiler = None
+        self.log_max_length = 256
+        self.log_redact_base64 = True
+
+    @property
+    def hub(self):
+        """The remote server url without credentials."""
+        return self._hub
+
+    def detached(self):
+        """Return a new invoker to the same server, without the headers,
+        profiler and metrics of this one, for background requests.
+
+        Returns:
+            RemoteInvoker Object.
+        """
+        invoker = RemoteInvoker(self._url)
+        invoker._timeout = self._timeout
+        invoker.metrics = None
+        return invoker
 
     def execute(self, command, data={}):
         """Format the endpoint url by data and then request the remote server.
@@ -103,23 +166,33 @@ class RemoteInvoker(object):
             HTTPError: HTTP request returned an unsuccessful status code.
         """
         method, uri = command
+        profiler = self.profiler
+        if profiler is not None:
+            start = monotonic()
         try:
-            path = self._formatter.format_map(uri, data)
-            body = self._formatter.get_unused_kwargs()
+            # one formatter per call, it holds the kwargs of the call and
+            # an invoker may be shared between threads
+            formatter = MemorizeFormatter()
+            path = formatter.format_map(uri, data)
+            body = formatter.get_unused_kwargs()
             url = "{0}{1}".format(self._url, path)
-            return self._request(method, url, body)
+            name = command_name(command)
+            if profiler is not None:
+                profiler.add(name, 'prepare', monotonic() - start)
+            return self._request(method, url, body, name)
         except KeyError as err:
-            LOGGER.debug(
-                'Endpoint {0} is missing argument {1}'.format(uri, err))
+            LOGGER.debug('Endpoint %s is missing argument %s', uri, err)
             raise
 
-    def _request(self, method, url, body):
+    def _request(self, method, url, body, name=None):
         """Internal method to send request to the remote server.
 
         Args:
             method(str): HTTP Method(GET/POST/PUT/DELET/HEAD).
             url(str): The request url.
             body(dict): The JSON object to be sent.
+            name(str): The command name metrics are recorded under,
+                nothing is recorded if omitted.
 
         Returns:
             A dict represent the json body from server response.
@@ -130,18 +203,68 @@ class RemoteInvoker(object):
             Timeout: A request times out.
             HTTPError: HTTP request returned an unsuccessful status code.
         """
+        # requests is imported on first use to keep `import macaca` cheap
+        from requests import Request, Session
+
+        profiler = self.profiler if name is not None else None
+        if profiler is not None:
+            begin = monotonic()
+
         if method != 'POST' and method != 'PUT':
             body = None
 
         s = Session()
 
-        LOGGER.debug(
-            'Method: {0}, Url: {1}, Body: {2}.'.format(method, url, body))
+        debug = LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
+            safe_url = self._hub + url[len(self._url):] \
+                if url.startswith(self._url) else url
+            summary = LazySummary(
+                body, self.log_max_length, self.log_redact_base64)
+            LOGGER.debug(
+                'Method: %s, Url: %s, Body: %s.', method, safe_url, summary,
+                extra={'wd_method': method, 'wd_url': safe_url,
+                       'wd_command': name, 'wd_body': summary})
 
-        req = Request(method, url, json=body)
+        if profiler is not None:
+            serialize_start = monotonic()
+        req = Request(method, url, json=body, headers=self.headers or None)
         prepped = s.prepare_request(req)
 
-        res = s.send(prepped, timeout=self._timeout or None)
-        res.raise_for_status()
-        # TODO try catch
-        return res.json()
+        metrics = self.metrics if name is not None else None
+        start = monotonic()
+        try:
+            res = s.send(prepped, timeout=self._timeout or None)
+            received = monotonic()
+            if res.status_code >= 400:
+                value = _error_body(res)
+                if value is None:
+                    res.raise_for_status()
+            else:
+                # TODO try catch
+                value = res.json()
+        except Exception as err:
+            if metrics is not None:
+                metrics.record_error(self._hub, name, type(err).__name__)
+            raise
+        end = monotonic()
+        if debug:
+            summary = LazySummary(
+                value, self.log_max_length, self.log_redact_base64)
+            LOGGER.debug(
+                'Status: %s, Elapsed: %.1fms, Bytes: %s, Value: %s.',
+                res.status_code, (end - start) * 1000, len(res.content),
+                summary,
+                extra={'wd_status': res.status_code,
+                       'wd_elapsed': end - start,
+                       'wd_bytes': len(res.content), 'wd_value': summary})
+        if metrics is not None:
+            metrics.record(
+                self._hub, name, end - start,
+                len(prepped.body or b''), len(res.content))
+        if profiler is not None:
+            profiler.add(name, 'prepare', serialize_start - begin)
+            profiler.add(name, 'serialize', start - serialize_start)
+            profiler.add(name, 'network', received - start)
+            profiler.add(name, 'deserialize', end - received)
+        return value
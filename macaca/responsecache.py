@@ -0,0 +1,146 @@
+#
+# Cache of read-only session commands, invalidated by mutating commands
+#
+
+from .command import Command, command_name, is_mutating
+from .util import monotonic
+
+# Seconds a response is served from the cache, for the commands cached by
+# default. The page may change them on its own, hence the short TTLs on
+# what scripts commonly touch.
+DEFAULT_TTLS = {
+    Command.GET_TITLE: 1.0,
+    Command.GET_CURRENT_URL: 1.0,
+    Command.GET_ALL_COOKIES: 1.0,
+    Command.GET_CURRENT_WINDOW_HANDLE: 5.0,
+    Command.GET_WINDOW_HANDLES: 5.0,
+    Command.CURRENT_CONTEXT_HANDLE: 5.0,
+    Command.CONTEXT_HANDLES: 5.0,
+    Command.GET_WINDOW_SIZE: 30.0,
+    Command.W3C_GET_WINDOW_SIZE: 30.0,
+    Command.GET_WINDOW_POSITION: 30.0,
+    Command.GET_SCREEN_ORIENTATION: 30.0,
+    Command.GET_NETWORK_CONNECTION: 30.0,
+    Command.GET_AVAILABLE_LOG_TYPES: 300.0
+}
+
+
+def copy_value(value):
+    """Copy the dicts and lists of a response value, at any depth. Other
+    values, WebElement included, are shared.
+
+    Args:
+        value: The unwrapped value field in the json response.
+
+    Returns:
+        A copy safe to mutate.
+    """
+    if isinstance(value, dict):
+        return dict((k, copy_value(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return [copy_value(v) for v in value]
+    return value
+
+
+class ResponseCache(object):
+    """Serve repeated read-only session commands until a mutating command
+    runs or their TTL expires, see WebDriver.use_response_cache.
+
+    Values are copied in and out, see copy_value, so that callers may
+    mutate what they get.
+
+    Attributes:
+        ttls(dict): Command to the seconds its responses are cached, only
+            commands listed here are cached.
+        hits(int): Commands served from the cache.
+        misses(int): Cacheable commands sent to the server.
+    """
+
+    def __init__(self, ttls=None):
+        """Initialize the ResponseCache
+
+        Args:
+            ttls(dict): Command to seconds, merged over DEFAULT_TTLS. A
+                None TTL opts the command out of the cache.
+        """
+        self.ttls = {}
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        for command, ttl in DEFAULT_TTLS.items():
+            self.set_ttl(command, ttl)
+        for command, ttl in (ttls or {}).items():
+            self.set_ttl(command, ttl)
+
+    def set_ttl(self, command, ttl):
+        """Cache a read-only command for ttl seconds.
+
+        Args:
+            command(Command): The defined command.
+            ttl(float): Seconds, None to stop caching the command.
+
+        Raises:
+            ValueError: The command is mutating.
+        """
+        if ttl is None:
+            self.ttls.pop(command, None)
+            self.invalidate()
+            return
+        if is_mutating(command):
+            raise ValueError(
+                '{0} is mutating and cannot be cached'.format(
+                    command_name(command)))
+        self.ttls[command] = ttl
+
+    def disable(self, command):
+        """Stop caching a command, see set_ttl."""
+        self.set_ttl(command, None)
+
+    def key(self, command, session_id, data):
+        """Return the cache key of a command, None if it is not cached.
+
+        Args:
+            command(Command): The defined command.
+            session_id(str): The session the command runs in.
+            data(dict): The uri variable and body.
+
+        Returns:
+            A hashable key or None.
+        """
+        if command not in self.ttls:
+            return None
+        try:
+            return (command, session_id, frozenset(data.items()))
+        except TypeError:
+            return None
+
+    def get(self, key):
+        """Look a response up.
+
+        Args:
+            key(tuple): See key.
+
+        Returns:
+            A (hit, value) tuple.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > monotonic():
+            self.hits += 1
+            return True, copy_value(entry[1])
+        self.misses += 1
+        return False, None
+
+    def put(self, key, value):
+        """Cache the unwrapped value of a response.
+
+        Args:
+            key(tuple): See key.
+            value: The unwrapped value field in the json response.
+        """
+        self._entries[key] = (
+            monotonic() + self.ttls[key[0]], copy_value(value))
+
+    def invalidate(self):
+        """Forget every response."""
+        if self._entries:
+            self._entries.clear()
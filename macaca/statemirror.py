@@ -0,0 +1,138 @@
+#
+# Client-side mirror of the session state, to skip redundant switches
+#
+
+from .command import Command
+from .webdriverexception import WebDriverError
+
+# frame value while the top-level browsing context is selected.
+TOP_FRAME = 'top'
+
+_TIMEOUT_COMMANDS = {
+    Command.IMPLICIT_WAIT: lambda data: 'implicit',
+    Command.SET_SCRIPT_TIMEOUT: lambda data: 'script',
+    Command.SET_TIMEOUTS: lambda data: data.get('type')
+}
+_NAVIGATION_COMMANDS = frozenset([
+    Command.GET, Command.GO_BACK, Command.GO_FORWARD, Command.REFRESH])
+_STATE_COMMANDS = frozenset([
+    Command.SWITCH_TO_CONTEXT, Command.SWITCH_TO_FRAME,
+    Command.SWITCH_TO_PARENT_FRAME, Command.SWITCH_TO_WINDOW, Command.CLOSE,
+    Command.CURRENT_CONTEXT_HANDLE, Command.GET_CURRENT_WINDOW_HANDLE
+]) | frozenset(_TIMEOUT_COMMANDS) | _NAVIGATION_COMMANDS
+# Errors meaning the mirror no longer matches the server.
+_DESYNC_ERRORS = frozenset([
+    WebDriverError.NO_SUCH_FRAME, WebDriverError.NO_SUCH_WINDOW,
+    WebDriverError.INVALID_SESSION_ID])
+
+
+class StateMirror(object):
+    """Mirror of the context, frame, window and timeouts of a session, see
+    WebDriver.use_state_mirror.
+
+    A None value means unknown: the next command setting it is always sent.
+    Values are learnt from the commands sent through the driver and from
+    the context and window handle reads.
+
+    Attributes:
+        context(str): The current context, e.g. 'WEBVIEW_1'.
+        frame(str): TOP_FRAME when the top-level browsing context is
+            selected, None inside a frame or when unknown.
+        window(str): The current window handle or name.
+        timeouts(dict): Timeout type ('implicit', 'script', 'page load')
+            to milliseconds.
+        skipped(int): Commands skipped because they would not change the
+            state.
+    """
+
+    def __init__(self):
+        self.context = None
+        self.frame = None
+        self.window = None
+        self.timeouts = {}
+        self.skipped = 0
+
+    def reset(self):
+        """Forget the mirrored state, e.g. after attaching to a session."""
+        self.context = None
+        self.frame = None
+        self.window = None
+        self.timeouts = {}
+
+    def is_noop(self, command, data):
+        """Whether sending command would leave the session state unchanged.
+
+        Args:
+            command(Command): The defined command.
+            data(dict): The uri variable and body.
+
+        Returns:
+            True if the command can be skipped, it is then counted.
+        """
+        if command not in _STATE_COMMANDS:
+            return False
+        if command == Command.SWITCH_TO_CONTEXT:
+            noop = self.context is not None and \
+                data.get('name') == self.context
+        elif command == Command.SWITCH_TO_FRAME:
+            noop = data.get('id') is None and self.frame == TOP_FRAME
+        elif command == Command.SWITCH_TO_PARENT_FRAME:
+            noop = self.frame == TOP_FRAME
+        elif command == Command.SWITCH_TO_WINDOW:
+            # switching window also leaves any frame
+            noop = self.window is not None and \
+                data.get('name') == self.window and self.frame == TOP_FRAME
+        elif command in _TIMEOUT_COMMANDS:
+            kind = _TIMEOUT_COMMANDS[command](data)
+            noop = kind in self.timeouts and \
+                self.timeouts[kind] == data.get('ms')
+        else:
+            noop = False
+        if noop:
+            self.skipped += 1
+        return noop
+
+    def update(self, command, data, value):
+        """Learn the state from a successful command.
+
+        Args:
+            command(Command): The defined command.
+            data(dict): The uri variable and body.
+            value: The unwrapped value field in the json response.
+        """
+        if command not in _STATE_COMMANDS:
+            return
+        if command == Command.SWITCH_TO_CONTEXT:
+            self.context = data.get('name')
+            self.frame = None
+        elif command == Command.CURRENT_CONTEXT_HANDLE:
+            if value != self.context:
+                self.context = value
+                self.frame = None
+        elif command == Command.SWITCH_TO_FRAME:
+            self.frame = TOP_FRAME if data.get('id') is None else None
+        elif command == Command.SWITCH_TO_PARENT_FRAME:
+            self.frame = None
+        elif command == Command.SWITCH_TO_WINDOW:
+            self.window = data.get('name')
+            self.frame = TOP_FRAME
+        elif command == Command.GET_CURRENT_WINDOW_HANDLE:
+            self.window = value
+        elif command == Command.CLOSE:
+            self.window = None
+            self.frame = None
+        elif command in _TIMEOUT_COMMANDS:
+            self.timeouts[_TIMEOUT_COMMANDS[command](data)] = data.get('ms')
+        elif command in _NAVIGATION_COMMANDS:
+            self.frame = TOP_FRAME
+
+    def failed(self, command, error):
+        """Resync after a failed command.
+
+        Args:
+            command(Command): The defined command.
+            error(WebDriverException): The failure.
+        """
+        if command in _STATE_COMMANDS or \
+                getattr(error, 'error', None) in _DESYNC_ERRORS:
+            self.reset()
@@ -0,0 +1,112 @@
+#
+# Command tracing exported in the Chrome trace-event format
+#
+# Usage:
+#     tracer = Tracer(propagate=True)
+#     driver.listeners.append(tracer)    # or listener.add_listener(tracer)
+#     ...
+#     tracer.save('trace.json')          # open in chrome://tracing, Perfetto
+#
+
+import json
+import os
+import random
+import threading
+
+from .command import command_name
+from .listener import CommandListener
+from .util import monotonic
+
+
+def _random_hex(bits):
+    return '{0:0{1}x}'.format(random.getrandbits(bits), bits // 4)
+
+
+class Tracer(CommandListener):
+    """Record a span for every command, wait, wait poll and wait sleep.
+
+    Attributes:
+        trace_id(str): W3C trace id shared by every span of this tracer.
+        propagate(bool): Send a W3C `traceparent` header with each
+            command so that hub side traces line up with the client.
+        spans(list): Recorded spans as Chrome trace events.
+    """
+
+    def __init__(self, propagate=False):
+        self.trace_id = _random_hex(128)
+        self.propagate = propagate
+        self.spans = []
+        self._pid = os.getpid()
+        self._span_ids = {}
+
+    def _add_span(self, name, category, elapsed, args):
+        end = monotonic()
+        self.spans.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (end - elapsed) * 1e6,
+            'dur': elapsed * 1e6,
+            'pid': self._pid,
+            'tid': threading.current_thread().ident,
+            'args': args
+        })
+
+    def before_execute(self, driver, command, data):
+        if not self.propagate:
+            return
+        span_id = _random_hex(64)
+        self._span_ids[id(driver)] = span_id
+        driver.remote_invoker.headers['traceparent'] = '00-{0}-{1}-01'.format(
+            self.trace_id, span_id)
+
+    def after_execute(self, driver, command, data, result, error, elapsed):
+        args = {'session_id': data.get('session_id')}
+        if 'element_id' in data:
+            args['element_id'] = data['element_id']
+        if error is not None:
+            args['error'] = str(getattr(error, 'error', None) or
+                                type(error).__name__)
+        if self.propagate:
+            args['span_id'] = self._span_ids.pop(id(driver), None)
+            driver.remote_invoker.headers.pop('traceparent', None)
+        self._add_span(command_name(command), 'command', elapsed, args)
+
+    def after_wait_poll(self, driver, wait, elapsed, error):
+        self._add_span('poll', 'wait', elapsed, {
+            'wait': repr(wait),
+            'poll': wait.polls,
+            'satisfied': error is None
+        })
+
+    def after_wait_sleep(self, driver, wait, elapsed):
+        self._add_span('sleep', 'sleep', elapsed, {'wait': repr(wait)})
+
+    def after_wait(self, driver, wait, result, error, elapsed):
+        self._add_span(repr(wait), 'wait', elapsed, {
+            'session_id': driver.session_id,
+            'polls': wait.polls,
+            'satisfied': error is None
+        })
+
+    def clear(self):
+        """Drop the recorded spans."""
+        self.spans = []
+
+    def export(self):
+        """Return the trace as a Chrome trace-event JSON object."""
+        return {
+            'traceEvents': sorted(
+                self.spans, key=lambda span: (span['ts'], -span['dur'])),
+            'displayTimeUnit': 'ms',
+            'otherData': {'trace_id': self.trace_id}
+        }
+
+    def save(self, filename):
+        """Write the trace to a JSON file loadable by trace viewers.
+
+        Args:
+            filename(str): The path to save the trace.
+        """
+        with open(filename, 'w') as f:
+            json.dump(self.export(), f)
@@ -2,17 +2,26 @@
 # Util for WebDriver
 #
 
+import math
+import os
 import sys
 from string import Formatter
 from functools import wraps
 from numbers import Integral
 
+try:
+    from time import perf_counter as monotonic
+except ImportError:
+    from time import time as monotonic
+
 from .locator import Locator
 from .keys import Keys
 
 
 PY3 = sys.version_info[0] == 3
 
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
 
 class MemorizeFormatter(Formatter):
     """Customize the Formatter to record used and unused kwargs."""
@@ -109,7 +118,9 @@ def add_element_extension_method(Klass):
             "See more in \'wait_for_element\' method."
         )
 
-        def find_elements(self, value):
+        def find_elements(self, value, lazy=False):
+            if lazy:
+                return self.elements(using.value, value, lazy=True)
             return self.elements(using.value, value)
 
         find_elements.__name__ = find_elements_name
@@ -149,6 +160,43 @@ def fluent(func):
     return fluent_interface
 
 
+def caller_location():
+    """Return "file:line" of the innermost frame outside the package.
+
+    Returns:
+        The location relative to the working directory, '<unknown>' if
+        every frame belongs to the package.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if not filename.startswith(_PACKAGE_DIR):
+            return '{0}:{1}'.format(os.path.relpath(filename), frame.f_lineno)
+        frame = frame.f_back
+    return '<unknown>'
+
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of a list of numbers
+    >>> percentile([1, 2, 3, 4], 50)
+    2
+    >>> percentile([1, 2, 3, 4], 100)
+    4
+
+    Args:
+        values(list): The samples, need not be sorted.
+        percent(float): The percentile in the range [0, 100].
+
+    Returns:
+        The sample at the given percentile, None if values is empty.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = int(math.ceil(percent / 100.0 * len(ordered)))
+    return ordered[max(rank, 1) - 1]
+
+
 def value_to_key_strokes(value):
     """Convert value to a list of key strokes
     >>> value_to_key_strokes(123)
@@ -0,0 +1,342 @@
+#
+# Polling engine shared by the wait_for* methods
+#
+
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from .listener import get_listeners
+from .util import monotonic, percentile
+from .webdriverexception import WebDriverException
+
+SATISFIED = 'satisfied'
+TIMEOUT = 'timeout'
+ERROR = 'error'
+
+
+class FixedInterval(object):
+    """Sleep the wait interval between polls, like the former
+    retrying based waits."""
+
+    __slots__ = ()
+
+    def delay(self, polls, interval):
+        """Return the milliseconds to sleep before the next poll.
+
+        Args:
+            polls(int): Number of polls done so far.
+            interval(int): The interval of the wait (ms).
+        """
+        return interval
+
+    def __repr__(self):
+        return 'FixedInterval()'
+
+
+class Backoff(object):
+    """Poll again quickly, then back off exponentially up to the wait
+    interval, so fast UIs are seen early and slow ones are not polled at
+    full rate for the whole timeout.
+
+    Attributes:
+        first(int): Delay before the second poll (ms).
+        factor(float): Growth of the delay after each poll.
+        jitter(float): Fraction of each delay randomly taken off, so
+            parallel waits do not poll in lockstep.
+    """
+
+    __slots__ = ('first', 'factor', 'jitter')
+
+    def __init__(self, first=50, factor=2.0, jitter=0.1):
+        self.first = first
+        self.factor = factor
+        self.jitter = jitter
+
+    def delay(self, polls, interval):
+        """Return the milliseconds to sleep before the next poll.
+
+        Args:
+            polls(int): Number of polls done so far.
+            interval(int): The interval of the wait (ms), the cap.
+        """
+        delay = min(self.first * self.factor ** (polls - 1), interval)
+        if self.jitter:
+            delay *= 1 - self.jitter * random.random()
+        return delay
+
+    def __repr__(self):
+        return 'Backoff(first={0}, factor={1}, jitter={2})'.format(
+            self.first, self.factor, self.jitter)
+
+
+BACKOFF = Backoff()
+
+
+class Wait(object):
+    """Description of one wait_for* call, passed to listeners.
+
+    Attributes:
+        name(str): The waiting method, e.g. 'wait_for_element'.
+        using(str): The element location strategy, None for wait_for.
+        value(str): The value of the location strategy.
+        timeout(int): How long to poll before giving up (ms).
+        interval(int): The longest sleep between polls (ms).
+        polls(int): Number of polls done so far.
+        asserter_failures(int): Number of polls rejected by the asserter.
+    """
+
+    __slots__ = ('name', 'using', 'value', 'timeout', 'interval', 'polls',
+                 'asserter_failures')
+
+    def __init__(self, name, using=None, value=None, timeout=10000,
+                 interval=1000):
+        self.name = name
+        self.using = using
+        self.value = value
+        self.timeout = timeout
+        self.interval = interval
+        self.polls = 0
+        self.asserter_failures = 0
+
+    def __repr__(self):
+        if self.using is None:
+            return self.name
+        return '{0}({1}={2})'.format(self.name, self.using, self.value)
+
+
+class WaitStatsEntry(object):
+    """Aggregated statistics of the waits on one locator.
+
+    Attributes:
+        waits(int): Number of waits.
+        outcomes(dict): SATISFIED, TIMEOUT or ERROR to their count.
+        polls(int): Polls done by every wait.
+        max_polls(int): Most polls done by a single wait.
+        asserter_failures(int): Polls rejected by the asserter.
+        satisfy_times(list): Seconds each satisfied wait took, the last
+            WaitStats.max_samples of them.
+        timeout(int): Timeout of the last wait (ms).
+        interval(int): Interval of the last wait (ms).
+    """
+
+    __slots__ = ('waits', 'outcomes', 'polls', 'max_polls',
+                 'asserter_failures', 'satisfy_times', 'timeout', 'interval')
+
+    def __init__(self):
+        self.waits = 0
+        self.outcomes = {}
+        self.polls = 0
+        self.max_polls = 0
+        self.asserter_failures = 0
+        self.satisfy_times = []
+        self.timeout = None
+        self.interval = None
+
+    def to_dict(self):
+        """Return the statistics as a plain dict with p50/p95/max."""
+        times = self.satisfy_times
+        return {
+            'waits': self.waits,
+            'outcomes': dict(self.outcomes),
+            'polls': self.polls,
+            'max_polls': self.max_polls,
+            'mean_polls': float(self.polls) / self.waits if self.waits else 0,
+            'asserter_failures': self.asserter_failures,
+            'satisfy_p50': percentile(times, 50),
+            'satisfy_p95': percentile(times, 95),
+            'satisfy_max': max(times) if times else None,
+            'timeout': self.timeout,
+            'interval': self.interval
+        }
+
+
+class WaitStats(object):
+    """Registry of wait statistics keyed by (name, using, value).
+
+    Every WebDriver records into the module level WAIT_STATS by default,
+    assign `driver.wait_stats = None` to disable recording. Locators built
+    at runtime would grow it without bound, so only the max_entries most
+    recently waited ones are kept.
+
+    Attributes:
+        max_samples(int): Time-to-satisfy samples kept per locator.
+        max_entries(int): Locators kept, least recently waited dropped.
+        evictions(int): Number of locators dropped.
+    """
+
+    def __init__(self, max_samples=1000, max_entries=1024):
+        self.max_samples = max_samples
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, wait, outcome, elapsed):
+        """Record a finished wait.
+
+        Args:
+            wait(Wait): The wait description.
+            outcome(str): SATISFIED, TIMEOUT or ERROR.
+            elapsed(float): Seconds the wait took.
+        """
+        key = (wait.name, wait.using, wait.value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = WaitStatsEntry()
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            else:
+                # pop and reinsert, move_to_end is Python 3 only
+                self._entries[key] = self._entries.pop(key)
+            entry.waits += 1
+            entry.outcomes[outcome] = entry.outcomes.get(outcome, 0) + 1
+            entry.polls += wait.polls
+            entry.max_polls = max(entry.max_polls, wait.polls)
+            entry.asserter_failures += wait.asserter_failures
+            entry.timeout = wait.timeout
+            entry.interval = wait.interval
+            if outcome == SATISFIED:
+                entry.satisfy_times.append(elapsed)
+                if len(entry.satisfy_times) > self.max_samples:
+                    del entry.satisfy_times[0]
+
+    def get(self, using=None, value=None, name=None):
+        """Query the statistics of the matching waits.
+
+        Args:
+            using(str): Only match this location strategy.
+            value(str): Only match this locator value.
+            name(str): Only match this waiting method.
+
+        Returns:
+            A dict of (name, using, value) to the statistics dict.
+        """
+        with self._lock:
+            items = list(self._entries.items())
+        return dict(
+            (key, entry.to_dict()) for key, entry in items
+            if (name is None or key[0] == name) and
+            (using is None or key[1] == using) and
+            (value is None or key[2] == value))
+
+    def snapshot(self):
+        """Return the statistics of every wait, see get."""
+        return self.get()
+
+    def reset(self):
+        """Drop every recorded wait."""
+        with self._lock:
+            self._entries = OrderedDict()
+
+    def report(self):
+        """Format the statistics, slowest locators first, in milliseconds.
+
+        Returns:
+            A multi-line string.
+        """
+        rows = sorted(self.snapshot().items(),
+                      key=lambda item: -(item[1]['satisfy_p95'] or 0))
+        lines = ['{0:<48}{1:>6}{2:>9}{3:>8}{4:>10}{5:>10}{6:>10}'.format(
+            'wait', 'waits', 'timeouts', 'polls', 'asserts', 'p50', 'p95')]
+        for (name, using, value), stats in rows:
+            label = name if using is None else '{0}({1}={2})'.format(
+                name, using, value)
+            lines.append(
+                '{0:<48}{1:>6}{2:>9}{3:>8.1f}{4:>10}{5:>10.0f}{6:>10.0f}'
+                .format(label[:47], stats['waits'],
+                        stats['outcomes'].get(TIMEOUT, 0),
+                        stats['mean_polls'], stats['asserter_failures'],
+                        (stats['satisfy_p50'] or 0) * 1000,
+                        (stats['satisfy_p95'] or 0) * 1000))
+        return '\n'.join(lines)
+
+
+WAIT_STATS = WaitStats()
+
+
+def wait_until(driver, wait, locate, asserter):
+    """Poll until the located target satisfies the asserter.
+
+    The timeout is measured on the monotonic clock from the start and
+    includes the time spent in requests; the last sleep is shortened so
+    the final poll happens at the deadline. Sleeps between polls follow
+    driver.wait_strategy, BACKOFF when it is None.
+
+    Args:
+        driver(WebDriver): The driver whose listeners observe the wait.
+        wait(Wait): The wait description.
+        locate(callable): Function without argument returning the target,
+            raising WebDriverException if it cannot be found yet.
+        asserter(callable): Function raising WebDriverException when the
+            target does not satisfy the condition yet.
+
+    Returns:
+        The target located by the first successful poll.
+
+    Raises:
+        WebDriverException: The last failure once the timeout elapsed,
+            carrying the dump of the driver's flight recorder.
+    """
+    listeners = get_listeners(driver)
+    strategy = driver.wait_strategy or BACKOFF
+    stats = driver.wait_stats
+    start = monotonic()
+    for listener in listeners:
+        listener.before_wait(driver, wait)
+    deadline = start + wait.timeout / 1000.0
+    poll_end = None
+    try:
+        while True:
+            poll_start = monotonic()
+            if listeners and poll_end is not None:
+                for listener in listeners:
+                    listener.after_wait_sleep(
+                        driver, wait, poll_start - poll_end)
+            wait.polls += 1
+            if wait.polls > 1:
+                # the page changes on its own while waiting
+                driver._outdate_reads()
+            try:
+                ret = locate()
+                try:
+                    asserter(ret)
+                except WebDriverException:
+                    wait.asserter_failures += 1
+                    raise
+            except Exception as err:
+                poll_end = monotonic()
+                for listener in listeners:
+                    listener.after_wait_poll(
+                        driver, wait, poll_end - poll_start, err)
+                remaining = deadline - poll_end
+                if not isinstance(err, WebDriverException) or remaining <= 0:
+                    raise
+                time.sleep(min(
+                    strategy.delay(wait.polls, wait.interval) / 1000.0,
+                    remaining))
+                continue
+            for listener in listeners:
+                listener.after_wait_poll(
+                    driver, wait, monotonic() - poll_start, None)
+            break
+    except Exception as err:
+        timed_out = isinstance(err, WebDriverException)
+        recorder = driver.flight_recorder
+        if recorder is not None and timed_out:
+            err.flight_record = recorder.dump()
+        elapsed = monotonic() - start
+        for listener in listeners:
+            listener.after_wait(driver, wait, None, err, elapsed)
+        if stats is not None:
+            stats.record(wait, TIMEOUT if timed_out else ERROR, elapsed)
+        raise
+    elapsed = monotonic() - start
+    for listener in listeners:
+        listener.after_wait(driver, wait, ret, None, elapsed)
+    if stats is not None:
+        stats.record(wait, SATISFIED, elapsed)
+    return ret
@@ -3,21 +3,44 @@
 # WebDriver Protocol Implemenation
 #
 
+import sys
+import weakref
 from base64 import b64decode
-
-from retrying import retry
+from contextlib import contextmanager
 
 from .asserters import is_displayed
-from .command import Command
+from .command import Command, command_name, is_mutating
+from .elementmethods import ElementMethodsMixin
+from .flightrecorder import FlightRecorder
+from .hubcache import HUB_CACHE
+from .lazyelements import LazyElements, element_ids
+from .listener import get_listeners
 from .locator import Locator
+from .pinnedscript import PinnedScript, ScriptPinner
+from .lookupcache import LookupCache
+from .profiler import StageProfiler
 from .remote_invoker import RemoteInvoker
-from .util import add_element_extension_method, value_to_key_strokes, value_to_single_key_strokes, fluent
+from .responsecache import ResponseCache
+from .statemirror import StateMirror
+from .util import (value_to_key_strokes, value_to_single_key_strokes,
+                   fluent, monotonic)
+from .waiting import WAIT_STATS, Wait, wait_until
 from .webdriverresult import WebDriverResult
-from .webdriverexception import WebDriverException
-from .webelement import WebElement
+from .webdriverexception import WebDriverException, find_exception_by_code
+from .webelement import (
+    ELEMENT_KEY,
+    W3C_ELEMENT_KEY,
+    WebElement,
+    remember_locator
+)
+
+# JSON scalars never hold elements and are passed through untouched.
+_SCALAR_TYPES = frozenset(
+    [type(None), bool, int, float, str, bytes] +
+    ([unicode, long] if sys.version_info[0] == 2 else []))  # noqa: F821
 
 
-class WebDriver(object):
+class WebDriver(ElementMethodsMixin):
     """The WebDriver Object to implement most part of WebDriver protocol.
 
     Attributes:
@@ -28,6 +51,38 @@ class WebDriver(object):
             local end.
         remote_invoker(RemoteInvoker): The remote invoker responsible for send
             request.
+        listeners(list): CommandListener objects observing this driver.
+        profiler(StageProfiler): Active profiler, see profile.
+        flight_recorder(FlightRecorder): Ring buffer of the last commands,
+            None to disable it.
+        wait_stats(WaitStats): Registry recording every wait_for* call,
+            None to disable it. Defaults to waiting.WAIT_STATS.
+        wait_strategy(object): Sleeps between the polls of the wait_for*
+            methods, e.g. waiting.FixedInterval(). None (the default) for
+            waiting.BACKOFF.
+        identity_map(WeakValueDictionary): Element id to WebElement map, so
+            that finding an element already held returns the same object.
+            None (the default) to always create new objects, see
+            use_identity_map.
+        stale_recovery(bool): Remember how elements were found and, on a
+            stale element reference, locate them again once and retry the
+            command. Defaults to False.
+        stale_recoveries(dict): Number of recoveries per (using, value).
+        lookup_cache(LookupCache): Cache of element() lookups, None (the
+            default) to disable it, see use_lookup_cache.
+        property_cache(bool): Cache element reads (text, tag_name, rect,
+            size, is_displayed...) on each element. Defaults to False.
+        epoch(int): Bumped by every mutating command, element reads cached
+            in an older epoch are fetched again.
+        response_cache(ResponseCache): Cache of read-only session commands,
+            None (the default) to disable it, see use_response_cache.
+        state_mirror(StateMirror): Client-side mirror of the context, frame,
+            window and timeouts, None (the default) to disable it, see
+            use_state_mirror.
+        hub_cache(HubCache): Shared cache of the status and sessions
+            endpoints, None (the default) to disable it, see use_hub_cache.
+        script_pinner(ScriptPinner): Scripts installed in the page and bytes
+            saved, see execute_pinned_script.
     """
 
     def __init__(self, desired_capabilities, url='http://127.0.0.1:3456/wd/hub'):
@@ -42,37 +97,177 @@ class WebDriver(object):
         self.capabilities = None
         self.desired_capabilities = desired_capabilities
         self.remote_invoker = RemoteInvoker(url)
+        self.listeners = []
+        self.profiler = None
+        self.flight_recorder = FlightRecorder()
+        self.wait_stats = WAIT_STATS
+        self.wait_strategy = None
+        self.identity_map = None
+        self.stale_recovery = False
+        self.stale_recoveries = {}
+        self.lookup_cache = None
+        self.property_cache = False
+        self.epoch = 0
+        self.response_cache = None
+        self.state_mirror = None
+        self.hub_cache = None
+        self.script_pinner = ScriptPinner()
 
     def __repr__(self):
         return '<{0.__name__} (session="{1}")>'.format(
             type(self), self.session_id)
 
-    def _execute(self, command, data=None, unpack=True):
+    def _execute(self, command, data=None, unpack=True, unwrap=None):
         """ Private method to execute command.
 
         Args:
             command(Command): The defined command.
             data(dict): The uri variable and body.
             uppack(bool): If unpack value from result.
+            unwrap(callable): Convert the value field, default to
+                _unwrap_el.
 
         Returns:
             The unwrapped value field in the json response.
         """
         if not data:
             data = {}
+        mirror = self.state_mirror
+        if mirror is not None and mirror.is_noop(command, data):
+            if not unpack:
+                return WebDriverResult(self.session_id, 0, None)
+            return None
+
+        cache = self.response_cache
+        key = None
+        if cache is not None and unwrap is None:
+            key = cache.key(command, self.session_id, data)
+            if key is not None:
+                hit, value = cache.get(key)
+                if hit:
+                    if not unpack:
+                        return WebDriverResult(self.session_id, 0, value)
+                    return value
+
+        if mirror is None:
+            ret = self._execute_observed(command, data, unpack, unwrap)
+        else:
+            try:
+                ret = self._execute_observed(command, data, unpack, unwrap)
+            except WebDriverException as err:
+                mirror.failed(command, err)
+                raise
+            mirror.update(command, data, ret if unpack else ret.value)
+        if key is not None:
+            value = ret if unpack else ret.value
+            cache.put(key, value)
+        return ret
+
+    def _execute_observed(self, command, data, unpack, unwrap):
+        """Send the command, notifying listeners and the flight recorder."""
+        listeners = get_listeners(self)
+        recorder = self.flight_recorder
+        if not listeners and recorder is None:
+            return self._execute_command(command, data, unpack, unwrap)
+
+        for listener in listeners:
+            listener.before_execute(self, command, data)
+        start = monotonic()
+        try:
+            ret = self._execute_command(command, data, unpack, unwrap)
+        except Exception as err:
+            elapsed = monotonic() - start
+            for listener in listeners:
+                listener.after_execute(
+                    self, command, data, None, err, elapsed)
+            if recorder is not None:
+                recorder.record(command, data, elapsed, err)
+            raise
+        elapsed = monotonic() - start
+        for listener in listeners:
+            listener.after_execute(self, command, data, ret, None, elapsed)
+        if recorder is not None:
+            recorder.record(command, data, elapsed)
+        return ret
+
+    def _execute_command(self, command, data, unpack, unwrap=None):
+        """Send the command and decode the result, see _execute."""
+        profiler = self.profiler
+        if profiler is not None:
+            start = monotonic()
         if self.session_id is not None:
             data.setdefault('session_id', self.session_id)
+        if is_mutating(command):
+            self._outdate_reads()
         data = self._wrap_el(data)
+        if profiler is not None:
+            profiler.add(command_name(command), 'prepare', monotonic() - start)
         res = self.remote_invoker.execute(command, data)
+        if profiler is not None:
+            start = monotonic()
         ret = WebDriverResult.from_object(res)
-        ret.raise_for_status()
-        ret.value = self._unwrap_el(ret.value)
+        try:
+            if ret.status:
+                self._record_error(command, ret)
+            ret.raise_for_status()
+            ret.value = (unwrap or self._unwrap_el)(ret.value)
+        finally:
+            if profiler is not None:
+                profiler.add(command_name(command), 'wrap', monotonic() - start)
         if not unpack:
             return ret
         return ret.value
 
+    @contextmanager
+    def profile(self, stream=None):
+        """Time where each command spends its time, per stage.
+
+        Stages are prepare (session and element wrapping, url formatting),
+        serialize (JSON encoding and HTTP request preparation), network
+        (hub, device and transport), deserialize (JSON decoding) and wrap
+        (result checking and WebElement construction).
+
+        Support:
+            Android iOS Web(WebView)
+
+        Args:
+            stream(file): Where the summary is printed on exit,
+                default to sys.stdout, False to not print it.
+
+        Returns:
+            A context manager yielding the StageProfiler.
+
+        Usage:
+            with driver.profile() as profiler:
+                driver.element_by_id('login').click()
+        """
+        profiler = StageProfiler()
+        self.profiler = profiler
+        self.remote_invoker.profiler = profiler
+        try:
+            yield profiler
+        finally:
+            self.profiler = None
+            self.remote_invoker.profiler = None
+            if stream is not False:
+                (stream or sys.stdout).write(profiler.summary() + '\n')
+
+    def _record_error(self, command, result):
+        """Count a failed result in the remote invoker metrics."""
+        metrics = self.remote_invoker.metrics
+        if metrics is None:
+            return
+        error = find_exception_by_code(result.status)
+        metrics.record_error(
+            self.remote_invoker.hub, command_name(command),
+            error.name if error is not None else str(result.status))
+
     def _unwrap_el(self, value):
-        """Convert {'Element': 1234} to WebElement Object
+        """Convert {'ELEMENT': 1234} to WebElement Object
+
+        Both the legacy ELEMENT key and the W3C element key are recognised.
+        Containers holding no element are returned as is, others are
+        copied along the path to the elements only.
 
         Args:
             value(str|list|dict): The value field in the json response.
@@ -80,16 +275,197 @@ class WebDriver(object):
         Returns:
             The unwrapped value.
         """
-        if isinstance(value, dict) and 'ELEMENT' in value:
-            element_id = value.get('ELEMENT')
-            return WebElement(element_id, self)
-        elif isinstance(value, list) and not isinstance(value, str):
-            return [self._unwrap_el(item) for item in value]
-        else:
+        cls = type(value)
+        if cls in _SCALAR_TYPES:
             return value
+        if cls is dict or isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return self._make_element(value[ELEMENT_KEY])
+            if W3C_ELEMENT_KEY in value:
+                return self._make_element(value[W3C_ELEMENT_KEY])
+            copy = None
+            for key, item in value.items():
+                if type(item) in _SCALAR_TYPES:
+                    continue
+                unwrapped = self._unwrap_el(item)
+                if unwrapped is not item:
+                    if copy is None:
+                        copy = dict(value)
+                    copy[key] = unwrapped
+            return value if copy is None else copy
+        if cls is list or isinstance(value, list):
+            copy = None
+            for index, item in enumerate(value):
+                if type(item) in _SCALAR_TYPES:
+                    continue
+                unwrapped = self._unwrap_el(item)
+                if unwrapped is not item:
+                    if copy is None:
+                        copy = list(value)
+                    copy[index] = unwrapped
+            return value if copy is None else copy
+        return value
+
+    def _find_element(self, parent, command, using, value):
+        """Find a single element in parent, through the lookup cache.
+
+        Args:
+            parent(WebDriver|WebElement): The context to search in.
+            command(Command): FIND_ELEMENT or FIND_CHILD_ELEMENT.
+            using(str): The element location strategy.
+            value(str): The value of the location strategy.
+
+        Returns:
+            WebElement Object.
+        """
+        cache = self.lookup_cache
+        if cache is not None:
+            key = (getattr(parent, 'element_id', None), using, value)
+            element = cache.get(key)
+            if element is not None:
+                return element
+        element = remember_locator(parent._execute(command, {
+            'using': using,
+            'value': value
+        }), parent, using, value)
+        if cache is not None:
+            cache.put(key, element)
+        return element
+
+    @fluent
+    def use_lookup_cache(self, size=128):
+        """Serve repeated element() lookups from an LRU cache until the next
+        mutating command (click, keys, touch, navigation, context, frame or
+        window switch...).
+
+        Changes the page makes on its own, without a command from this
+        driver, are not seen by the cache, use it for stable pages.
+
+        Support:
+            Android iOS Web(WebView)
+
+        Args:
+            size(int): Maximum number of lookups kept, 0 or None to disable
+                the cache.
+
+        Returns:
+            WebDriver Object.
+        """
+        self.lookup_cache = LookupCache(size) if size else None
+
+    @fluent
+    def use_response_cache(self, ttls=None, enabled=True):
+        """Serve repeated read-only session commands (title, current_url,
+        window_handles, contexts, cookies, window size...) from a cache
+        until a mutating command runs or their TTL expires.
+
+        Support:
+            Android iOS Web(WebView)
+
+        Args:
+            ttls(dict): Command to seconds, merged over
+                responsecache.DEFAULT_TTLS, a None TTL opts a command out.
+            enabled(bool): Enable or disable the cache.
+
+        Returns:
+            WebDriver Object.
+
+        Usage:
+            driver.use_response_cache({
+                Command.GET_TITLE: None,
+                Command.GET_PAGE_SOURCE: 0.5
+            })
+        """
+        self.response_cache = ResponseCache(ttls) if enabled else None
+
+    @fluent
+    def use_state_mirror(self, enabled=True):
+        """Mirror the current context, frame, window and timeouts on the
+        client, and skip switches and timeout settings that would not
+        change them, e.g. `driver.context = 'WEBVIEW_1'` while already in
+        WEBVIEW_1 or switch_to_frame(None) at the top-level.
+
+        The mirror forgets what it knows when a state command fails, on
+        no such frame or window errors and when the session changes.
+
+        Support:
+            Android iOS Web(WebView)
+
+        Args:
+            enabled(bool): Enable or disable the mirror.
+
+        Returns:
+            WebDriver Object.
+        """
+        self.state_mirror = StateMirror() if enabled else None
+
+    @fluent
+    def use_hub_cache(self, cache=None, enabled=True):
+        """Serve status and sessions from a cache shared by every driver of
+        the process, returning the last known value at once while one
+        background thread per hub keeps it current.
+
+        Support:
+            Android iOS Web(WebView)
+
+        Args:
+            cache(HubCache): The cache to use, default to
+                hubcache.HUB_CACHE.
+            enabled(bool): Enable or disable the cache.
+
+        Returns:
+            WebDriver Object.
+        """
+        self.hub_cache = (cache or HUB_CACHE) if enabled else None
+
+    def _make_element(self, element_id):
+        """Return the WebElement of element_id, through the identity map
+        when enabled.
+
+        Args:
+            element_id(str): The UDID returned by remote servers.
+
+        Returns:
+            WebElement Object.
+        """
+        identity_map = self.identity_map
+        if identity_map is None:
+            return WebElement(element_id, self)
+        element_id = str(element_id)
+        element = identity_map.get(element_id)
+        if element is None:
+            element = WebElement(element_id, self)
+            identity_map[element_id] = element
+        return element
+
+    @fluent
+    def use_identity_map(self, enabled=True):
+        """Return the same WebElement object whenever the server returns an
+        element id already held, instead of creating a new one per find.
+
+        Elements are weakly referenced and the map is cleared whenever the
+        session changes.
+
+        Support:
+            Android iOS Web(WebView)
+
+        Args:
+            enabled(bool): Enable or disable the identity map.
+
+        Returns:
+            WebDriver Object.
+        """
+        self.identity_map = weakref.WeakValueDictionary() if enabled else None
+
+    def _lazy_elements(self, value):
+        """Convert a find elements response value to LazyElements."""
+        return LazyElements(self, element_ids(value))
 
     def _wrap_el(self, value):
-        """Convert WebElement Object to {'Element': 1234}
+        """Convert WebElement Object to {'ELEMENT': 1234}
+
+        Containers holding no WebElement are returned as is, others are
+        copied along the path to the elements only.
 
         Args:
             value(str|list|dict): The local value.
@@ -97,14 +473,34 @@ class WebDriver(object):
         Returns:
             The wrapped value.
         """
-        if isinstance(value, dict):
-            return {k: self._wrap_el(v) for k, v in value.items()}
-        elif isinstance(value, WebElement):
-            return {'ELEMENT': value.element_id}
-        elif isinstance(value, list) and not isinstance(value, str):
-            return [self._wrap_el(item) for item in value]
-        else:
+        cls = type(value)
+        if cls in _SCALAR_TYPES:
             return value
+        if isinstance(value, WebElement):
+            return {ELEMENT_KEY: value.element_id}
+        if cls is dict or isinstance(value, dict):
+            copy = None
+            for key, item in value.items():
+                if type(item) in _SCALAR_TYPES:
+                    continue
+                wrapped = self._wrap_el(item)
+                if wrapped is not item:
+                    if copy is None:
+                        copy = dict(value)
+                    copy[key] = wrapped
+            return value if copy is None else copy
+        if cls is list or cls is tuple or isinstance(value, (list, tuple)):
+            copy = None
+            for index, item in enumerate(value):
+                if type(item) in _SCALAR_TYPES:
+                    continue
+                wrapped = self._wrap_el(item)
+                if wrapped is not item:
+                    if copy is None:
+                        copy = list(value)
+                    copy[index] = wrapped
+            return value if copy is None else copy
+        return value
 
     @property
     def sessions(self):
@@ -116,8 +512,25 @@ class WebDriver(object):
         Returns:
             Return the URL of the current page.
         """
+        if self.hub_cache is not None:
+            return self.hub_cache.get(
+                self.remote_invoker, Command.GET_ALL_SESSIONS)
         return self._execute(Command.GET_ALL_SESSIONS)
 
+    @property
+    def status(self):
+        """Gets the status of the webdriver server.
+
+        Support:
+            Android iOS Web(WebView)
+
+        Returns:
+            The status object returned by the server.
+        """
+        if self.hub_cache is not None:
+            return self.hub_cache.get(self.remote_invoker, Command.STATUS)
+        return self._execute(Command.STATUS)
+
     @fluent
     def attach(self, session_id):
         """Attach to given Session.
@@ -132,6 +545,7 @@ class WebDriver(object):
             WebDriver Object.
         """
         self.session_id = session_id
+        self._reset_session_state()
 
     @fluent
     def init(self):
@@ -149,6 +563,25 @@ class WebDriver(object):
         resp.raise_for_status()
         self.session_id = str(resp.session_id)
         self.capabilities = resp.value
+        self._reset_session_state()
+
+    def _reset_session_state(self):
+        """Forget client side state bound to the previous session."""
+        self._outdate_reads()
+        if self.identity_map is not None:
+            self.identity_map.clear()
+        if self.state_mirror is not None:
+            self.state_mirror.reset()
+        self.script_pinner.installed.clear()
+
+    def _outdate_reads(self):
+        """Bump the epoch and clear the lookup cache, once the application
+        may have changed."""
+        self.epoch += 1
+        if self.lookup_cache is not None:
+            self.lookup_cache.invalidate()
+        if self.response_cache is not None:
+            self.response_cache.invalidate()
 
     @fluent
     def quit(self):
@@ -568,6 +1001,46 @@ class WebDriver(object):
             'script': script,
             'args': list(args)})
 
+    def pin_script(self, script):
+        """Prepare a script to be installed once per page and then called
+        through a small stub, see execute_pinned_script.
+
+        Support:
+            Web(WebView)
+
+        Args:
+            script(str): The JavaScript function body, as for
+                execute_script.
+
+        Returns:
+            PinnedScript Object, it can be shared between drivers.
+        """
+        return PinnedScript(script)
+
+    def execute_pinned_script(self, pinned, *args):
+        """Execute a pinned script synchronously in current context.
+
+        The first call in a page sends the whole script, which defines it
+        in the page and runs it. Later calls only send a stub calling it by
+        handle. After a navigation the stub finds it missing and the script
+        is installed again transparently. See script_pinner for counters.
+
+        Support:
+            Web(WebView)
+
+        Args:
+            pinned(PinnedScript|str): The script, see pin_script.
+            *args: Arguments for your JavaScript.
+
+        Returns:
+            Returns the return value of the function.
+        """
+        if not isinstance(pinned, PinnedScript):
+            pinned = PinnedScript(pinned)
+        return self.script_pinner.execute(
+            lambda script, args: self.execute_script(script, *args),
+            pinned, args)
+
     @fluent
     def execute_async_script(self, script, *args):
         """Execute JavaScript Asynchronously in current context.
@@ -802,10 +1275,7 @@ class WebDriver(object):
         Raises:
             WebDriverException.
         """
-        return self._execute(Command.FIND_ELEMENT, {
-            'using': using,
-            'value': value
-        })
+        return self._find_element(self, Command.FIND_ELEMENT, using, value)
 
     def element_if_exists(self, using, value):
         """Check if an element in the current context.
@@ -824,10 +1294,7 @@ class WebDriver(object):
             WebDriverException.
         """
         try:
-            self._execute(Command.FIND_ELEMENT, {
-                'using': using,
-                'value': value
-            })
+            self._find_element(self, Command.FIND_ELEMENT, using, value)
             return True
         except:
             return False
@@ -849,14 +1316,11 @@ class WebDriver(object):
             WebDriverException.
         """
         try:
-            return self._execute(Command.FIND_ELEMENT, {
-                'using': using,
-                'value': value
-            })
+            return self._find_element(self, Command.FIND_ELEMENT, using, value)
         except:
             return None
 
-    def elements(self, using, value):
+    def elements(self, using, value, lazy=False):
         """Find elements in the current context.
 
         Support:
@@ -865,6 +1329,8 @@ class WebDriver(object):
         Args:
             using(str): The element location strategy.
             value(str): The value of the location strategy.
+            lazy(bool): Return a LazyElements sequence holding the element
+                ids only, WebElement objects are created on access.
 
         Returns:
             Return a List<Element | None>, if no element matched, the list is empty.
@@ -872,10 +1338,11 @@ class WebDriver(object):
         Raises:
             WebDriverException.
         """
-        return self._execute(Command.FIND_ELEMENTS, {
+        els = self._execute(Command.FIND_ELEMENTS, {
             'using': using,
             'value': value
-        })
+        }, unwrap=self._lazy_elements if lazy else None)
+        return remember_locator(els, self, using, value)
 
     def wait_for(
         self, timeout=10000, interval=1000,
@@ -886,8 +1353,8 @@ class WebDriver(object):
             Android iOS Web(WebView)
 
         Args:
-            timeout(int): How long we should be retrying stuff.
-            interval(int): How long between retries.
+            timeout(int): How long to poll before giving up (ms).
+            interval(int): The longest sleep between polls (ms).
             asserter(callable): The asserter func to determine the result.
 
         Returns:
@@ -898,16 +1365,10 @@ class WebDriver(object):
         """
         if not callable(asserter):
             raise TypeError('Asserter must be callable.')
-        @retry(
-            retry_on_exception=lambda ex: isinstance(ex, WebDriverException),
-            stop_max_delay=timeout,
-            wait_fixed=interval
-        )
-        def _wait_for(driver):
-            asserter(driver)
-            return driver
 
-        return _wait_for(self)
+        return wait_until(
+            self, Wait('wait_for', timeout=timeout, interval=interval),
+            lambda: self, asserter)
 
     def wait_for_element(
         self, using, value, timeout=10000,
@@ -920,8 +1381,8 @@ class WebDriver(object):
         Args:
             using(str): The element location strategy.
             value(str): The value of the location strategy.
-            timeout(int): How long we should be retrying stuff.
-            interval(int): How long between retries.
+            timeout(int): How long to poll before giving up (ms).
+            interval(int): The longest sleep between polls (ms).
             asserter(callable): The asserter func to determine the result.
 
         Returns:
@@ -932,17 +1393,10 @@ class WebDriver(object):
         """
         if not callable(asserter):
             raise TypeError('Asserter must be callable.')
-        @retry(
-            retry_on_exception=lambda ex: isinstance(ex, WebDriverException),
-            stop_max_delay=timeout,
-            wait_fixed=interval
-        )
-        def _wait_for_element(ctx, using, value):
-            el = ctx.element(using, value)
-            asserter(el)
-            return el
-
-        return _wait_for_element(self, using, value)
+
+        return wait_until(self, Wait(
+            'wait_for_element', using, value, timeout, interval),
+            lambda: self.element(using, value), asserter)
 
     def wait_for_elements(
         self, using, value, timeout=10000,
@@ -955,8 +1409,8 @@ class WebDriver(object):
         Args:
             using(str): The element location strategy.
             value(str): The value of the location strategy.
-            timeout(int): How long we should be retrying stuff.
-            interval(int): How long between retries.
+            timeout(int): How long to poll before giving up (ms).
+            interval(int): The longest sleep between polls (ms).
             asserter(callable): The asserter func to determine the result.
 
         Returns:
@@ -967,21 +1421,16 @@ class WebDriver(object):
         """
         if not callable(asserter):
             raise TypeError('Asserter must be callable.')
-        @retry(
-            retry_on_exception=lambda ex: isinstance(ex, WebDriverException),
-            stop_max_delay=timeout,
-            wait_fixed=interval
-        )
-        def _wait_for_elements(ctx, using, value):
-            els = ctx.elements(using, value)
+
+        def locate():
+            els = self.elements(using, value)
             if not len(els):
                 raise WebDriverException('no such element')
-            else:
-                el = els[0]
-                asserter(el)
-                return els
+            return els
 
-        return _wait_for_elements(self, using, value)
+        return wait_until(self, Wait(
+            'wait_for_elements', using, value, timeout, interval),
+            locate, lambda els: asserter(els[0]))
 
     @fluent
     def touch(self, name, args=None):
@@ -1013,6 +1462,3 @@ class WebDriver(object):
         self._execute(Command.PERFORM_ACTIONS, {
             'actions': actions
         })
-
-
-add_element_extension_method(WebDriver)
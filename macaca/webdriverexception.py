@@ -3,6 +3,11 @@
 # WebDriver Exception
 #
 
+import atexit
+import os
+import tempfile
+import weakref
+from base64 import b64decode
 from collections import namedtuple
 from enum import Enum
 
@@ -36,49 +41,176 @@ class WebDriverError(Enum):
         31, 'ime engine activation failed')
     INVALID_SELECTOR = ErrorCode(32, 'invalid selector')
     MOVE_TARGET_OUT_OF_BOUNDS = ErrorCode(34, 'move target out of bounds')
+    INVALID_SESSION_ID = ErrorCode(6, 'invalid session id')
+    SESSION_NOT_CREATED = ErrorCode(33, 'session not created')
+    ELEMENT_NOT_INTERACTABLE = ErrorCode(60, 'element not interactable')
+    INVALID_ARGUMENT = ErrorCode(61, 'invalid argument')
+    NO_SUCH_COOKIE = ErrorCode(62, 'no such cookie')
+    UNABLE_TO_CAPTURE_SCREEN = ErrorCode(63, 'unable to capture screen')
+    ELEMENT_CLICK_INTERCEPTED = ErrorCode(64, 'element click intercepted')
+    UNSUPPORTED_OPERATION = ErrorCode(405, 'unsupported operation')
+
+
+def _build_error_table():
+    """Map both the numeric wire protocol codes and the W3C error strings
+    to their WebDriverError. 'invalid selector' resolves to
+    INVALID_SELECTOR rather than the legacy XPATH_LOOKUP_ERROR."""
+    table = {}
+    for error in WebDriverError:
+        table.setdefault(error.value.code, error)
+        table[error.value.error_code] = error
+    return table
+
+
+_ERRORS_BY_CODE = _build_error_table()
 
 
 def find_exception_by_code(code):
     """Find name of exception by WebDriver defined error code.
 
     Args:
-        code(str): Error code defined in protocol.
+        code(int|str): Error code defined in protocol, either the wire
+            protocol status or the W3C error string.
 
     Returns:
         The error name defined in protocol.
     """
-    errorName = None
-    for error in WebDriverError:
-        if error.value.code == code:
-            errorName = error
-            break
-    return errorName
+    try:
+        return _ERRORS_BY_CODE.get(code)
+    except TypeError:
+        return None
+
+
+def _remove_file(filename):
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+
+
+def _remove_on_collect(obj, filename):
+    """Remove filename once obj is garbage collected, or at exit on
+    Python 2 which lacks weakref.finalize."""
+    if hasattr(weakref, 'finalize'):
+        weakref.finalize(obj, _remove_file, filename)
+    else:
+        atexit.register(_remove_file, filename)
 
 
 class WebDriverException(Exception):
     """WebDriver exception.
 
+    Construction only stores its arguments, the message is formatted by
+    __str__ when the exception is actually shown; waits raise and catch
+    these in tight loops.
+
+    Failing tracebacks are kept alive by test runners and retry loops raise
+    hundreds of exceptions, so the server screenshot is kept according to
+    screen_policy: SCREEN_KEEP in memory, SCREEN_SPILL (the default) in a
+    temporary file when larger than screen_spill_threshold characters,
+    removed with the exception, or SCREEN_DROP. It is only base64 decoded
+    when asked for, see screen_bytes.
+
     Attributes:
         error(str): Error type defined in WebDriver Protocol.
         message(str): A description of the kind of error that occurred.
         screen(str):  If included, a screenshot of the current page as
             a base64 encoded string.
-        stacktrace(str): A stack trace report of the error occurred.
+        stacktrace(str|list): A stack trace report of the error occurred.
+        flight_record(str): If set, the last commands executed by the
+            driver, see FlightRecorder.dump.
     """
 
+    SCREEN_KEEP = 'keep'
+    SCREEN_SPILL = 'spill'
+    SCREEN_DROP = 'drop'
+
+    screen_policy = SCREEN_SPILL
+    screen_spill_threshold = 256 * 1024
+
     def __init__(self, error=None, message=None, screen=None, stacktrace=None):
         """Initialize the WebDriverException"""
         self.error = error
         self.message = message
-        self.screen = screen
         self.stacktrace = stacktrace
+        self.flight_record = None
+        self._screen = None
+        self._screen_file = None
+        self._screen_dropped = False
+        if screen is not None:
+            self.screen = screen
+
+    @property
+    def screen(self):
+        """The base64 encoded screenshot, read back from disk if spilled."""
+        if self._screen_file is not None:
+            with open(self._screen_file, 'r') as f:
+                return f.read()
+        return self._screen
+
+    @screen.setter
+    def screen(self, screen):
+        if self._screen_file is not None:
+            _remove_file(self._screen_file)
+        self._screen = None
+        self._screen_file = None
+        self._screen_dropped = False
+        if screen is None:
+            return
+        policy = self.screen_policy
+        if policy == self.SCREEN_DROP:
+            self._screen_dropped = True
+        elif policy == self.SCREEN_SPILL and \
+                len(screen) > self.screen_spill_threshold:
+            fd, self._screen_file = tempfile.mkstemp(
+                prefix='macaca-screen-', suffix='.b64')
+            with os.fdopen(fd, 'w') as f:
+                f.write(screen)
+            _remove_on_collect(self, self._screen_file)
+        else:
+            self._screen = screen
+
+    @property
+    def has_screen(self):
+        """Whether a screenshot is available, without loading it."""
+        return self._screen is not None or self._screen_file is not None
+
+    @property
+    def screen_bytes(self):
+        """The decoded screenshot (PNG) or None."""
+        screen = self.screen
+        if screen is None:
+            return None
+        return b64decode(screen.encode('ascii'))
+
+    def save_screen(self, filename):
+        """Save the screenshot to a PNG file.
+
+        Args:
+            filename(str): The PNG file path.
+
+        Returns:
+            True if a screenshot was saved, False if there is none.
+        """
+        png = self.screen_bytes
+        if png is None:
+            return False
+        with open(filename, 'wb') as f:
+            f.write(png)
+        return True
 
     def __str__(self):
         exception_msg = (
             "\nError: {0}\nMessage: {1}\n").format(self.error, self.message)
-        if self.screen is not None:
+        if self.has_screen:
             exception_msg += "Screenshot: available via screen\n"
+        elif self._screen_dropped:
+            exception_msg += "Screenshot: dropped by screen_policy\n"
         if self.stacktrace is not None:
-            stacktrace = "\n".join(self.stacktrace)
+            stacktrace = self.stacktrace
+            if not isinstance(stacktrace, str):
+                stacktrace = "\n".join(stacktrace)
             exception_msg += "Stacktrace:\n%s" % stacktrace
+        if self.flight_record is not None:
+            exception_msg += "\nFlight recorder, %s" % self.flight_record
         return exception_msg
@@ -3,12 +3,20 @@
 # WebDriver Result
 #
 
-from .webdriverexception import WebDriverException, find_exception_by_code
+from .webdriverexception import (
+    WebDriverError,
+    WebDriverException,
+    find_exception_by_code
+)
 
 
 class WebDriverResult(object):
     """WebDriver result object.
 
+    Both the JSON wire protocol and the W3C response formats are decoded,
+    W3C errors ({'value': {'error': 'no such element', ...}}) get the
+    matching wire protocol status.
+
     Atrributes:
         session_id(str): A UDID used to uniquely identify each session.
         status(int): A status code summarizing the result of the command.
@@ -16,6 +24,8 @@ class WebDriverResult(object):
         value(str|list|dict): The response JSON value.
     """
 
+    __slots__ = ('session_id', 'status', 'value')
+
     def __init__(self, session_id, status, value):
         self.session_id = session_id
         self.status = status
@@ -28,11 +38,23 @@ class WebDriverResult(object):
         Args:
             obj(dict): The JSON Object returned by server.
         """
-        return cls(
-            obj.get('sessionId', None),
-            obj.get('status', 0),
-            obj.get('value', None)
-        )
+        value = obj.get('value', None)
+        if 'status' in obj:
+            return cls(obj.get('sessionId', None), obj['status'], value)
+
+        session_id = obj.get('sessionId', None)
+        status = 0
+        if isinstance(value, dict):
+            if 'error' in value and 'message' in value:
+                error = find_exception_by_code(value['error']) or \
+                    WebDriverError.UNKNOWN_ERROR
+                status = error.value.code
+            elif session_id is None and 'sessionId' in value and \
+                    'capabilities' in value:
+                # W3C new session
+                session_id = value['sessionId']
+                value = value['capabilities']
+        return cls(session_id, status, value)
 
     def raise_for_status(self):
         """Raise WebDriverException if returned status is not zero."""
@@ -44,11 +66,12 @@ class WebDriverResult(object):
         screen = None
         stacktrace = None
 
-        if isinstance(self.value, str):
-            message = self.value
-        elif isinstance(self.value, dict):
-            message = self.value.get('message', None)
-            screen = self.value.get('screen', None)
-            stacktrace = self.value.get('stacktrace', None)
+        value = self.value
+        if isinstance(value, str):
+            message = value
+        elif isinstance(value, dict):
+            message = value.get('message', None)
+            screen = value.get('screen', None)
+            stacktrace = value.get('stacktrace', None)
 
         raise WebDriverException(error, message, screen, stacktrace)
@@ -5,22 +5,61 @@
 
 from base64 import b64decode
 
-from retrying import retry
-
 from .asserters import is_displayed
 from .command import Command
+from .elementmethods import ElementMethodsMixin
 from .locator import Locator
-from .util import add_element_extension_method, value_to_key_strokes, value_to_single_key_strokes, fluent
-from .webdriverexception import WebDriverException
+from .util import value_to_key_strokes, value_to_single_key_strokes, fluent
+from .waiting import Wait, wait_until
+from .webdriverexception import WebDriverError, WebDriverException
+
+# Keys identifying a web element reference in JSON payloads.
+ELEMENT_KEY = 'ELEMENT'
+W3C_ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+
+# Element reads whose value never changes for an element id.
+_IMMUTABLE_READS = frozenset([Command.GET_ELEMENT_TAG_NAME])
+
 
+def remember_locator(result, parent, using, value):
+    """Record how the elements of a find result were located, so that they
+    can be located again on a stale element reference, see
+    WebDriver.stale_recovery.
 
-class WebElement(object):
+    Args:
+        result(WebElement|list|LazyElements): The find result.
+        parent(WebDriver|WebElement): The context the find ran in.
+        using(str): The element location strategy.
+        value(str): The value of the location strategy.
+
+    Returns:
+        The find result.
+    """
+    driver = parent if not isinstance(parent, WebElement) else parent._driver
+    if not driver.stale_recovery:
+        return result
+    if isinstance(result, WebElement):
+        result._locator = (parent, using, value, None)
+    elif isinstance(result, list):
+        for index, el in enumerate(result):
+            el._locator = (parent, using, value, index)
+    else:
+        # LazyElements, passed on to the elements it creates
+        result._locator = (parent, using, value, range(len(result.ids)))
+    return result
+
+
+class WebElement(ElementMethodsMixin):
     """The WebElement Object to implement most part of WebDriver protocol.
 
     Attributes:
         element_id(str): A UDID used to uniquely identify an element.
     """
 
+    __slots__ = (
+        'element_id', '_driver', '_locator', '_properties', '__weakref__')
+
     def __init__(self, element_id, driver):
         """Initialize the WebElement
 
@@ -30,6 +69,8 @@ class WebElement(object):
         """
         self.element_id = str(element_id)
         self._driver = driver
+        self._locator = None
+        self._properties = None
 
     def __repr__(self):
         return '<{0.__name__} (session="{1}", element="{2}")>'.format(
@@ -44,12 +85,14 @@ class WebElement(object):
     def __hash__(self):
         return hash(self.element_id)
 
-    def _execute(self, command, data=None, unpack=True):
+    def _execute(self, command, data=None, unpack=True, unwrap=None):
         """Private method to execute command with data.
 
         Args:
             command(Command): The defined command.
             data(dict): The uri variable and body.
+            uppack(bool): If unpack value from result.
+            unwrap(callable): Convert the value field, see WebDriver._execute.
 
         Returns:
             The unwrapped value field in the json response.
@@ -57,7 +100,81 @@ class WebElement(object):
         if not data:
             data = {}
         data.setdefault('element_id', self.element_id)
-        return self._driver._execute(command, data, unpack)
+        try:
+            return self._driver._execute(command, data, unpack, unwrap)
+        except WebDriverException as err:
+            if self._locator is None or \
+                    err.error is not WebDriverError.STALE_ELEMENT_REFERENCE or \
+                    data['element_id'] != self.element_id:
+                raise
+            if not self._relocate():
+                raise
+        data['element_id'] = self.element_id
+        return self._driver._execute(command, data, unpack, unwrap)
+
+    def _relocate(self):
+        """Locate the element again with the locator it was found with.
+
+        Returns:
+            True if the element was found again, its element_id is updated.
+        """
+        parent, using, value, index = self._locator
+        driver = self._driver
+        if driver.lookup_cache is not None:
+            # the cached lookups predate the re-render
+            driver.lookup_cache.invalidate()
+        try:
+            if index is None:
+                el = parent.element(using, value)
+            else:
+                el = parent.elements(using, value)[index]
+        except (WebDriverException, IndexError):
+            return False
+        identity_map = driver.identity_map
+        if identity_map is not None:
+            identity_map.pop(self.element_id, None)
+            identity_map[el.element_id] = self
+        self.element_id = el.element_id
+        self._properties = None
+        if driver.lookup_cache is not None and index is None:
+            driver.lookup_cache.put(
+                (getattr(parent, 'element_id', None), using, value), self)
+        key = (using, value)
+        driver.stale_recoveries[key] = driver.stale_recoveries.get(key, 0) + 1
+        return True
+
+    def _read(self, command, data=None):
+        """Execute a read-only element command through the property cache,
+        see WebDriver.property_cache.
+
+        tag_name is cached for the lifetime of the element, other values
+        until the driver epoch is bumped by a mutating command.
+
+        Args:
+            command(Command): The defined command.
+            data(dict): The uri variable and body.
+
+        Returns:
+            The unwrapped value field in the json response.
+        """
+        driver = self._driver
+        if not driver.property_cache:
+            return self._execute(command, data)
+        key = (command, tuple(sorted(data.items()))) if data else command
+        properties = self._properties
+        if properties is None:
+            properties = self._properties = {}
+        epoch = driver.epoch
+        entry = properties.get(key)
+        if entry is not None and (entry[0] is None or entry[0] == epoch):
+            value = entry[1]
+        else:
+            value = self._execute(command, data)
+            properties[key] = (
+                None if command in _IMMUTABLE_READS else epoch, value)
+        if isinstance(value, dict):
+            return dict(value)
+        return value
 
     @property
     def driver(self):
@@ -80,10 +197,8 @@ class WebElement(object):
         Raises:
             WebDriverException.
         """
-        return self._execute(Command.FIND_CHILD_ELEMENT, {
-            'using': using,
-            'value': value
-        })
+        return self._driver._find_element(
+            self, Command.FIND_CHILD_ELEMENT, using, value)
 
     def element_if_exists(self, using, value):
         """Check if an element in the current element.
@@ -102,10 +217,8 @@ class WebElement(object):
             WebDriverException.
         """
         try:
-            self._execute(Command.FIND_CHILD_ELEMENT, {
-                'using': using,
-                'value': value
-            })
+            self._driver._find_element(
+                self, Command.FIND_CHILD_ELEMENT, using, value)
             return True
         except:
             return False
@@ -127,14 +240,12 @@ class WebElement(object):
             WebDriverException.
         """
         try:
-            return self._execute(Command.FIND_CHILD_ELEMENT, {
-                'using': using,
-                'value': value
-            })
+            return self._driver._find_element(
+                self, Command.FIND_CHILD_ELEMENT, using, value)
         except:
             return None
 
-    def elements(self, using, value):
+    def elements(self, using, value, lazy=False):
         """find elements in the current element.
 
         Support:
@@ -143,6 +254,8 @@ class WebElement(object):
         Args:
             using(str): The element location strategy.
             value(str): The value of the location strategy.
+            lazy(bool): Return a LazyElements sequence holding the element
+                ids only, WebElement objects are created on access.
 
         Returns:
             Return a List<Element | None>, if no element matched, the list is empty.
@@ -150,10 +263,11 @@ class WebElement(object):
         Raises:
             WebDriverException.
         """
-        return self._execute(Command.FIND_CHILD_ELEMENTS, {
+        els = self._execute(Command.FIND_CHILD_ELEMENTS, {
             'using': using,
             'value': value
-        })
+        }, unwrap=self._driver._lazy_elements if lazy else None)
+        return remember_locator(els, self, using, value)
 
     def wait_for(
         self, timeout=10000, interval=1000,
@@ -164,8 +278,8 @@ class WebElement(object):
             Android iOS Web(WebView)
 
         Args:
-            timeout(int): How long we should be retrying stuff.
-            interval(int): How long between retries.
+            timeout(int): How long to poll before giving up (ms).
+            interval(int): The longest sleep between polls (ms).
             asserter(callable): The asserter func to determine the result.
 
         Returns:
@@ -176,16 +290,10 @@ class WebElement(object):
         """
         if not callable(asserter):
             raise TypeError('Asserter must be callable.')
-        @retry(
-            retry_on_exception=lambda ex: isinstance(ex, WebDriverException),
-            stop_max_delay=timeout,
-            wait_fixed=interval
-        )
-        def _wait_for(el):
-            asserter(el)
-            return el
 
-        return _wait_for(self)
+        return wait_until(
+            self._driver, Wait('wait_for', timeout=timeout, interval=interval),
+            lambda: self, asserter)
 
     def wait_for_element(
         self, using, value, timeout=10000,
@@ -198,8 +306,8 @@ class WebElement(object):
         Args:
             using(str): The element location strategy.
             value(str): The value of the location strategy.
-            timeout(int): How long we should be retrying stuff.
-            interval(int): How long between retries.
+            timeout(int): How long to poll before giving up (ms).
+            interval(int): The longest sleep between polls (ms).
             asserter(callable): The asserter func to determine the result.
 
         Returns:
@@ -210,17 +318,10 @@ class WebElement(object):
         """
         if not callable(asserter):
             raise TypeError('Asserter must be callable.')
-        @retry(
-            retry_on_exception=lambda ex: isinstance(ex, WebDriverException),
-            stop_max_delay=timeout,
-            wait_fixed=interval
-        )
-        def _wait_for_element(ctx, using, value):
-            el = ctx.element(using, value)
-            asserter(el)
-            return el
-
-        return _wait_for_element(self, using, value)
+
+        return wait_until(self._driver, Wait(
+            'wait_for_element', using, value, timeout, interval),
+            lambda: self.element(using, value), asserter)
 
     def wait_for_elements(
         self, using, value, timeout=10000,
@@ -233,8 +334,8 @@ class WebElement(object):
         Args:
             using(str): The element location strategy.
             value(str): The value of the location strategy.
-            timeout(int): How long we should be retrying stuff.
-            interval(int): How long between retries.
+            timeout(int): How long to poll before giving up (ms).
+            interval(int): The longest sleep between polls (ms).
             asserter(callable): The asserter func to determine the result.
 
         Returns:
@@ -245,21 +346,16 @@ class WebElement(object):
         """
         if not callable(asserter):
             raise TypeError('Asserter must be callable.')
-        @retry(
-            retry_on_exception=lambda ex: isinstance(ex, WebDriverException),
-            stop_max_delay=timeout,
-            wait_fixed=interval
-        )
-        def _wait_for_elements(ctx, using, value):
-            els = ctx.elements(using, value)
+
+        def locate():
+            els = self.elements(using, value)
             if not len(els):
                 raise WebDriverException('no such element')
-            else:
-                el = els[0]
-                asserter(el)
-                return els
+            return els
 
-        return _wait_for_elements(self, using, value)
+        return wait_until(self._driver, Wait(
+            'wait_for_elements', using, value, timeout, interval),
+            locate, lambda els: asserter(els[0]))
 
     def is_displayed(self):
         """Whether the element is visible.
@@ -267,7 +363,7 @@ class WebElement(object):
         Support:
             Android Web(WebView)
         """
-        return self._execute(Command.IS_ELEMENT_DISPLAYED)
+        return self._read(Command.IS_ELEMENT_DISPLAYED)
 
     def is_selected(self):
         """Returns whether the element is selected.
@@ -275,7 +371,7 @@ class WebElement(object):
         Support:
             Web(WebView)
         """
-        return self._execute(Command.IS_ELEMENT_SELECTED)
+        return self._read(Command.IS_ELEMENT_SELECTED)
 
     def is_enabled(self):
         """Returns whether the element is enabled.
@@ -283,7 +379,7 @@ class WebElement(object):
         Support:
             Web(WebView)
         """
-        return self._execute(Command.IS_ELEMENT_ENABLED)
+        return self._read(Command.IS_ELEMENT_ENABLED)
 
     def get_property(self, name):
         """Return the result of getting a property, Support: Android iOS Web(WebView).
@@ -297,7 +393,7 @@ class WebElement(object):
         Returns:
             The property of the element.
         """
-        return self._execute(Command.GET_ELEMENT_PROPERTY, {'name': name})
+        return self._read(Command.GET_ELEMENT_PROPERTY, {'name': name})
 
     def get_computed_css(self, property_name):
         """The computed value of the given CSS property
@@ -315,7 +411,7 @@ class WebElement(object):
             browsing context's document type is not "xml",
             else let it be ""
         """
-        return self._execute(Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY, {
+        return self._read(Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY, {
             'property_name': property_name})
 
     @property
@@ -326,7 +422,7 @@ class WebElement(object):
         Support:
             Android iOS Web(WebView)
         """
-        return self._execute(Command.GET_ELEMENT_TEXT)
+        return self._read(Command.GET_ELEMENT_TEXT)
 
     @property
     def tag_name(self):
@@ -335,7 +431,7 @@ class WebElement(object):
         Support:
             Web(WebView)
         """
-        return self._execute(Command.GET_ELEMENT_TAG_NAME)
+        return self._read(Command.GET_ELEMENT_TAG_NAME)
 
     @property
     def rect(self):
@@ -351,7 +447,7 @@ class WebElement(object):
             height(float): Height of the web element's bounding rectangle.
             width(float): Width of the web element's bounding rectangle.
         """
-        return self._execute(Command.GET_ELEMENT_RECT)
+        return self._read(Command.GET_ELEMENT_RECT)
 
     @property
     def size(self):
@@ -365,7 +461,7 @@ class WebElement(object):
             height(float): Height of the web element's bounding rectangle.
             width(float): Width of the web element's bounding rectangle.
         """
-        return self._execute(Command.GET_ELEMENT_SIZE)
+        return self._read(Command.GET_ELEMENT_SIZE)
 
     @fluent
     def click(self):
@@ -546,6 +642,3 @@ class WebElement(object):
         self._driver._execute(Command.PERFORM_ACTIONS, {
             'actions': actions
         })
-
-
-add_element_extension_method(WebElement)
@@ -0,0 +1,65 @@
+#
+# Structured, size-bounded wire logging helpers
+#
+
+import re
+
+_BASE64 = re.compile(r'^[A-Za-z0-9+/\r\n]+={0,2}$')
+
+# Strings at least this long made of base64 characters are redacted.
+BASE64_MIN_LENGTH = 64
+
+
+def summarize(value, max_length=256, redact_base64=True):
+    """Return a bounded copy of a JSON value fit for logging.
+
+    Long strings are cut to max_length characters, base64 payloads
+    (screenshots, uploaded files) are replaced by their size and
+    containers are walked recursively, keeping at most max_length
+    items each.
+
+    Args:
+        value: A JSON compatible value.
+        max_length(int): Maximum length of strings and containers.
+        redact_base64(bool): Replace base64 looking strings.
+
+    Returns:
+        The summarized value.
+    """
+    if isinstance(value, str):
+        length = len(value)
+        if redact_base64 and length >= BASE64_MIN_LENGTH and \
+                _BASE64.match(value):
+            return '<base64 {0} chars>'.format(length)
+        if length > max_length:
+            return '{0}...<{1} chars>'.format(value[:max_length], length)
+        return value
+    if isinstance(value, dict):
+        items = list(value.items())
+        summary = dict(
+            (k, summarize(v, max_length, redact_base64))
+            for k, v in items[:max_length])
+        if len(items) > max_length:
+            summary['...'] = '<{0} keys>'.format(len(items))
+        return summary
+    if isinstance(value, (list, tuple)):
+        summary = [summarize(v, max_length, redact_base64)
+                   for v in value[:max_length]]
+        if len(value) > max_length:
+            summary.append('...<{0} items>'.format(len(value)))
+        return summary
+    return value
+
+
+class LazySummary(object):
+    """Defer summarize until the log record is actually formatted."""
+
+    __slots__ = ('value', 'max_length', 'redact_base64')
+
+    def __init__(self, value, max_length=256, redact_base64=True):
+        self.value = value
+        self.max_length = max_length
+        self.redact_base64 = redact_base64
+
+    def __str__(self):
+        return str(summarize(self.value, self.max_length, self.redact_base64))
@@ -44,10 +44,14 @@ setup(
 
     install_requires=[
         'enum34',
-        'requests',
-        'retrying'
+        'requests'
     ],
 
+    entry_points={
+        'pytest11': ['macaca = macaca.pytest_plugin'],
+        'console_scripts': ['macaca-probe = macaca.probe:main']
+    },
+
     extras_require={
         'test': ['pytest', 'tox', 'pytest-xdist', 'pytest-cov', 'coverage', 'responses']
     }
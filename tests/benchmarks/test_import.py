@@ -0,0 +1,59 @@
+#
+# Import time benchmarks
+#
+
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+# Cold start budget, in seconds, for importing the client in a fresh
+# interpreter. Heavy dependencies must stay out of it; they are imported
+# on first request. Wall-clock budgets depend on the machine, so they are
+# only checked with MACACA_BENCHMARKS=1; laziness is always checked.
+IMPORT_BUDGET = 0.08
+LAZY_DEPENDENCIES = ('requests',)
+
+
+def run_python(code):
+    return subprocess.check_output(
+        [sys.executable, '-c', code], universal_newlines=True)
+
+
+def best_import_time(statement, repeat=3):
+    code = (
+        'import time\n'
+        'start = time.time()\n'
+        '{0}\n'
+        'print(time.time() - start)\n').format(statement)
+    return min(float(run_python(code)) for _ in range(repeat))
+
+
+timing = pytest.mark.skipif(
+    not os.environ.get('MACACA_BENCHMARKS'),
+    reason='timing benchmark, set MACACA_BENCHMARKS=1 to run')
+
+
+@timing
+def test_import_package_time():
+    assert best_import_time('import macaca') <= IMPORT_BUDGET
+
+
+@timing
+def test_import_webdriver_time():
+    assert best_import_time('from macaca import WebDriver') <= IMPORT_BUDGET
+
+
+def test_heavy_dependencies_are_lazy():
+    output = run_python(
+        'import sys\n'
+        'import macaca\n'
+        'from macaca import WebDriver, WebElement\n'
+        'driver = WebDriver({})\n'
+        'driver.element_by_id\n'
+        'print(",".join(m for m in %r if m in sys.modules))'
+        % (LAZY_DEPENDENCIES,))
+    assert output.strip() == ''
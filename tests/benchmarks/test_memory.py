@@ -0,0 +1,134 @@
+#
+# Memory benchmarks for large elements() results and payloads
+#
+
+
+import gc
+import json
+import os
+from base64 import b64encode
+
+import pytest
+
+tracemalloc = pytest.importorskip('tracemalloc')
+
+from macaca.webelement import WebElement
+from tests.conftest import FakeInvoker
+
+
+# Budgets are expressed per returned element for elements() and as a
+# multiple of the payload size for source and screenshots. They carry
+# roughly 25% headroom over the measured cost so that only real
+# regressions (an extra copy, a fatter WebElement) trip them.
+ELEMENT_PEAK_BUDGET = 390
+ELEMENT_RETAINED_BUDGET = 150
+IDENTITY_MAP_RETAINED_BUDGET = 32
+LAZY_ELEMENT_RETAINED_BUDGET = 80
+PAYLOAD_PEAK_FACTOR = 2.5
+PAYLOAD_RETAINED_FACTOR = 1.25
+SAVE_SCREENSHOT_PEAK_FACTOR = 3.25
+SAVE_SCREENSHOT_RETAINED_BUDGET = 64 * 1024
+
+
+class WireInvoker(FakeInvoker):
+    """Serve a canned JSON body, decoding it on every call like the wire."""
+
+    def __init__(self, value):
+        super(WireInvoker, self).__init__(value)
+        self._body = json.dumps({
+            'status': 0,
+            'sessionId': '2345',
+            'value': value
+        }).encode('utf-8')
+
+    def execute(self, command, data={}):
+        self.commands.append(command)
+        return json.loads(self._body.decode('utf-8'))
+
+
+def measure(func):
+    """Return (retained, peak, result) bytes allocated while running func."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return retained, peak, result
+
+
+@pytest.mark.parametrize('count', [10000, 100000])
+def test_elements_memory(driver, count):
+    driver.remote_invoker = WireInvoker(
+        [{'ELEMENT': str(i)} for i in range(count)])
+
+    retained, peak, els = measure(lambda: driver.elements('id', 'item'))
+
+    assert len(els) == count
+    assert isinstance(els[-1], WebElement)
+    assert retained / count <= ELEMENT_RETAINED_BUDGET
+    assert peak / count <= ELEMENT_PEAK_BUDGET
+
+
+def test_lazy_elements_memory(driver):
+    count = 100000
+    driver.remote_invoker = WireInvoker(
+        [{'ELEMENT': str(i)} for i in range(count)])
+
+    retained, peak, els = measure(
+        lambda: driver.elements('id', 'item', lazy=True))
+
+    assert len(els) == count
+    assert els[-1].element_id == str(count - 1)
+    assert retained / count <= LAZY_ELEMENT_RETAINED_BUDGET
+
+
+def test_elements_identity_map_memory(driver):
+    count = 10000
+    driver.remote_invoker = WireInvoker(
+        [{'ELEMENT': str(i)} for i in range(count)])
+    driver.use_identity_map()
+    held = driver.elements('id', 'item')
+
+    retained, peak, els = measure(lambda: driver.elements('id', 'item'))
+
+    assert els[-1] is held[-1]
+    assert retained / count <= IDENTITY_MAP_RETAINED_BUDGET
+
+
+def test_source_memory(driver):
+    source = '<node/>' * (512 * 1024)
+    driver.remote_invoker = WireInvoker(source)
+
+    retained, peak, ret = measure(lambda: driver.source)
+
+    assert len(ret) == len(source)
+    assert retained <= len(source) * PAYLOAD_RETAINED_FACTOR
+    assert peak <= len(source) * PAYLOAD_PEAK_FACTOR
+
+
+@pytest.fixture(scope="module")
+def screenshot():
+    return b64encode(os.urandom(3 * 1024 * 1024)).decode('ascii')
+
+
+def test_take_screenshot_memory(driver, screenshot):
+    driver.remote_invoker = WireInvoker(screenshot)
+
+    retained, peak, ret = measure(driver.take_screenshot)
+
+    assert ret == screenshot
+    assert retained <= len(screenshot) * PAYLOAD_RETAINED_FACTOR
+    assert peak <= len(screenshot) * PAYLOAD_PEAK_FACTOR
+
+
+def test_save_screenshot_memory(driver, screenshot, tmpdir):
+    driver.remote_invoker = WireInvoker(screenshot)
+    filename = str(tmpdir.join('screen.png'))
+
+    retained, peak, _ = measure(lambda: driver.save_screenshot(filename))
+
+    assert os.path.getsize(filename) == len(screenshot) * 3 // 4
+    assert retained <= SAVE_SCREENSHOT_RETAINED_BUDGET
+    assert peak <= len(screenshot) * SAVE_SCREENSHOT_PEAK_FACTOR
@@ -0,0 +1,61 @@
+#
+# Shared fixtures: a fake remote end and a driver attached to it
+#
+
+
+import pytest
+
+from macaca.webdriver import WebDriver
+
+
+class FakeInvoker(object):
+    """Stand-in for RemoteInvoker answering commands without a server.
+
+    Subclasses override respond to script the remote end.
+
+    Attributes:
+        hub(str): The remote server url, see HubCache.
+        metrics(Metrics): Always None, nothing is recorded.
+        value: Answered by the default respond.
+        commands(list): Every command executed, in order.
+        fail(dict): Command to the error status answered instead.
+    """
+
+    metrics = None
+
+    def __init__(self, value=None, hub='http://127.0.0.1:3456/wd/hub'):
+        self.hub = hub
+        self.value = value
+        self.commands = []
+        self.fail = {}
+
+    @property
+    def calls(self):
+        """Number of commands executed."""
+        return len(self.commands)
+
+    def respond(self, command, data):
+        """Return the value field answered to a successful command."""
+        return self.value
+
+    def execute(self, command, data={}):
+        self.commands.append(command)
+        status = self.fail.get(command)
+        if status:
+            return {'status': status, 'value': {'message': 'failed'}}
+        return {'status': 0, 'sessionId': '2345',
+                'value': self.respond(command, data)}
+
+    def detached(self):
+        return self
+
+
+@pytest.fixture(scope="function")
+def driver():
+    wd = WebDriver({
+        'browserName': 'chrome',
+        'platformName': 'Android'
+    })
+    wd.attach('2345')
+    wd.remote_invoker = FakeInvoker()
+    return wd
@@ -0,0 +1,111 @@
+#
+# Testcase for RoundTripAnalyzer
+#
+
+
+import pytest
+
+from macaca.analyzer import (
+    DUPLICATE_FIND,
+    FIRST_POLL_WAIT,
+    N_PLUS_ONE,
+    REDUNDANT_SWITCH,
+    RoundTripAnalyzer
+)
+from tests.conftest import FakeInvoker
+
+
+class HubInvoker(FakeInvoker):
+    """Answer every command like a well behaved hub."""
+
+    def respond(self, command, data):
+        if command.uri.endswith('/elements'):
+            return [{'ELEMENT': str(i)} for i in range(5)]
+        if command.uri.endswith('/element'):
+            return {'ELEMENT': 'x'}
+        if command.uri.endswith('/displayed'):
+            return True
+        return 'macaca'
+
+
+@pytest.fixture(scope="function")
+def analyzer():
+    return RoundTripAnalyzer()
+
+
+@pytest.fixture(scope="function")
+def driver(driver, analyzer):
+    driver.remote_invoker = HubInvoker()
+    driver.listeners.append(analyzer)
+    return driver
+
+
+def kinds(analyzer):
+    return [(f.kind, f.command, f.count, f.saved) for f in analyzer.findings]
+
+
+def test_n_plus_one(driver, analyzer):
+    texts = [el.text for el in driver.elements_by_xpath('//item')]
+    assert len(texts) == 5
+    assert kinds(analyzer) == [(N_PLUS_ONE, 'GET_ELEMENT_TEXT', 5, 4)]
+    finding = analyzer.findings[0]
+    assert finding.location.endswith('test_analyzer.py:48')
+    assert 'execute_script' in finding.message
+
+
+def test_n_plus_one_lazy(driver, analyzer):
+    texts = [el.text for el in driver.elements_by_xpath('//item', lazy=True)]
+    assert len(texts) == 5
+    assert kinds(analyzer) == [(N_PLUS_ONE, 'GET_ELEMENT_TEXT', 5, 4)]
+
+
+def test_duplicate_find(driver, analyzer):
+    for _ in range(4):
+        driver.element_by_id('submit')
+    driver.element_by_id('submit').click()
+    driver.element_by_id('submit')
+    assert kinds(analyzer) == [
+        (DUPLICATE_FIND, 'FIND_ELEMENT', 3, 3),
+        (DUPLICATE_FIND, 'FIND_ELEMENT', 1, 1)
+    ]
+
+
+def test_redundant_switches(driver, analyzer):
+    driver.context = 'WEBVIEW_1'
+    driver.context = 'WEBVIEW_1'
+    driver.switch_to_frame(None)
+    driver.switch_to_frame(None)
+    driver.switch_to_window('main')
+    driver.switch_to_window('other')
+    found = sorted(kinds(analyzer))
+    assert found == [
+        (REDUNDANT_SWITCH, 'SWITCH_TO_CONTEXT', 1, 1),
+        (REDUNDANT_SWITCH, 'SWITCH_TO_FRAME', 1, 1)
+    ]
+
+
+def test_window_switch_from_frame(driver, analyzer):
+    driver.switch_to_window('main')
+    driver.switch_to_frame(1)
+    driver.switch_to_window('main')
+    assert kinds(analyzer) == []
+    driver.switch_to_window('main')
+    assert kinds(analyzer) == [(REDUNDANT_SWITCH, 'SWITCH_TO_WINDOW', 1, 1)]
+    assert 'window or frame' in analyzer.findings[0].message
+
+
+def test_first_poll_wait(driver, analyzer):
+    driver.wait_for_element_by_id('login')
+    driver.wait_for(timeout=10, interval=1)
+    assert kinds(analyzer) == [
+        (FIRST_POLL_WAIT, 'wait_for_element(id=login)', 1, 1)]
+
+
+def test_report(driver, analyzer):
+    driver.element_by_id('submit')
+    driver.element_by_id('submit')
+    report = analyzer.report()
+    assert report.startswith('2 commands observed, about 1 round trips')
+    assert '[duplicate-find]' in report
+    analyzer.reset()
+    assert analyzer.findings == []
@@ -0,0 +1,31 @@
+#
+# Testcase for Command classification
+#
+
+
+from macaca.command import (
+    MUTATING_COMMANDS,
+    READ_ONLY_COMMANDS,
+    Command,
+    Endpoint,
+    is_mutating
+)
+
+
+def test_every_command_is_classified():
+    endpoints = set(
+        endpoint for endpoint in vars(Command).values()
+        if isinstance(endpoint, Endpoint))
+    assert READ_ONLY_COMMANDS | MUTATING_COMMANDS == endpoints
+    assert not READ_ONLY_COMMANDS & MUTATING_COMMANDS
+
+
+def test_is_mutating():
+    assert not is_mutating(Command.GET_TITLE)
+    assert not is_mutating(Command.FIND_ELEMENTS)
+    assert is_mutating(Command.CLICK_ELEMENT)
+    assert is_mutating(Command.EXECUTE_SCRIPT)
+    assert is_mutating(Command.SWITCH_TO_CONTEXT)
+    assert is_mutating(Command.GET_LOG)
+    assert not is_mutating(Endpoint('GET', '/session/{session_id}/custom'))
+    assert is_mutating(Endpoint('POST', '/session/{session_id}/custom'))
@@ -0,0 +1,81 @@
+#
+# Testcase for ElementMethodsMixin
+#
+
+
+import pytest
+
+from macaca.elementmethods import ElementMethodsMixin
+from macaca.locator import Locator
+from macaca.webdriver import WebDriver
+from macaca.webelement import WebElement
+
+
+class FakeWebElement(ElementMethodsMixin):
+    def element(self, using=Locator.ID.value, value=None):
+        return ('element', using, value)
+
+    def element_if_exists(self, using=Locator.ID.value, value=None):
+        return ('element_if_exists', using, value)
+
+    def element_or_none(self, using=Locator.ID.value, value=None):
+        return ('element_or_none', using, value)
+
+    def elements(self, using=Locator.ID.value, value=None, lazy=False):
+        return ('elements', using, value, lazy)
+
+    def wait_for_element(self, using=Locator.ID.value, value=None, **kwargs):
+        return ('wait_for_element', using, value, kwargs)
+
+    def wait_for_elements(self, using=Locator.ID.value, value=None, **kwargs):
+        return ('wait_for_elements', using, value, kwargs)
+
+
+def test_methods_in_sync_with_locator():
+    wb_el = FakeWebElement()
+
+    for locator in iter(Locator):
+        name = locator.name.lower()
+        using = locator.value
+        assert getattr(wb_el, 'element_by_' + name)('test') == \
+            wb_el.element(using, 'test')
+        assert getattr(wb_el, 'element_by_' + name + '_if_exists')('test') == \
+            wb_el.element_if_exists(using, 'test')
+        assert getattr(wb_el, 'element_by_' + name + '_or_none')('test') == \
+            wb_el.element_or_none(using, 'test')
+        assert getattr(wb_el, 'elements_by_' + name)('test') == \
+            wb_el.elements(using, 'test')
+        assert getattr(wb_el, 'elements_by_' + name)('test', lazy=True) == \
+            wb_el.elements(using, 'test', lazy=True)
+        assert getattr(wb_el, 'wait_for_element_by_' + name)(
+            'test', timeout=1) == \
+            wb_el.wait_for_element(using, 'test', timeout=1)
+        assert getattr(wb_el, 'wait_for_elements_by_' + name)(
+            'test', timeout=1) == \
+            wb_el.wait_for_elements(using, 'test', timeout=1)
+
+
+def test_no_stale_methods():
+    locators = set(locator.name.lower() for locator in Locator)
+    for attr in vars(ElementMethodsMixin):
+        if attr.startswith('_'):
+            continue
+        for prefix in ('wait_for_elements_by_', 'wait_for_element_by_',
+                       'elements_by_', 'element_by_'):
+            if attr.startswith(prefix):
+                name = attr[len(prefix):]
+                for suffix in ('_if_exists', '_or_none'):
+                    if prefix == 'element_by_' and name.endswith(suffix) \
+                            and name[:-len(suffix)] in locators:
+                        name = name[:-len(suffix)]
+                assert name in locators
+                break
+        else:
+            pytest.fail('Unexpected method {0}'.format(attr))
+
+
+@pytest.mark.parametrize('klass', [WebDriver, WebElement])
+def test_docstring(klass):
+    method = getattr(klass, 'element_by_xpath')
+    assert "Set parameter 'using' to 'xpath'." in method.__doc__
+    assert "'element' method" in method.__doc__
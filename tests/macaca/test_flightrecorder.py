@@ -0,0 +1,126 @@
+#
+# Testcase for FlightRecorder
+#
+
+
+import time
+
+import pytest
+import responses
+
+from macaca.asserters import is_not_displayed
+from macaca.command import Command
+from macaca.flightrecorder import FlightRecorder, active_recorders
+from macaca.webdriver import WebDriver
+from macaca.webdriverexception import WebDriverException
+from macaca.webelement import WebElement
+
+
+@pytest.fixture(scope="function")
+def driver():
+    wd = WebDriver({
+        'browserName': 'chrome',
+        'platformName': 'Android'
+    })
+    wd.attach('2345')
+    return wd
+
+
+def test_ring_buffer():
+    recorder = FlightRecorder(size=3, max_length=4)
+    for i in range(5):
+        recorder.record(Command.GET, {'url': 'http://{0}'.format(i)}, 0.01)
+    records = recorder.records()
+    assert recorder.count == 5
+    assert [r.data['url'] for r in records] == [
+        'http...<8 chars>'] * 3
+    assert records[0].status == 'ok'
+    assert records[-1].to_dict()['command'] == 'GET'
+    recorder.clear()
+    assert recorder.records() == []
+
+
+def test_truncate_lists():
+    recorder = FlightRecorder(size=1)
+    recorder.record(Command.SEND_KEYS_TO_ELEMENT, {'value': list('x' * 20)},
+                    0.01, WebDriverException('no such element'))
+    record = recorder.records()[0]
+    assert record.data['value'][-1] == '...<20 items>'
+    assert len(record.data['value']) == 9
+    assert record.status == 'no such element'
+
+
+def test_snapshot(driver):
+    recorder = FlightRecorder(size=1, max_length=4)
+    el = WebElement('7', driver)
+    args = [1, 2]
+    data = {'script': 'x' * 10, 'args': args, 'nested': [['y' * 10]]}
+    recorder.record(Command.EXECUTE_SCRIPT, data, 0.01)
+    data['script'] = 'z'
+    snapshot = recorder.records()[0].data
+    assert snapshot['script'] == 'xxxx...<10 chars>'
+    assert snapshot['args'] is args
+    recorder.record(Command.EXECUTE_SCRIPT, {'args': [el, 'a']}, 0.01)
+    assert recorder.records()[0].data == {'args': ['7', 'a']}
+    recorder.record(Command.EXECUTE_SCRIPT, data, 0.01)
+    assert recorder.records()[0].data['nested'] == [['yyyy...<10 chars>']]
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        FlightRecorder(size=0)
+
+
+@responses.activate
+def test_driver_records(driver):
+    responses.add(
+        responses.POST,
+        'http://127.0.0.1:3456/wd/hub/session/2345/element',
+        json={
+            'status': 7,
+            'sessionId': '2345',
+            'value': 'no such element'
+        })
+    started = time.time()
+    with pytest.raises(WebDriverException):
+        driver.element_by_id('login')
+    record = driver.flight_recorder.records()[-1]
+    assert record.command == Command.FIND_ELEMENT
+    assert record.status == 'NO_SUCH_ELEMENT'
+    assert record.data['using'] == 'id'
+    assert record.data['session_id'] == '2345'
+    assert driver.flight_recorder in active_recorders(started)
+    assert 'FIND_ELEMENT' in driver.flight_recorder.dump()
+
+
+@responses.activate
+def test_wait_timeout_dump(driver):
+    responses.add(
+        responses.POST,
+        'http://127.0.0.1:3456/wd/hub/session/2345/element',
+        json={
+            'status': 0,
+            'sessionId': '2345',
+            'value': {'ELEMENT': '1'}
+        })
+    responses.add(
+        responses.GET,
+        'http://127.0.0.1:3456/wd/hub/session/2345/element/1/displayed',
+        json={
+            'status': 0,
+            'sessionId': '2345',
+            'value': True
+        })
+    with pytest.raises(WebDriverException) as excinfo:
+        driver.wait_for_element_by_id(
+            'login', timeout=200, interval=100, asserter=is_not_displayed)
+    assert 'IS_ELEMENT_DISPLAYED' in excinfo.value.flight_record
+    assert 'Flight recorder, last' in str(excinfo.value)
+
+
+def test_disabled(driver):
+    driver.flight_recorder = None
+    with pytest.raises(Exception):
+        driver.remote_invoker = type(driver.remote_invoker)(
+            'http://127.0.0.1:1/wd/hub')
+        driver.title
@@ -0,0 +1,74 @@
+#
+# Testcase for HistoryStore
+#
+
+
+import pytest
+
+from macaca.history import HistoryStore
+from macaca.metrics import Metrics
+
+
+CAPS = {'platformName': 'Android', 'app': 'demo.apk'}
+
+
+@pytest.fixture(scope="function")
+def store():
+    store = HistoryStore(':memory:')
+    yield store
+    store.close()
+
+
+def record_run(store, latency, calls=20, command='FIND_ELEMENT',
+               build='1.0'):
+    metrics = Metrics()
+    for _ in range(calls):
+        metrics.record('http://hub', command, latency, 30, 60)
+    metrics.record_error('http://hub', command, 'NO_SUCH_ELEMENT')
+    return store.record_metrics(metrics, capabilities=CAPS, build=build)
+
+
+def test_record_metrics(store, tmpdir):
+    run_id = record_run(store, 0.04)
+    rows = store.runs()
+    assert len(rows) == 1
+    row = rows[0]
+    assert row['run_id'] == run_id
+    assert row['hub'] == 'http://hub'
+    assert row['capabilities'] == \
+        '{"app": "demo.apk", "platformName": "Android"}'
+    assert row['build'] == '1.0'
+    assert row['count'] == 20
+    assert row['errors'] == 1
+    assert row['request_bytes'] == 600
+    assert 0.025 < row['p95'] <= 0.05
+
+    path = str(tmpdir.join('history.sqlite'))
+    disk = HistoryStore(path)
+    record_run(disk, 0.04)
+    disk.close()
+    assert len(HistoryStore(path).runs()) == 1
+
+
+def test_find_regressions(store):
+    for _ in range(5):
+        record_run(store, 0.04)
+        record_run(store, 0.2, command='GET_ELEMENT_TEXT')
+    assert store.find_regressions() == []
+
+    record_run(store, 0.4, build='1.1')
+    record_run(store, 0.2, command='GET_ELEMENT_TEXT', build='1.1')
+    regressions = store.find_regressions()
+    assert len(regressions) == 1
+    regression = regressions[0]
+    assert regression.command == 'FIND_ELEMENT'
+    assert regression.capabilities == CAPS
+    assert regression.ratio > 5
+    assert store.find_regressions(hub='http://other') == []
+
+
+def test_min_count(store):
+    record_run(store, 0.04, calls=2)
+    record_run(store, 0.4, calls=2)
+    assert store.find_regressions() == []
+    assert len(store.find_regressions(min_count=1)) == 1
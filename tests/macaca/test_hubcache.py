@@ -0,0 +1,104 @@
+#
+# Testcase for HubCache
+#
+
+
+import time
+
+import pytest
+
+from macaca.command import Command
+from macaca.hubcache import HubCache
+from macaca.webdriver import WebDriver
+from macaca.webdriverexception import WebDriverException
+from tests.conftest import FakeInvoker
+
+
+class HubInvoker(FakeInvoker):
+    """Count requests, answering with the request number."""
+
+    def __init__(self):
+        FakeInvoker.__init__(self)
+        self.detached_calls = 0
+
+    def respond(self, command, data):
+        return [self.calls]
+
+    def detached(self):
+        # the refresher shares the counter, the tests compare it
+        self.detached_calls += 1
+        return self
+
+
+@pytest.fixture(scope="function")
+def cache():
+    cache = HubCache(ttl=0.05)
+    yield cache
+    cache.stop()
+
+
+def driver_with(invoker, cache):
+    driver = WebDriver({})
+    driver.remote_invoker = invoker
+    return driver.use_hub_cache(cache)
+
+
+def test_shared_between_drivers(cache):
+    invoker = HubInvoker()
+    first = driver_with(invoker, cache)
+    second = driver_with(HubInvoker(), cache)
+    assert first.sessions == [1]
+    assert second.sessions == [1]
+    assert first.status == [2]
+    assert invoker.calls == 2
+
+
+def test_background_refresh(cache):
+    invoker = HubInvoker()
+    driver = driver_with(invoker, cache)
+    assert driver.sessions == [1]
+    deadline = time.time() + 2
+    while invoker.calls < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    assert driver.sessions[0] >= 3
+    cache.stop()
+    assert invoker.detached_calls == 1
+    assert cache.refreshes == invoker.calls
+
+
+def test_idle_refresher_stops():
+    cache = HubCache(ttl=0.01, idle_timeout=0.02)
+    invoker = HubInvoker()
+    cache.get(invoker, Command.STATUS)
+    deadline = time.time() + 2
+    while cache._refreshers and time.time() < deadline:
+        time.sleep(0.01)
+    assert not cache._refreshers
+
+
+def test_synchronous_refresh():
+    cache = HubCache(ttl=0.01, refresh=False)
+    invoker = HubInvoker()
+    assert cache.get(invoker, Command.STATUS) == [1]
+    assert cache.get(invoker, Command.STATUS) == [1]
+    time.sleep(0.02)
+    assert cache.get(invoker, Command.STATUS) == [2]
+    assert not cache._refreshers
+
+
+def test_first_error_raises():
+    cache = HubCache(ttl=5)
+    invoker = HubInvoker()
+    invoker.fail[Command.STATUS] = 13
+    for _ in range(3):
+        with pytest.raises(WebDriverException):
+            cache.get(invoker, Command.STATUS)
+    assert invoker.calls == 3
+    del invoker.fail[Command.STATUS]
+    assert cache.get(invoker, Command.STATUS) == [4]
+    cache.stop()
+
+
+def test_only_sessionless(cache):
+    with pytest.raises(ValueError):
+        cache.get(HubInvoker(), Command.GET_TITLE)
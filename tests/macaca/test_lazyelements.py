@@ -0,0 +1,61 @@
+#
+# Testcase for LazyElements
+#
+
+
+import pytest
+
+from macaca.lazyelements import LazyElements, element_ids
+from macaca.webelement import WebElement
+from tests.conftest import FakeInvoker
+
+
+@pytest.fixture(scope="function")
+def driver(driver):
+    driver.remote_invoker = FakeInvoker(
+        [{'ELEMENT': str(i)} for i in range(5)] +
+        [{'element-6066-11e4-a52e-4f735466cecf': 5}])
+    return driver
+
+
+def test_element_ids():
+    assert element_ids(None) == []
+    assert element_ids([
+        {'ELEMENT': '1'},
+        {'element-6066-11e4-a52e-4f735466cecf': 2}]) == ['1', '2']
+
+
+def test_lazy_elements(driver, monkeypatch):
+    created = []
+    make_element = driver._make_element
+    monkeypatch.setattr(
+        driver, '_make_element',
+        lambda element_id: created.append(element_id) or
+        make_element(element_id))
+
+    els = driver.elements_by_xpath('//item', lazy=True)
+    assert isinstance(els, LazyElements)
+    assert len(els) == 6
+    assert els.ids == ['0', '1', '2', '3', '4', '5']
+    assert els[1:3].ids == ['1', '2']
+    assert created == []
+
+    assert isinstance(els[-1], WebElement)
+    assert els[-1].element_id == '5'
+    assert created == ['5', '5']
+    assert WebElement('2', driver) in els
+    assert [el.element_id for el in els[:2]] == ['0', '1']
+    assert els == driver.elements_by_xpath('//item')
+
+
+def test_lazy_child_elements(driver):
+    els = WebElement('1', driver).elements('xpath', '//item', lazy=True)
+    assert isinstance(els, LazyElements)
+    assert driver.remote_invoker.commands[-1].uri.endswith(
+        '/element/{element_id}/elements')
+
+
+def test_lazy_elements_identity_map(driver):
+    driver.use_identity_map()
+    els = driver.elements('xpath', '//item', lazy=True)
+    assert els[0] is els[0]
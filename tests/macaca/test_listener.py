@@ -0,0 +1,82 @@
+#
+# Testcase for CommandListener
+#
+
+
+import pytest
+import responses
+
+from macaca.command import Command, command_name
+from macaca.listener import CommandListener, add_listener, remove_listener
+from macaca.webdriver import WebDriver
+from macaca.webdriverexception import WebDriverException
+
+
+class RecordingListener(CommandListener):
+    def __init__(self):
+        self.events = []
+
+    def before_execute(self, driver, command, data):
+        self.events.append(('before', command_name(command)))
+
+    def after_execute(self, driver, command, data, result, error, elapsed):
+        assert elapsed >= 0
+        self.events.append(('after', command_name(command), result, error))
+
+
+@pytest.fixture(scope="function")
+def driver():
+    wd = WebDriver({
+        'browserName': 'chrome',
+        'platformName': 'Android'
+    })
+    wd.attach('2345')
+    return wd
+
+
+def test_command_name():
+    assert command_name(Command.FIND_ELEMENT) == 'FIND_ELEMENT'
+    assert command_name(('GET', '/unknown')) == 'GET /unknown'
+
+
+@responses.activate
+def test_driver_listener(driver):
+    responses.add(
+        responses.GET,
+        'http://127.0.0.1:3456/wd/hub/session/2345/title',
+        json={
+            'status': 0,
+            'sessionId': '2345',
+            'value': 'Macaca'
+        })
+    listener = RecordingListener()
+    driver.listeners.append(listener)
+    assert driver.title == 'Macaca'
+    assert listener.events == [
+        ('before', 'GET_TITLE'),
+        ('after', 'GET_TITLE', 'Macaca', None)
+    ]
+
+
+@responses.activate
+def test_global_listener_on_error(driver):
+    responses.add(
+        responses.GET,
+        'http://127.0.0.1:3456/wd/hub/session/2345/title',
+        json={
+            'status': 13,
+            'sessionId': '2345',
+            'value': 'unknown error'
+        })
+    listener = RecordingListener()
+    add_listener(listener)
+    try:
+        with pytest.raises(WebDriverException):
+            driver.title
+    finally:
+        remove_listener(listener)
+    remove_listener(listener)
+    (_, name, result, error) = listener.events[-1]
+    assert name == 'GET_TITLE'
+    assert result is None
+    assert isinstance(error, WebDriverException)
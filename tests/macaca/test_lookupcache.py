@@ -0,0 +1,77 @@
+#
+# Testcase for LookupCache
+#
+
+
+import pytest
+
+from macaca.lookupcache import LookupCache
+from tests.conftest import FakeInvoker
+
+
+class FindInvoker(FakeInvoker):
+    """Answer finds with a new element id each time."""
+
+    def __init__(self):
+        FakeInvoker.__init__(self)
+        self.finds = 0
+
+    def respond(self, command, data):
+        if command.uri.endswith('/element'):
+            self.finds += 1
+            return {'ELEMENT': str(self.finds)}
+        return None
+
+
+@pytest.fixture(scope="function")
+def driver(driver):
+    driver.remote_invoker = FindInvoker()
+    return driver.use_lookup_cache(size=2)
+
+
+def test_lru():
+    cache = LookupCache(size=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.stats() == {
+        'hits': 2, 'misses': 1, 'invalidations': 0, 'size': 2}
+    cache.invalidate()
+    cache.invalidate()
+    assert len(cache) == 0
+    assert cache.invalidations == 1
+
+
+def test_cached_lookups(driver):
+    button = driver.element_by_id('submit')
+    assert driver.element_by_id('submit') is button
+    assert driver.element_by_id_or_none('submit') is button
+    assert driver.element_by_id_if_exists('submit')
+    child = button.element_by_id('label')
+    assert button.element_by_id('label') is child
+    assert driver.remote_invoker.finds == 2
+    assert driver.lookup_cache.hits == 4
+
+
+def test_invalidated_by_mutating_commands(driver):
+    button = driver.element_by_id('submit')
+    button.text
+    driver.title
+    assert driver.element_by_id('submit') is button
+    button.click()
+    assert driver.element_by_id('submit') is not button
+    driver.element_by_id('submit')
+    driver.switch_to_frame(None)
+    driver.element_by_id('submit')
+    assert driver.remote_invoker.finds == 3
+    assert driver.lookup_cache.invalidations == 2
+
+
+def test_disable(driver):
+    driver.use_lookup_cache(None)
+    driver.element_by_id('submit')
+    driver.element_by_id('submit')
+    assert driver.remote_invoker.finds == 2
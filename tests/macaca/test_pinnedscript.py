@@ -0,0 +1,79 @@
+#
+# Testcase for pinned scripts
+#
+
+
+import pytest
+
+from macaca.command import Command
+from macaca.pinnedscript import MISSING, PinnedScript
+from macaca.webdriver import WebDriver
+
+
+SCRIPT = 'return arguments[0] + arguments[1];' + ' ' * 200
+
+
+class FakePage(object):
+    """Emulate a page keeping the installed scripts until navigation."""
+
+    metrics = None
+
+    def __init__(self):
+        self.scripts = []
+        self.pinned = set()
+
+    def execute(self, command, data={}):
+        value = None
+        if command == Command.GET:
+            self.pinned = set()
+        elif command == Command.EXECUTE_SCRIPT:
+            script = data['script']
+            self.scripts.append(script)
+            pinned = PinnedScript(SCRIPT)
+            if script == pinned.install:
+                self.pinned.add(pinned.handle)
+            elif pinned.handle not in self.pinned:
+                return {'status': 0, 'sessionId': '2345',
+                        'value': MISSING}
+            value = sum(data['args'])
+        return {'status': 0, 'sessionId': '2345', 'value': value}
+
+
+@pytest.fixture(scope="function")
+def driver():
+    wd = WebDriver({})
+    wd.attach('2345')
+    wd.remote_invoker = FakePage()
+    return wd
+
+
+def test_pinned_script(driver):
+    pinned = driver.pin_script(SCRIPT)
+    assert driver.execute_pinned_script(pinned, 1, 2) == 3
+    assert driver.execute_pinned_script(pinned, 3, 4) == 7
+    scripts = driver.remote_invoker.scripts
+    assert scripts == [pinned.install, pinned.stub]
+    assert len(pinned.stub) < len(SCRIPT)
+    report = driver.script_pinner.report()
+    assert report['calls'] == 2
+    assert report['installs'] == 1
+    assert report['bytes_saved'] == len(pinned.install) - len(pinned.stub)
+
+
+def test_reinstall_after_navigation(driver):
+    assert driver.execute_pinned_script(SCRIPT, 1, 2) == 3
+    driver.get('http://example.com')
+    assert driver.execute_pinned_script(SCRIPT, 2, 2) == 4
+    assert driver.execute_pinned_script(SCRIPT, 3, 2) == 5
+    pinned = PinnedScript(SCRIPT)
+    assert driver.remote_invoker.scripts == [
+        pinned.install, pinned.stub, pinned.install, pinned.stub]
+    assert driver.script_pinner.installs == 2
+
+
+def test_new_session_installs_again(driver):
+    driver.execute_pinned_script(SCRIPT, 1, 2)
+    driver.attach('2345')
+    driver.remote_invoker.pinned = set()
+    assert driver.execute_pinned_script(SCRIPT, 1, 1) == 2
+    assert driver.remote_invoker.scripts[-1] == PinnedScript(SCRIPT).install
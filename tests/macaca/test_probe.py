@@ -0,0 +1,89 @@
+#
+# Testcase for the hub latency probe
+#
+
+
+import pytest
+import responses
+
+from macaca.probe import main, parse_args
+from macaca.util import percentile
+
+
+HUB = 'http://127.0.0.1:3456/wd/hub'
+
+
+def add_session_responses():
+    responses.add(
+        responses.POST, HUB + '/session',
+        json={'status': 0, 'sessionId': '2345', 'value': {}})
+    responses.add(
+        responses.POST, HUB + '/session/2345/element',
+        json={'status': 0, 'sessionId': '2345', 'value': {'ELEMENT': '1'}})
+    responses.add(
+        responses.GET, HUB + '/session/2345/element/1/text',
+        json={'status': 0, 'sessionId': '2345', 'value': 'macaca'})
+    responses.add(
+        responses.GET, HUB + '/session/2345/screenshot',
+        json={'status': 0, 'sessionId': '2345', 'value': 'R0lGODlh'})
+    responses.add(
+        responses.DELETE, HUB + '/session/2345',
+        json={'status': 0, 'sessionId': '2345', 'value': ''})
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile([3, 1, 2], 0) == 1
+    assert percentile([3, 1, 2], 99) == 3
+
+
+def test_parse_args():
+    args = parse_args([HUB, '-n', '3', '-c', '2', '--caps', '{"a": 1}'])
+    assert args.url == HUB
+    assert args.iterations == 3
+    assert args.concurrency == 2
+    assert args.caps == {'a': 1}
+    with pytest.raises(SystemExit):
+        parse_args(['-c', '0'])
+
+
+@responses.activate
+def test_status_only(capsys):
+    responses.add(responses.GET, HUB + '/status', json={'status': 0})
+    assert main([HUB, '-n', '5', '-c', '2']) == 0
+    out = capsys.readouterr()[0]
+    assert 'STATUS' in out
+    assert '10 requests' in out
+    assert 'FIND_ELEMENT' not in out
+
+
+@responses.activate
+def test_mini_session(capsys):
+    responses.add(responses.GET, HUB + '/status', json={'status': 0})
+    add_session_responses()
+    assert main([HUB, '-n', '2', '--caps', '{"platformName": "Android"}']) == 0
+    out = capsys.readouterr()[0]
+    for name in ('NEW_SESSION', 'FIND_ELEMENT', 'GET_ELEMENT_TEXT',
+                 'SCREENSHOT', 'QUIT'):
+        assert name in out
+    assert '10 requests' in out
+
+
+def test_unreachable_hub(capsys):
+    assert main(['http://127.0.0.1:1/wd/hub', '-n', '1']) == 1
+    assert 'STATUS' in capsys.readouterr()[0]
+
+
+@responses.activate
+def test_session_failure(capsys):
+    responses.add(responses.GET, HUB + '/status', json={'status': 0})
+    responses.add(
+        responses.POST, HUB + '/session',
+        json={'status': 33, 'value': {'message': 'device offline'}})
+    assert main([HUB, '-n', '2', '--caps', '{"platformName": "Android"}']) == 1
+    out, err = capsys.readouterr()
+    assert 'NEW_SESSION failed' in err
+    assert 'device offline' in err
+    line = [l for l in out.splitlines() if l.startswith('NEW_SESSION')][0]
+    assert line.split()[1:3] == ['1', '1']
@@ -0,0 +1,76 @@
+#
+# Testcase for StageProfiler
+#
+
+
+import pytest
+import responses
+
+from macaca.profiler import STAGES, StageProfiler
+from macaca.webdriver import WebDriver
+from macaca.webdriverexception import WebDriverException
+
+
+@pytest.fixture(scope="function")
+def driver():
+    wd = WebDriver({
+        'browserName': 'chrome',
+        'platformName': 'Android'
+    })
+    wd.attach('2345')
+    return wd
+
+
+def test_add():
+    profiler = StageProfiler()
+    profiler.add('STATUS', 'prepare', 0.001)
+    profiler.add('STATUS', 'network', 0.002)
+    profiler.add('STATUS', 'network', 0.003)
+    assert profiler.counts == {'STATUS': 2}
+    assert profiler.stats['STATUS']['network'] == pytest.approx(0.005)
+    assert profiler.totals()['prepare'] == pytest.approx(0.001)
+    summary = profiler.summary()
+    for stage in STAGES:
+        assert stage in summary
+    assert 'share' in summary
+
+
+@responses.activate
+def test_profile(driver, capsys):
+    responses.add(
+        responses.POST,
+        'http://127.0.0.1:3456/wd/hub/session/2345/elements',
+        json={
+            'status': 0,
+            'sessionId': '2345',
+            'value': [{'ELEMENT': '1'}, {'ELEMENT': '2'}]
+        })
+    responses.add(
+        responses.GET,
+        'http://127.0.0.1:3456/wd/hub/session/2345/title',
+        json={
+            'status': 13,
+            'sessionId': '2345',
+            'value': 'unknown error'
+        })
+    with driver.profile() as profiler:
+        assert driver.profiler is profiler
+        driver.elements_by_id('login')
+        with pytest.raises(WebDriverException):
+            driver.title
+
+    assert driver.profiler is None
+    assert driver.remote_invoker.profiler is None
+    assert profiler.counts == {'FIND_ELEMENTS': 1, 'GET_TITLE': 1}
+    for stage in STAGES:
+        assert profiler.stats['FIND_ELEMENTS'][stage] > 0
+    assert profiler.stats['GET_TITLE']['wrap'] > 0
+    out = capsys.readouterr()[0]
+    assert 'FIND_ELEMENTS' in out
+    assert 'total' in out
+
+
+def test_profile_quiet(driver, capsys):
+    with driver.profile(stream=False):
+        pass
+    assert capsys.readouterr()[0] == ''
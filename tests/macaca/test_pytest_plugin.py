@@ -0,0 +1,121 @@
+#
+# Testcase for the round trip budget pytest plugin
+#
+
+
+import pytest
+
+pytest_plugins = 'pytester'
+
+
+TEST_MODULE = '''
+import pytest
+
+from macaca.command import Command
+from macaca.webdriver import WebDriver
+from tests.conftest import FakeInvoker
+
+
+@pytest.fixture
+def driver():
+    wd = WebDriver({})
+    wd.remote_invoker = FakeInvoker({'ELEMENT': '1'})
+    return wd.attach('2345')
+
+
+@pytest.mark.wd_budget(round_trips=3)
+def test_within_budget(driver):
+    for _ in range(3):
+        driver.element_by_id('login')
+
+
+@pytest.mark.wd_budget(round_trips=3)
+def test_over_budget(driver):
+    for _ in range(2):
+        driver.element_by_id('login').text
+
+
+@pytest.mark.wd_budget(seconds=60)
+def test_time_budget(driver):
+    driver.element_by_id('login')
+'''
+
+
+FAILURE_MODULE = '''
+from test_budget import driver
+
+
+def test_fails(driver):
+    driver.element_by_id('login')
+    assert False
+'''
+
+
+@pytest.fixture
+def suite(pytester):
+    pytester.makepyfile(test_budget=TEST_MODULE)
+    return pytester
+
+
+def test_budget(suite):
+    result = suite.runpytest('-p', 'macaca.pytest_plugin')
+    result.assert_outcomes(passed=2, failed=1)
+    result.stdout.fnmatch_lines([
+        '*WebDriver budget exceeded: 4 round trips exceed budget of 3*',
+    ])
+
+
+def test_report_locations(suite):
+    result = suite.runpytest('-p', 'macaca.pytest_plugin', '--wd-round-trips')
+    result.stdout.fnmatch_lines([
+        '*WebDriver round trips*',
+        'test_budget.py::test_over_budget',
+        '4 round trips*',
+        '*by command:',
+        '*2 *FIND_ELEMENT',
+        '*2 *GET_ELEMENT_TEXT',
+        '*by location:',
+        '*4 *test_budget.py:24',
+    ])
+
+
+def test_marker_registered(suite):
+    result = suite.runpytest('-p', 'macaca.pytest_plugin', '--markers')
+    result.stdout.fnmatch_lines(['@pytest.mark.wd_budget*'])
+
+
+def test_flight_recorder_on_failure(suite):
+    suite.makepyfile(test_failure=FAILURE_MODULE)
+    result = suite.runpytest(
+        '-p', 'macaca.pytest_plugin', '--wd-record', 'test_failure.py')
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines([
+        '*Captured wd flight recorder call*',
+        'last 1 of 1 commands:',
+        '*FIND_ELEMENT*ok*',
+    ])
+
+
+def test_idle_without_opt_in(suite):
+    suite.makepyfile(test_failure=FAILURE_MODULE)
+    result = suite.runpytest('-p', 'macaca.pytest_plugin', 'test_failure.py')
+    result.assert_outcomes(failed=1)
+    assert 'wd flight recorder' not in result.stdout.str()
+    assert 'wd round trips' not in result.stdout.str()
+
+
+def test_ini_opt_in(suite):
+    suite.makeini('[pytest]\nwd_record = true\n')
+    suite.makepyfile(test_failure=FAILURE_MODULE)
+    result = suite.runpytest('-p', 'macaca.pytest_plugin', 'test_failure.py')
+    result.stdout.fnmatch_lines(['*Captured wd flight recorder call*'])
+
+
+def test_budget_marker_before_pytest_3_6():
+    from macaca.pytest_plugin import _budget_marker
+
+    class OldItem(object):
+        def get_marker(self, name):
+            return name
+
+    assert _budget_marker(OldItem()) == 'wd_budget'
@@ -0,0 +1,89 @@
+#
+# Testcase for ResponseCache
+#
+
+
+import time
+
+import pytest
+
+from macaca.command import Command
+from macaca.responsecache import ResponseCache
+from tests.conftest import FakeInvoker
+
+
+class CountingInvoker(FakeInvoker):
+    """Answer every command with a new value."""
+
+    def respond(self, command, data):
+        if command in (Command.GET_WINDOW_HANDLES, Command.GET_ALL_COOKIES):
+            return [str(self.calls)]
+        if command.method == 'GET':
+            return str(self.calls)
+        return None
+
+
+@pytest.fixture(scope="function")
+def driver(driver):
+    driver.remote_invoker = CountingInvoker()
+    return driver.use_response_cache()
+
+
+def test_cached_reads(driver):
+    title = driver.title
+    assert driver.title == title
+    handles = driver.window_handles
+    handles.append('x')
+    assert driver.window_handles == ['2']
+    assert driver.get_window_size('a') != driver.get_window_size('b')
+    assert driver.remote_invoker.calls == 4
+    assert driver.response_cache.hits == 2
+
+
+def test_invalidated_by_mutating_commands(driver):
+    cookies = driver.cookies
+    driver.add_cookie({'name': 'a', 'value': 'b'})
+    assert driver.cookies != cookies
+    assert driver.title == driver.title
+    driver.attach('3456')
+    assert driver.remote_invoker.calls == 4
+    driver.title
+    assert driver.remote_invoker.calls == 5
+
+
+def test_ttl_and_opt_out(driver):
+    driver.use_response_cache({
+        Command.GET_TITLE: None,
+        Command.GET_CURRENT_URL: 0.01
+    })
+    assert driver.title != driver.title
+    url = driver.current_url
+    time.sleep(0.02)
+    assert driver.current_url != url
+
+
+def test_mutating_commands_cannot_be_cached():
+    with pytest.raises(ValueError):
+        ResponseCache({Command.CLICK_ELEMENT: 1})
+
+
+def test_disabled(driver):
+    driver.use_response_cache(enabled=False)
+    assert driver.title != driver.title
+
+
+def test_values_are_copied():
+    cache = ResponseCache()
+    key = cache.key(Command.GET_ALL_COOKIES, '2345', {})
+    cookies = [{'name': 'a', 'path': ['/']}]
+    cache.put(key, cookies)
+    cookies[0]['name'] = 'b'
+    hit, value = cache.get(key)
+    assert hit and value == [{'name': 'a', 'path': ['/']}]
+    value[0]['path'].append('/x')
+    assert cache.get(key)[1] == [{'name': 'a', 'path': ['/']}]
+
+
+def test_logs_cannot_be_cached():
+    with pytest.raises(ValueError):
+        ResponseCache({Command.GET_LOG: 1})
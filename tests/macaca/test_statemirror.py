@@ -0,0 +1,99 @@
+#
+# Testcase for StateMirror
+#
+
+
+import pytest
+
+from macaca.command import Command
+from macaca.statemirror import TOP_FRAME
+from macaca.webdriverexception import WebDriverException
+from tests.conftest import FakeInvoker
+
+
+class NativeInvoker(FakeInvoker):
+    """Answer the current context, NATIVE_APP."""
+
+    def respond(self, command, data):
+        if command == Command.CURRENT_CONTEXT_HANDLE:
+            return 'NATIVE_APP'
+        return None
+
+
+@pytest.fixture(scope="function")
+def driver(driver):
+    driver.remote_invoker = NativeInvoker()
+    return driver.use_state_mirror()
+
+
+def sent(driver):
+    return driver.remote_invoker.commands
+
+
+def test_skip_redundant_context_switches(driver):
+    driver.context = 'WEBVIEW_1'
+    driver.context = 'WEBVIEW_1'
+    assert driver.context == 'NATIVE_APP'
+    driver.context = 'NATIVE_APP'
+    driver.context = 'WEBVIEW_1'
+    assert sent(driver) == [
+        Command.SWITCH_TO_CONTEXT, Command.CURRENT_CONTEXT_HANDLE,
+        Command.SWITCH_TO_CONTEXT]
+    assert driver.state_mirror.skipped == 2
+
+
+def test_skip_redundant_frame_switches(driver):
+    driver.switch_to_frame(None)
+    driver.switch_to_frame(None)
+    driver.switch_to_parent_frame()
+    driver.switch_to_frame(0)
+    driver.switch_to_frame(0)
+    driver.switch_to_frame(None)
+    driver.get('https://macacajs.github.io')
+    driver.switch_to_frame(None)
+    assert sent(driver) == [
+        Command.SWITCH_TO_FRAME, Command.SWITCH_TO_FRAME,
+        Command.SWITCH_TO_FRAME, Command.SWITCH_TO_FRAME, Command.GET]
+
+
+def test_skip_redundant_windows_and_timeouts(driver):
+    driver.switch_to_window('main').switch_to_window('main')
+    driver.set_implicitly_wait(1).set_implicitly_wait(1)
+    driver.set_implicitly_wait(2)
+    driver.set_script_timeout(2).set_page_load_timeout(2)
+    driver.set_page_load_timeout(2)
+    assert sent(driver) == [
+        Command.SWITCH_TO_WINDOW, Command.IMPLICIT_WAIT, Command.IMPLICIT_WAIT,
+        Command.SET_SCRIPT_TIMEOUT, Command.SET_TIMEOUTS]
+    assert driver.state_mirror.frame == TOP_FRAME
+
+
+def test_window_switch_leaves_frame(driver):
+    driver.switch_to_window('main')
+    driver.switch_to_frame(0)
+    driver.switch_to_window('main')
+    driver.switch_to_window('main')
+    assert sent(driver) == [
+        Command.SWITCH_TO_WINDOW, Command.SWITCH_TO_FRAME,
+        Command.SWITCH_TO_WINDOW]
+    assert driver.state_mirror.skipped == 1
+
+
+def test_resync(driver):
+    driver.switch_to_frame(None)
+    # no such frame
+    driver.remote_invoker.fail[Command.GET_ELEMENT_TEXT] = 8
+    with pytest.raises(WebDriverException):
+        driver._execute(Command.GET_ELEMENT_TEXT, {'element_id': '1'})
+    driver.switch_to_frame(None)
+    driver.set_implicitly_wait(1)
+    driver.attach('3456')
+    driver.set_implicitly_wait(1)
+    assert sent(driver).count(Command.SWITCH_TO_FRAME) == 2
+    assert sent(driver).count(Command.IMPLICIT_WAIT) == 2
+
+
+def test_disabled(driver):
+    driver.use_state_mirror(False)
+    driver.switch_to_frame(None).switch_to_frame(None)
+    assert len(sent(driver)) == 2
@@ -0,0 +1,106 @@
+#
+# Testcase for Tracer
+#
+
+
+import json
+import re
+
+import pytest
+import responses
+
+from macaca.asserters import is_not_displayed
+from macaca.tracing import Tracer
+from macaca.waiting import FixedInterval
+from macaca.webdriver import WebDriver
+from macaca.webdriverexception import WebDriverException
+
+
+@pytest.fixture(scope="function")
+def driver():
+    wd = WebDriver({
+        'browserName': 'chrome',
+        'platformName': 'Android'
+    })
+    wd.attach('2345')
+    return wd
+
+
+def add_element_responses():
+    responses.add(
+        responses.POST,
+        'http://127.0.0.1:3456/wd/hub/session/2345/element',
+        json={
+            'status': 0,
+            'sessionId': '2345',
+            'value': {
+                'ELEMENT': '1'
+            }
+        })
+    responses.add(
+        responses.GET,
+        'http://127.0.0.1:3456/wd/hub/session/2345/element/1/displayed',
+        json={
+            'status': 0,
+            'sessionId': '2345',
+            'value': True
+        })
+
+
+@responses.activate
+def test_command_spans(driver):
+    add_element_responses()
+    tracer = Tracer()
+    driver.listeners.append(tracer)
+    driver.element_by_id('login').is_displayed()
+
+    events = tracer.export()['traceEvents']
+    assert [e['name'] for e in events] == [
+        'FIND_ELEMENT', 'IS_ELEMENT_DISPLAYED']
+    assert events[0]['ph'] == 'X'
+    assert events[0]['args'] == {'session_id': '2345'}
+    assert events[1]['args'] == {'session_id': '2345', 'element_id': '1'}
+    assert events[0]['ts'] + events[0]['dur'] <= events[1]['ts']
+    assert 'traceparent' not in responses.calls[0].request.headers
+
+
+@responses.activate
+def test_wait_spans(driver, tmpdir):
+    add_element_responses()
+    tracer = Tracer()
+    driver.listeners.append(tracer)
+    driver.wait_strategy = FixedInterval()
+    with pytest.raises(WebDriverException):
+        driver.wait_for_element_by_id(
+            'login', timeout=300, interval=100, asserter=is_not_displayed)
+
+    names = [(e['cat'], e['name']) for e in tracer.export()['traceEvents']]
+    assert names[0] == ('wait', 'wait_for_element(id=login)')
+    assert ('wait', 'poll') in names
+    assert ('sleep', 'sleep') in names
+    polls = [e for e in tracer.spans if e['name'] == 'poll']
+    sleeps = [e for e in tracer.spans if e['name'] == 'sleep']
+    assert len(sleeps) == len(polls) - 1
+    # the last sleep is cut short by the deadline
+    assert all(e['dur'] >= 90000 for e in sleeps[:-1])
+    assert not polls[-1]['args']['satisfied']
+
+    filename = str(tmpdir.join('trace.json'))
+    tracer.save(filename)
+    with open(filename) as f:
+        assert len(json.load(f)['traceEvents']) == len(tracer.spans)
+
+
+@responses.activate
+def test_traceparent(driver):
+    add_element_responses()
+    tracer = Tracer(propagate=True)
+    driver.listeners.append(tracer)
+    driver.element_by_id('login')
+
+    header = responses.calls[0].request.headers['traceparent']
+    match = re.match(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-01$', header)
+    assert match
+    assert match.group(1) == tracer.trace_id
+    assert tracer.spans[0]['args']['span_id'] == match.group(2)
+    assert driver.remote_invoker.headers == {}
@@ -0,0 +1,158 @@
+#
+# Testcase for the wait engine and WaitStats
+#
+
+
+import time
+
+import pytest
+
+from macaca.asserters import is_displayed
+from macaca.util import monotonic
+from macaca.waiting import (
+    ERROR,
+    SATISFIED,
+    TIMEOUT,
+    Backoff,
+    FixedInterval,
+    Wait,
+    WaitStats,
+    wait_until
+)
+from macaca.webdriverexception import WebDriverException
+from tests.conftest import FakeInvoker
+
+
+class DisplayInvoker(FakeInvoker):
+    """Find the element at once, show it from the given poll on."""
+
+    def __init__(self, displayed_from=1):
+        FakeInvoker.__init__(self)
+        self.displayed_from = displayed_from
+        self.polls = 0
+
+    def respond(self, command, data):
+        if command.uri.endswith('/displayed'):
+            self.polls += 1
+            return self.polls >= self.displayed_from
+        if command.uri.endswith('/elements'):
+            return [{'ELEMENT': '1'}]
+        return {'ELEMENT': '1'}
+
+
+@pytest.fixture(scope="function")
+def driver(driver):
+    driver.wait_stats = WaitStats()
+    return driver
+
+
+def test_stats_satisfied(driver):
+    driver.wait_strategy = FixedInterval()
+    driver.remote_invoker = DisplayInvoker(displayed_from=3)
+    driver.wait_for_element_by_id('login', timeout=2000, interval=10)
+    driver.remote_invoker = DisplayInvoker(displayed_from=1)
+    driver.wait_for_element_by_id('login', timeout=2000, interval=10)
+
+    stats = driver.wait_stats.get(using='id', value='login')
+    assert list(stats) == [('wait_for_element', 'id', 'login')]
+    entry = stats[('wait_for_element', 'id', 'login')]
+    assert entry['waits'] == 2
+    assert entry['outcomes'] == {SATISFIED: 2}
+    assert entry['polls'] == 4
+    assert entry['max_polls'] == 3
+    assert entry['asserter_failures'] == 2
+    assert entry['satisfy_max'] >= 0.02
+    assert entry['interval'] == 10
+
+
+def test_stats_timeout(driver):
+    driver.remote_invoker = DisplayInvoker(displayed_from=100)
+    with pytest.raises(WebDriverException):
+        driver.wait_for_elements_by_xpath('//a', timeout=50, interval=10)
+    entry = driver.wait_stats.snapshot()[
+        ('wait_for_elements', 'xpath', '//a')]
+    assert entry['outcomes'] == {TIMEOUT: 1}
+    assert entry['asserter_failures'] == entry['polls']
+    assert entry['satisfy_p95'] is None
+    assert 'wait_for_elements(xpath=//a)' in driver.wait_stats.report()
+
+
+def test_stats_error(driver):
+    def locate():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        wait_until(driver, Wait('wait_for'), locate, is_displayed)
+    entry = driver.wait_stats.snapshot()[('wait_for', None, None)]
+    assert entry['outcomes'] == {ERROR: 1}
+    assert entry['polls'] == 1
+    assert entry['asserter_failures'] == 0
+
+
+def test_stats_disabled(driver):
+    driver.wait_stats = None
+    assert driver.wait_for(timeout=10, interval=1) == driver
+
+
+def test_max_samples():
+    stats = WaitStats(max_samples=2)
+    for elapsed in (1, 2, 3):
+        stats.record(Wait('wait_for'), SATISFIED, elapsed)
+    entry = stats.snapshot()[('wait_for', None, None)]
+    assert entry['waits'] == 3
+    assert entry['satisfy_max'] == 3
+    assert entry['satisfy_p50'] == 2
+    stats.reset()
+    assert stats.snapshot() == {}
+
+
+def test_max_entries():
+    stats = WaitStats(max_entries=2)
+    for value in ('a', 'b', 'a', 'c'):
+        stats.record(Wait('wait_for_element', 'id', value), SATISFIED, 1)
+    assert sorted(key[2] for key in stats.snapshot()) == ['a', 'c']
+    assert stats.evictions == 1
+
+
+def test_polls_outdate_cached_reads(driver):
+    driver.remote_invoker = DisplayInvoker(displayed_from=3)
+    driver.use_identity_map().use_lookup_cache()
+    driver.property_cache = True
+    driver.wait_for_element_by_id('login', timeout=2000, interval=10)
+    assert driver.remote_invoker.polls == 3
+
+
+def test_backoff_delays():
+    backoff = Backoff(first=50, factor=2, jitter=0)
+    assert [backoff.delay(polls, 300) for polls in range(1, 6)] == \
+        [50, 100, 200, 300, 300]
+    assert Backoff(first=50).delay(1, 20) <= 20
+    jittered = Backoff(first=100, jitter=0.5)
+    assert all(50 <= jittered.delay(1, 1000) <= 100 for _ in range(20))
+    assert FixedInterval().delay(3, 250) == 250
+
+
+def test_backoff_detects_early(driver):
+    driver.remote_invoker = DisplayInvoker(displayed_from=2)
+    start = monotonic()
+    driver.wait_for_element_by_id('login', timeout=5000, interval=1000)
+    # well before the 1s fixed interval of former waits
+    assert monotonic() - start < 0.9
+    assert driver.remote_invoker.polls == 2
+
+
+def test_timeout_is_exact(driver):
+    class SlowInvoker(DisplayInvoker):
+        def respond(self, command, data):
+            time.sleep(0.03)
+            return DisplayInvoker.respond(self, command, data)
+
+    driver.remote_invoker = SlowInvoker(displayed_from=100)
+    driver.wait_strategy = FixedInterval()
+    start = monotonic()
+    with pytest.raises(WebDriverException):
+        driver.wait_for_element_by_id('login', timeout=300, interval=100)
+    elapsed = monotonic() - start
+    # the requests count against the timeout, plus the final poll; a
+    # fixed 100ms sleep after each 60ms poll would overshoot to 0.54s
+    assert 0.3 <= elapsed < 0.5
@@ -887,3 +887,24 @@ def test_touch_multi(driver):
             { 'type': 'drag', 'x': 200, 'y': 300 }
         ]
     }
+
+
+def test_unwrap_el(driver):
+    plain = {'a': [1, 'b', {'c': None}], 'd': True}
+    assert driver._unwrap_el(plain) is plain
+    value = driver._unwrap_el({
+        'legacy': {'ELEMENT': '1'},
+        'w3c': [{'element-6066-11e4-a52e-4f735466cecf': '2'}],
+        'plain': plain})
+    assert isinstance(value['legacy'], WebElement)
+    assert value['legacy'].element_id == '1'
+    assert value['w3c'][0].element_id == '2'
+    assert value['plain'] is plain
+
+
+def test_wrap_el(driver, element):
+    data = {'session_id': '2345', 'args': [1, 'a', {'b': False}]}
+    assert driver._wrap_el(data) is data
+    wrapped = driver._wrap_el({'args': (element, data['args'])})
+    assert wrapped == {'args': [{'ELEMENT': '1'}, data['args']]}
+    assert wrapped['args'][1] is data['args']
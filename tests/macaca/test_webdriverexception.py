@@ -3,6 +3,10 @@
 #
 
 
+import base64
+import gc
+import os
+
 import pytest
 
 from macaca.webdriverexception import WebDriverError, find_exception_by_code, WebDriverException
@@ -30,3 +34,64 @@ def test_init_exception():
         'Message: Element is not found\n'
         'Screenshot: available via screen\n'
         'Stacktrace:\na\nb')
+
+
+def test_find_exception_by_w3c_code():
+    assert find_exception_by_code('no such element') == \
+        WebDriverError.NO_SUCH_ELEMENT
+    assert find_exception_by_code('stale element reference') == \
+        WebDriverError.STALE_ELEMENT_REFERENCE
+    assert find_exception_by_code('no such thing') is None
+    assert find_exception_by_code([7]) is None
+
+
+def test_codes_are_unique():
+    codes = [error.value.code for error in WebDriverError]
+    assert len(codes) == len(set(codes))
+
+
+@pytest.fixture(scope="function")
+def screen_policy():
+    yield WebDriverException
+    WebDriverException.screen_policy = WebDriverException.SCREEN_SPILL
+    WebDriverException.screen_spill_threshold = 256 * 1024
+
+
+def test_screen_spill(screen_policy):
+    screen_policy.screen_spill_threshold = 8
+    png = b'\x89PNG' + b'\x00' * 32
+    screen = base64.b64encode(png).decode('ascii')
+    wd_ex = WebDriverException('no such element', 'x', screen)
+    filename = wd_ex._screen_file
+    assert wd_ex._screen is None
+    assert os.path.exists(filename)
+    assert wd_ex.has_screen
+    assert wd_ex.screen == screen
+    assert wd_ex.screen_bytes == png
+    assert 'Screenshot: available via screen' in str(wd_ex)
+    del wd_ex
+    gc.collect()
+    assert not os.path.exists(filename)
+
+
+def test_screen_kept_below_threshold(screen_policy):
+    wd_ex = WebDriverException('no such element', 'x', 'AAAA')
+    assert wd_ex._screen_file is None
+    assert wd_ex.screen_bytes == b'\x00\x00\x00'
+
+
+def test_screen_drop(screen_policy, tmpdir):
+    screen_policy.screen_policy = WebDriverException.SCREEN_DROP
+    wd_ex = WebDriverException('no such element', 'x', 'AAAA')
+    assert wd_ex.screen is None
+    assert not wd_ex.has_screen
+    assert not wd_ex.save_screen(str(tmpdir.join('screen.png')))
+    assert 'Screenshot: dropped by screen_policy' in str(wd_ex)
+
+
+def test_save_screen(screen_policy, tmpdir):
+    filename = str(tmpdir.join('screen.png'))
+    wd_ex = WebDriverException('no such element', 'x', 'AAAA')
+    assert wd_ex.save_screen(filename)
+    with open(filename, 'rb') as f:
+        assert f.read() == b'\x00\x00\x00'
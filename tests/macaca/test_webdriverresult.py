@@ -57,3 +57,38 @@ def test_wrong_result(wrong_result):
         wd_result.raise_for_status()
     ex = excinfo.value
     assert ex.message is not None
+
+
+def test_result_is_slotted(right_result):
+    wd_result = WebDriverResult.from_object(right_result)
+    assert not hasattr(wd_result, '__dict__')
+
+
+def test_w3c_result():
+    wd_result = WebDriverResult.from_object({'value': 'ok'})
+    assert wd_result.status == 0
+    assert wd_result.session_id is None
+
+    wd_result = WebDriverResult.from_object({
+        'value': {'sessionId': '1234', 'capabilities': {'browserName': 'x'}}
+    })
+    assert wd_result.session_id == '1234'
+    assert wd_result.value == {'browserName': 'x'}
+
+
+@pytest.mark.parametrize('error, name', [
+    ('no such element', 'NO_SUCH_ELEMENT'),
+    ('element not interactable', 'ELEMENT_NOT_INTERACTABLE'),
+    ('invalid selector', 'INVALID_SELECTOR'),
+    ('not in the protocol', 'UNKNOWN_ERROR')])
+def test_w3c_error(error, name):
+    wd_result = WebDriverResult.from_object({
+        'value': {'error': error, 'message': 'boom', 'stacktrace': 'a\nb'}
+    })
+    assert wd_result.status
+    with pytest.raises(WebDriverException) as excinfo:
+        wd_result.raise_for_status()
+    ex = excinfo.value
+    assert ex.error.name == name
+    assert ex.message == 'boom'
+    assert str(ex).endswith('Stacktrace:\na\nb')
@@ -2,7 +2,9 @@
 # Testcase for WebElement Object
 #
 
+import gc
 import json
+import weakref
 
 import pytest
 import responses
@@ -564,3 +566,164 @@ def test_touch_multi(element):
             }
         ]
     }
+
+
+def test_slots(driver):
+    el = WebElement('1', driver)
+    assert not hasattr(el, '__dict__')
+    assert weakref.ref(el)() is el
+
+
+def test_identity_map(driver):
+    driver.use_identity_map()
+    try:
+        first = driver._unwrap_el([{'ELEMENT': '7'}])[0]
+        assert driver._unwrap_el({'ELEMENT': 7}) is first
+        ref = weakref.ref(first)
+        del first
+        gc.collect()
+        assert ref() is None
+        assert '7' not in driver.identity_map
+        held = driver._unwrap_el({'ELEMENT': '8'})
+        assert driver.identity_map['8'] is held
+        driver.attach('2345')
+        assert len(driver.identity_map) == 0
+    finally:
+        driver.use_identity_map(False)
+    assert driver._unwrap_el({'ELEMENT': '9'}) is not \
+        driver._unwrap_el({'ELEMENT': '9'})
+
+
+class RerenderInvoker(object):
+    """Re-render the list on every find, staling the previous ids."""
+
+    metrics = None
+
+    def __init__(self):
+        self.generation = 0
+
+    def execute(self, command, data={}):
+        element_id = data.get('element_id')
+        if element_id is not None and \
+                not element_id.startswith(str(self.generation) + '-'):
+            return {'status': 10, 'value': {'message': 'stale'}}
+        if command.uri.endswith('/elements'):
+            self.generation += 1
+            value = [{'ELEMENT': '{0}-{1}'.format(self.generation, i)}
+                     for i in range(3)]
+        elif command.uri.endswith('/element'):
+            self.generation += 1
+            value = {'ELEMENT': '{0}-x'.format(self.generation)}
+        else:
+            value = element_id
+        return {'status': 0, 'sessionId': '2345', 'value': value}
+
+
+@pytest.fixture(scope="function")
+def rerender_driver():
+    wd = WebDriver({})
+    wd.attach('2345')
+    wd.remote_invoker = RerenderInvoker()
+    wd.stale_recovery = True
+    return wd
+
+
+def test_stale_recovery(rerender_driver):
+    items = rerender_driver.elements_by_xpath('//item')
+    button = rerender_driver.element_by_id('submit')
+    assert items[2].text == '3-2'
+    assert items[1].text == '4-1'
+    assert button.text == '5-x'
+    assert button.element_id == '5-x'
+    assert rerender_driver.stale_recoveries == {
+        ('xpath', '//item'): 2, ('id', 'submit'): 1}
+
+
+def test_stale_recovery_child(rerender_driver):
+    child = rerender_driver.element_by_id('list').element_by_id('item')
+    rerender_driver.element_by_id('other')
+    assert child.text == '5-x'
+    # the child relocation found its parent stale and relocated it first
+    assert rerender_driver.stale_recoveries[('id', 'list')] == 1
+    assert rerender_driver.stale_recoveries[('id', 'item')] == 1
+
+
+def test_stale_recovery_disabled(rerender_driver):
+    rerender_driver.stale_recovery = False
+    button = rerender_driver.element_by_id('submit')
+    rerender_driver.element_by_id('other')
+    with pytest.raises(WebDriverException):
+        button.text
+    assert rerender_driver.stale_recoveries == {}
+
+
+def test_stale_recovery_lazy(rerender_driver):
+    items = rerender_driver.elements_by_xpath('//item', lazy=True)
+    rerender_driver.element_by_id('other')
+    assert items[2].text == '3-2'
+    assert items[1:][0].text == '4-1'
+    assert rerender_driver.stale_recoveries == {('xpath', '//item'): 2}
+
+
+def test_stale_recovery_identity_map(rerender_driver):
+    rerender_driver.use_identity_map()
+    button = rerender_driver.element_by_id('submit')
+    rerender_driver.element_by_id('other')
+    assert button.text == '3-x'
+    assert rerender_driver.identity_map['3-x'] is button
+    assert '1-x' not in rerender_driver.identity_map
+
+
+def test_stale_recovery_with_lookup_cache(rerender_driver):
+    rerender_driver.use_lookup_cache()
+    button = rerender_driver.element_by_id('submit')
+    rerender_driver.elements_by_xpath('//item')
+    assert button.text == '3-x'
+    assert rerender_driver.element_by_id('submit') is button
+
+
+class CountingInvoker(object):
+    """Count element reads, answering with the read number."""
+
+    metrics = None
+
+    def __init__(self):
+        self.reads = 0
+
+    def execute(self, command, data={}):
+        value = None
+        if command.method == 'GET':
+            self.reads += 1
+            value = self.reads
+            if command.uri.endswith('/rect'):
+                value = {'x': self.reads}
+        elif command.uri.endswith('/element'):
+            value = {'ELEMENT': '1'}
+        return {'status': 0, 'sessionId': '2345', 'value': value}
+
+
+def test_property_cache():
+    driver = WebDriver({})
+    driver.attach('2345')
+    driver.remote_invoker = CountingInvoker()
+    driver.property_cache = True
+    el = WebElement('1', driver)
+
+    tag_name = el.tag_name
+    text = el.text
+    assert el.tag_name == tag_name
+    assert el.text == text
+    assert el.get_property('value') == el.get_property('value')
+    assert el.get_property('value') != el.get_property('checked')
+    rect = el.rect
+    rect['x'] = None
+    assert el.rect != rect
+    assert driver.remote_invoker.reads == 5
+
+    el.click()
+    assert el.text != text
+    assert el.tag_name == tag_name
+    assert driver.remote_invoker.reads == 6
+
+    driver.property_cache = False
+    assert el.tag_name != tag_name
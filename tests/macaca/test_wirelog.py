@@ -0,0 +1,32 @@
+#
+# Testcase for wire logging helpers
+#
+
+import base64
+
+from macaca.wirelog import LazySummary, summarize
+
+
+def test_summarize_truncates_strings():
+    assert summarize('abcdef', max_length=3) == 'abc...<6 chars>'
+    assert summarize('abc', max_length=3) == 'abc'
+
+
+def test_summarize_redacts_base64():
+    payload = base64.b64encode(b'\x00' * 300).decode('ascii')
+    assert summarize({'file': payload}) == {'file': '<base64 400 chars>'}
+    assert summarize(payload, redact_base64=False).endswith('<400 chars>')
+    # plain words are not mistaken for base64 payloads
+    assert summarize('hello world') == 'hello world'
+
+
+def test_summarize_containers():
+    assert summarize(list(range(5)), max_length=2) == [0, 1, '...<5 items>']
+    summary = summarize(dict((str(i), i) for i in range(3)), max_length=1)
+    assert summary['...'] == '<3 keys>'
+    assert len(summary) == 2
+
+
+def test_lazy_summary():
+    assert str(LazySummary({'a': 'x' * 10}, max_length=2)) == \
+        "{'a': 'xx...<10 chars>'}"